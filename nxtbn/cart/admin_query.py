@@ -1,5 +1,5 @@
 import graphene
-from graphene_django.filter import DjangoFilterConnectionField
+from nxtbn.core.graphql_connection import NxtbnFilterConnectionField
 
 from nxtbn.cart.models import Cart
 from nxtbn.cart.admin_types import CartItemType, CartType
@@ -7,7 +7,7 @@ from nxtbn.core.admin_permissions import gql_store_admin_required
 
 
 class AdminCartQuery(graphene.ObjectType):
-    carts = DjangoFilterConnectionField(CartType)
+    carts = NxtbnFilterConnectionField(CartType)
     
     cart_by_user = graphene.Field(CartType, user_id=graphene.ID(required=True))
     
@@ -4,6 +4,7 @@ from graphene import relay
 from graphene_django.types import DjangoObjectType
 from nxtbn.cart.models import Cart, CartItem
 from nxtbn.users.admin_types import AdminUserType
+from nxtbn.core.graphql_connection import NxtbnConnection
 
 
 class CartItemType(DjangoObjectType):
@@ -22,6 +23,7 @@ class CartType(DjangoObjectType):
         model = Cart
         fields = '__all__'
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filter_fields = {
             'user__id': ['exact'],
         }
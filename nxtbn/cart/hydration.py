@@ -0,0 +1,56 @@
+"""
+Batched loading of cart contents.
+
+`hydrate_cart` turns the lines of a session or user cart into `CartLine`s with one query
+for the variants, whatever the number of lines: each variant comes with its product and
+tax class, its `thumbnail_url`, materialized from its image or the product's primary
+image, and its `available_stock` and `sellable` annotations. Subtotals are kept in
+BASE_CURRENCY subunits and converted by the caller.
+"""
+from dataclasses import dataclass
+
+from django.conf import settings
+
+from nxtbn.core.subunits import multiply, to_subunits
+from nxtbn.product.models import ProductVariant
+from nxtbn.product.page import annotate_variant_availability
+
+
+@dataclass
+class CartLine:
+    variant: ProductVariant
+    quantity: int
+    subtotal_subunits: int
+
+
+def load_cart_variants(keys, field_name='id'):
+    """The variants whose `field_name`, `id` or `alias`, is in `keys`, as `{key: variant}`, with one query."""
+    queryset = annotate_variant_availability(ProductVariant.objects.select_related('product__tax_class'))
+    return queryset.in_bulk(list(keys), field_name=field_name)
+
+
+def get_cart_lines(cart, is_guest):
+    """`[(variant_id, quantity)]` of a session cart, `{variant_id: {'quantity': ...}}`, or of a `Cart`."""
+    if is_guest:
+        lines = []
+        for variant_id, item in cart.items():
+            try:
+                lines.append((int(variant_id), item['quantity']))
+            except (TypeError, ValueError):
+                continue # not a variant id, ignored like variants that no longer exist
+        return lines
+    return list(cart.items.order_by('created_at').values_list('variant_id', 'quantity'))
+
+
+def hydrate_cart(cart, is_guest):
+    """The lines of the cart whose variant still exists, with their variants loaded in one query."""
+    lines = get_cart_lines(cart, is_guest)
+    variants = load_cart_variants({variant_id for variant_id, _ in lines})
+    hydrated = []
+    for variant_id, quantity in lines:
+        variant = variants.get(variant_id)
+        if variant is None:
+            continue
+        price_subunits = to_subunits(variant.price, settings.BASE_CURRENCY)
+        hydrated.append(CartLine(variant=variant, quantity=quantity, subtotal_subunits=multiply(price_subunits, quantity)))
+    return hydrated
@@ -5,6 +5,7 @@ from graphene import relay
 from nxtbn.core.utils import apply_exchange_rate
 from django.utils.translation import get_language
 
+from nxtbn.product import StockStatus
 from nxtbn.product.storefront_types import ProductVariantType
 
 
@@ -12,6 +13,19 @@ class CartItemType(graphene.ObjectType):
     product_variant = graphene.Field(ProductVariantType)
     quantity = graphene.Int()
     subtotal = graphene.String()
+    product_name = graphene.String()
+    thumbnail = graphene.String()
+    stock_status = graphene.String()
+
+    # product_variant is loaded by nxtbn.cart.hydration with its product and stock annotations
+    def resolve_product_name(self, info):
+        return self.product_variant.get_descriptive_name_minimal()
+
+    def resolve_thumbnail(self, info):
+        return self.product_variant.variant_thumbnail(info.context)
+
+    def resolve_stock_status(self, info):
+        return StockStatus.IN_STOCK if self.product_variant.sellable else StockStatus.OUT_OF_STOCK
 
 
 class CartType(graphene.ObjectType):
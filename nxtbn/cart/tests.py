@@ -1,3 +1,75 @@
-from django.test import TestCase
+from decimal import Decimal
+from unittest.mock import Mock
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser
+from django.test.utils import override_settings
+
+from nxtbn.cart.hydration import hydrate_cart
+from nxtbn.cart.models import Cart, CartItem
+from nxtbn.home.base_tests import BaseGraphQLTestCase
+from nxtbn.product.tests import ProductFactory, ProductVariantFactory
+
+
+@override_settings(BASE_CURRENCY='USD', IS_MULTI_CURRENCY=False)
+class CartHydrationTest(BaseGraphQLTestCase):
+
+    def create_variants(self, count):
+        return [
+            ProductVariantFactory(product=ProductFactory(), price=Decimal('10.25'), track_inventory=False)
+            for _ in range(count)
+        ]
+
+    def guest_cart(self, variants):
+        return {str(variant.id): {'quantity': 2} for variant in variants}
+
+    def test_guest_cart_costs_one_query_whatever_its_size(self):
+        for count in (1, 5):
+            cart = self.guest_cart(self.create_variants(count))
+            with self.assertNumQueries(1):
+                lines = hydrate_cart(cart, is_guest=True)
+            self.assertEqual(len(lines), count)
+            self.assertEqual({line.subtotal_subunits for line in lines}, {2050})
+            with self.assertNumQueries(0):
+                [(line.variant.product.tax_class, line.variant.sellable) for line in lines]
+
+    def test_user_cart_costs_two_queries_whatever_its_size(self):
+        cart = Cart.objects.create(user=self.user)
+        for count in (1, 5):
+            cart.items.all().delete()
+            for variant in self.create_variants(count):
+                CartItem.objects.create(cart=cart, variant=variant, quantity=3)
+            with self.assertNumQueries(2):
+                lines = hydrate_cart(cart, is_guest=False)
+            self.assertEqual([line.quantity for line in lines], [3] * count)
+
+    def test_removed_variants_are_skipped(self):
+        kept, removed = self.create_variants(2)
+        cart = self.guest_cart([kept, removed])
+        cart['stale'] = {'quantity': 1}
+        removed.delete()
+
+        self.assertEqual([line.variant for line in hydrate_cart(cart, is_guest=True)], [kept])
+
+    def test_cart_query(self):
+        variants = self.create_variants(3)
+        context = Mock()
+        context.user = AnonymousUser()
+        context.session = {'cart': self.guest_cart(variants)}
+        context.currency = 'USD'
+        query = """
+        query {
+            cart {
+                total
+                items { quantity subtotal productName stockStatus }
+            }
+        }
+        """
+
+        with self.assertNumQueries(1):
+            response = self.graphql_customer_client.execute(query, context_value=context)
+
+        self.assertGraphQLSuccess(response)
+        cart = response['data']['cart']
+        self.assertEqual(cart['total'], '$61.50')
+        self.assertEqual(cart['items'][0]['subtotal'], '$20.50')
+        self.assertEqual(cart['items'][0]['stockStatus'], 'IN_STOCK')
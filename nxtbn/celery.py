@@ -18,6 +18,21 @@ app = Celery('nxtbn')
 app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
 
+app.conf.beat_schedule = {
+    'build-product-recommendations': {
+        'task': 'nxtbn.product.tasks.build_product_recommendations',
+        'schedule': timedelta(hours=24),
+    },
+    'regenerate-sitemaps': {
+        'task': 'nxtbn.seo.tasks.regenerate_sitemaps',
+        'schedule': timedelta(hours=1),
+    },
+    'refresh-exchange-rates': {
+        'task': 'nxtbn.core.tasks.refresh_exchange_rates',
+        'schedule': timedelta(minutes=1),
+    },
+}
+
 @app.task(bind=True)
 def log_task_request(self):
     """Logs the details of the current task request for debugging purposes."""
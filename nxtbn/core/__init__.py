@@ -12,6 +12,13 @@ class PublishableStatus(models.TextChoices):
     PUBLISHED = "PUBLISHED", _("Published")
     ARCHIVED = "ARCHIVED", _("Archived")
 
+class BulkDeleteStatus(models.TextChoices):
+    """Enumeration for specifying the progress of a background bulk delete."""
+    PENDING = "PENDING", _("Pending")
+    RUNNING = "RUNNING", _("Running")
+    COMPLETED = "COMPLETED", _("Completed")
+    FAILED = "FAILED", _("Failed")
+
 class CurrencyTypes(models.TextChoices):
     USD = "USD", _("United States Dollar")
     EUR = "EUR", _("Euro")
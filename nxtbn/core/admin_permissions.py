@@ -21,6 +21,7 @@ Dashboard User Permission Hierarchy:
 - All users have read permissions by default, except for certain critical data that require explicit authorization.  
 - The superuser automatically inherits all permissions of a store admin.  
 - A store admin inherits all permissions granted to other users by default.  
+- Granular permissions are read from the cached sets of `nxtbn.users.permission_cache`.  
 """
 
 
@@ -29,6 +30,7 @@ from rest_framework.permissions import BasePermission
 from rest_framework.permissions import SAFE_METHODS
 
 from nxtbn.users import UserRole
+from nxtbn.users.permission_cache import has_cached_perm
 
 
 import functools
@@ -59,9 +61,9 @@ class IsStoreStaff(BasePermission):
         return request.user.is_store_staff
 
 class GranularPermission(BasePermission):
-    def get_permission_name(self, model_name, action):
+    def get_permission_name(self, app_label, action):
        
-        return f"{model_name}.{action}"
+        return f"{app_label}.{action}"
 
     def has_permission(self, request, view):
         if not request.user.is_staff:
@@ -85,13 +87,14 @@ class GranularPermission(BasePermission):
         if model_cls is None:
             return False
 
-        model_name = model_cls.__name__.lower()
+        # Stored under the app label, like in has_required_perm, which is not always the model name (eg. users.User)
+        app_label = model_cls._meta.app_label
         action = view.required_perm
 
-        permission_name = self.get_permission_name(model_name, action)
+        permission_name = self.get_permission_name(app_label, action)
 
         # Check if the user has the generated permission
-        return request.user.has_perm(permission_name)
+        return has_cached_perm(request.user, permission_name)
     
 
 class CommonPermissions(BasePermission):
@@ -137,7 +140,7 @@ class CommonPermissions(BasePermission):
         if required_permission is None:
             return False
 
-        return request.user.has_perm(required_permission)
+        return has_cached_perm(request.user, required_permission)
 
 
 def has_required_perm(user, code: str, model_cls=None):
@@ -151,7 +154,7 @@ def has_required_perm(user, code: str, model_cls=None):
         return True
 
     perm_code  = model_cls._meta.app_label + '.' + code
-    return user.has_perm(perm_code)
+    return has_cached_perm(user, perm_code)
 
 
 def gql_required_perm(model, code: str):  # model argument will be the model class
@@ -178,7 +181,7 @@ def gql_required_perm(model, code: str):  # model argument will be the model cla
             
             # Check if the user has permission for the model
             perm_code = f"{model._meta.app_label}.{code}"  # Constructing the permission name
-            if not user.has_perm(perm_code):  # Check if the user has the required permission for the model
+            if not has_cached_perm(user, perm_code):  # Check if the user has the required permission for the model
                 raise GraphQLError("Permission denied")  # Block unauthorized access
 
             return func(self, info, *args, **kwargs)  # Call the actual resolver
@@ -6,15 +6,15 @@ from nxtbn.core import CurrencyTypes
 from nxtbn.core.admin_permissions import gql_store_admin_required
 from nxtbn.core.admin_types import AdminCurrencyTypesEnum, CurrencyExchangeType, InvoiceSettingsType
 from nxtbn.core.models import CurrencyExchange, InvoiceSettings
-from graphene_django.filter import DjangoFilterConnectionField
+from nxtbn.core.graphql_connection import NxtbnFilterConnectionField
 
 
 class AdminCoreQuery(graphene.ObjectType):
-    currency_exchanges = DjangoFilterConnectionField(CurrencyExchangeType)
+    currency_exchanges = NxtbnFilterConnectionField(CurrencyExchangeType)
     currency_exchange = graphene.Field(CurrencyExchangeType, id=graphene.ID(required=True))
     allowed_currency_list = graphene.List(AdminCurrencyTypesEnum)
     invoice_setting = graphene.Field(InvoiceSettingsType, invoice_settings_id=graphene.ID(required=False))
-    invoice_settings = DjangoFilterConnectionField(InvoiceSettingsType)
+    invoice_settings = NxtbnFilterConnectionField(InvoiceSettingsType)
 
     @gql_store_admin_required
     def resolve_currency_exchanges(self, info, **kwargs):
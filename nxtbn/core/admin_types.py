@@ -4,6 +4,7 @@ from graphene_django.types import DjangoObjectType
 
 from nxtbn.core import CurrencyTypes
 from nxtbn.core.models import CurrencyExchange, InvoiceSettings, SiteSettings
+from nxtbn.core.graphql_connection import NxtbnConnection
 
 class CurrencyExchangeType(DjangoObjectType):
     db_id = graphene.ID(source='id')
@@ -11,6 +12,7 @@ class CurrencyExchangeType(DjangoObjectType):
         model = CurrencyExchange
         fields = "__all__"
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filter_fields = {
             'base_currency': ['exact', 'icontains'],
             'target_currency': ['exact', 'icontains'],
@@ -30,6 +32,7 @@ class InvoiceSettingsType(DjangoObjectType):
         model = InvoiceSettings
         fields = "__all__"
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filter_fields = {
             'store_name': ['exact', 'icontains'],
         }
@@ -5,7 +5,7 @@ from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 from django.db import transaction
 
-from nxtbn.core.models import InvoiceSettings, SiteSettings
+from nxtbn.core.models import BulkDeleteJob, InvoiceSettings, SiteSettings
 
 class SiteSettingsSerializer(serializers.ModelSerializer):
     class Meta:
@@ -32,4 +32,26 @@ class InvoiceSettingsLogoSerializer(serializers.ModelSerializer):
     class Meta:
         model = InvoiceSettings
         fields = ['id', 'logo']
-        read_only_fields = ['id']
\ No newline at end of file
+        read_only_fields = ['id']
+
+
+class BulkDeleteJobSerializer(serializers.ModelSerializer):
+    total_count = serializers.SerializerMethodField()
+
+    class Meta:
+        model = BulkDeleteJob
+        fields = [
+            'id',
+            'target',
+            'status',
+            'total_count',
+            'processed_count',
+            'deleted_count',
+            'skipped',
+            'failure_reason',
+            'created_at',
+            'finished_at',
+        ]
+
+    def get_total_count(self, obj):
+        return len(obj.object_ids)
@@ -10,4 +10,5 @@ urlpatterns = [
     path('system-status/', status_views.SystemStatusAPIView.as_view(), name='system-status'),
     path('db-tables-details/', status_views.DatabaseTableInfoAPIView.as_view(), name='db-details'),
     path('language-list/', core_views.LanguageChoicesAPIView.as_view(), name='language-list'),
+    path('bulk-delete-jobs/<int:pk>/', core_views.BulkDeleteJobDetailView.as_view(), name='bulk-delete-job-detail'),
 ]
@@ -27,8 +27,9 @@ from rest_framework import serializers
 
 from nxtbn.core import LanguageChoices
 from nxtbn.core.admin_permissions import GranularPermission, IsStoreAdmin, IsStoreStaff
-from nxtbn.core.api.dashboard.serializers import InvoiceSettingsLogoSerializer, InvoiceSettingsSerializer, SiteSettingsSerializer
-from nxtbn.core.models import InvoiceSettings, SiteSettings
+from nxtbn.core.api.dashboard.serializers import BulkDeleteJobSerializer, InvoiceSettingsLogoSerializer, InvoiceSettingsSerializer, SiteSettingsSerializer
+from nxtbn.core.bulk_delete import start_bulk_delete
+from nxtbn.core.models import BulkDeleteJob, InvoiceSettings, SiteSettings
 from nxtbn.users import UserRole
 
 
@@ -76,4 +77,32 @@ class LanguageChoicesAPIView(APIView):
             {"value": lang_value, "label": lang_label}
             for lang_value, lang_label in LanguageChoices.choices
         ]
-        return Response(languages, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(languages, status=status.HTTP_200_OK)
+
+
+class BulkDeleteAPIView(generics.DestroyAPIView):
+    """
+    Base view for bulk deletes: queues a background job deleting the comma separated ids of
+    `ids_param` with the `bulk_delete_target` handler, see `nxtbn.core.bulk_delete`, and
+    answers 202 with the job. Progress is read from `BulkDeleteJobDetailView`.
+    """
+    permission_classes = (GranularPermission, )
+    bulk_delete_target = None
+    ids_param = 'ids'
+
+    def destroy(self, request, *args, **kwargs):
+        try:
+            ids = [int(pk) for pk in request.query_params.get(self.ids_param, '').split(',') if pk.strip()]
+        except ValueError:
+            return Response({'detail': _("Ids must be integers.")}, status=status.HTTP_400_BAD_REQUEST)
+        if not ids:
+            return Response({'detail': _("No ids given.")}, status=status.HTTP_400_BAD_REQUEST)
+
+        job = start_bulk_delete(self.bulk_delete_target, ids, request.user)
+        return Response(BulkDeleteJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+class BulkDeleteJobDetailView(generics.RetrieveAPIView):
+    permission_classes = (IsStoreStaff,)
+    queryset = BulkDeleteJob.objects.all()
+    serializer_class = BulkDeleteJobSerializer
@@ -7,3 +7,5 @@ class CoreConfig(AppConfig):
 
     def ready(self):
         import nxtbn.core.receivers  # noqa
+        from nxtbn.core.bulk_delete import autodiscover
+        autodiscover()
@@ -0,0 +1,33 @@
+import threading
+
+from django.db import transaction
+
+
+class OnCommitBatch:
+    """
+    Collects ids during a transaction and hands them to `handler` once it commits.
+
+    Ids collected during one transaction are handled together by the first commit callback,
+    so saving a product with its variants and translations triggers a single `handler` call.
+    Ids left behind by a rolled back transaction are handled with the next commit.
+    Outside of a transaction the handler runs immediately.
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+        self._local = threading.local()
+
+    def add(self, ids):
+        ids = {pk for pk in ids if pk is not None}
+        if not ids:
+            return
+        if getattr(self._local, 'ids', None) is None:
+            self._local.ids = set()
+        self._local.ids.update(ids)
+        transaction.on_commit(self.flush)
+
+    def flush(self):
+        ids = getattr(self._local, 'ids', None)
+        if ids:
+            self._local.ids = set()
+            self.handler(ids)
@@ -0,0 +1,163 @@
+"""
+Background bulk deletes.
+
+A `BulkDeleteHandler` is registered per model with `register_bulk_delete` in the app's
+`bulk_delete` module, discovered when the core app is ready. Deleting goes through a
+`BulkDeleteJob` processed by `run_bulk_delete_job` in chunks of `BULK_DELETE_CHUNK_SIZE`
+ids, one transaction per chunk, committing the progress with the chunk.
+
+Before a chunk is deleted, the objects that can not be deleted are found with one query
+per PROTECT/RESTRICT relation reachable through cascades, eg. products whose variants
+are on order lines, and recorded as skipped instead of failing the chunk.
+
+Handlers with `raw_delete` delete the chunk with one `DELETE` per table along the cascade,
+without loading instances or sending signals; they must do in `after_delete` what the
+receivers of the cascaded models would have done. Other handlers use the regular collector.
+"""
+from django.conf import settings
+from django.db import models, router, transaction
+from django.db.models.deletion import get_candidate_relations_to_delete
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from nxtbn.core import BulkDeleteStatus
+from nxtbn.core.models import BulkDeleteJob
+
+
+# Protection lookups are followed this many cascades deep
+MAX_CASCADE_DEPTH = 4
+
+_handlers = {}
+
+
+def register_bulk_delete(handler_class):
+    """Class decorator registering a handler under its model's label, eg. 'product.product'."""
+    _handlers[handler_class.model._meta.label_lower] = handler_class()
+    return handler_class
+
+
+def get_bulk_delete_handler(target):
+    return _handlers[target]
+
+
+def autodiscover():
+    autodiscover_modules('bulk_delete')
+
+
+def _protections(model, forward_path=(), seen=()):
+    """
+    Yields `(protecting model, lookup)` for every PROTECT or RESTRICT relation reached from
+    `model` through cascades, the lookup leading from the protecting model to the deleted pk.
+    """
+    if len(forward_path) > MAX_CASCADE_DEPTH:
+        return
+    for relation in get_candidate_relations_to_delete(model._meta):
+        field = relation.field
+        on_delete = field.remote_field.on_delete
+        path = (field.name, *forward_path)
+        if on_delete in (models.PROTECT, models.RESTRICT):
+            yield relation.related_model, '__'.join(path)
+        elif on_delete == models.CASCADE and relation.related_model not in seen:
+            yield from _protections(relation.related_model, path, (*seen, model))
+
+
+def raw_cascade_delete(model, pks):
+    """
+    Deletes the rows with the given pks and every row cascading from them with one `DELETE`
+    per table, children first. Returns the number of `model` rows deleted.
+    """
+    if not pks:
+        return 0
+    using = router.db_for_write(model)
+    for relation in get_candidate_relations_to_delete(model._meta):
+        field = relation.field
+        on_delete = field.remote_field.on_delete
+        related = relation.related_model._base_manager.using(using).filter(**{f'{field.name}__in': pks})
+        if on_delete == models.CASCADE:
+            raw_cascade_delete(relation.related_model, list(related.values_list('pk', flat=True)))
+        elif on_delete == models.SET_NULL:
+            related.update(**{field.name: None})
+        elif on_delete != models.DO_NOTHING and related.exists():
+            raise models.ProtectedError(
+                f"{relation.related_model._meta.verbose_name_plural} still reference the deleted {model._meta.verbose_name_plural}",
+                set(),
+            )
+    return model._base_manager.using(using).filter(pk__in=pks)._raw_delete(using)
+
+
+class BulkDeleteHandler:
+    model = None
+    raw_delete = False
+
+    def get_queryset(self):
+        """Objects that may be deleted at all, ids outside of it are skipped."""
+        return self.model._default_manager.all()
+
+    def protected(self, ids):
+        """Returns `{id: reason}` of the ids that can not be deleted, with one query per protecting relation."""
+        protected = {}
+        for protecting_model, lookup in _protections(self.model):
+            referenced = (
+                protecting_model._base_manager.filter(**{f'{lookup}__in': ids})
+                .values_list(lookup, flat=True)
+                .distinct()
+            )
+            for pk in referenced:
+                protected.setdefault(pk, f"Referenced by {protecting_model._meta.verbose_name_plural}.")
+        return protected
+
+    def delete(self, ids):
+        if self.raw_delete:
+            return raw_cascade_delete(self.model, ids)
+        return self.model._default_manager.filter(pk__in=ids).delete()[1].get(self.model._meta.label, 0)
+
+    def after_delete(self, ids):
+        """Runs in the chunk's transaction once `ids` are deleted."""
+
+    def delete_chunk(self, ids):
+        """Deletes the deletable objects among `ids`. Returns `(deleted count, {id: reason} of the skipped ones)`."""
+        existing = set(self.get_queryset().filter(pk__in=ids).values_list('pk', flat=True))
+        skipped = {pk: "Not found." for pk in ids if pk not in existing}
+        skipped.update(self.protected(list(existing)))
+        deletable = [pk for pk in ids if pk not in skipped]
+        deleted = self.delete(deletable) if deletable else 0
+        if deletable:
+            self.after_delete(deletable)
+        return deleted, skipped
+
+
+def start_bulk_delete(target, ids, user):
+    """Creates the job deleting `ids` of the `target` handler and queues it once the transaction commits."""
+    from nxtbn.core.tasks import run_bulk_delete
+
+    get_bulk_delete_handler(target)
+    job = BulkDeleteJob.objects.create(created_by=user, target=target, object_ids=list(dict.fromkeys(ids)))
+    transaction.on_commit(lambda: run_bulk_delete.delay(job.id))
+    return job
+
+
+def run_bulk_delete_job(job, chunk_size=None):
+    """Deletes the ids of `job` after its `processed_count`, committing the progress with every chunk."""
+    chunk_size = chunk_size or settings.BULK_DELETE_CHUNK_SIZE
+    handler = get_bulk_delete_handler(job.target)
+
+    job.status = BulkDeleteStatus.RUNNING
+    job.failure_reason = ''
+    job.save(update_fields=['status', 'failure_reason', 'last_modified'])
+
+    while job.processed_count < len(job.object_ids):
+        ids = job.object_ids[job.processed_count:job.processed_count + chunk_size]
+        with transaction.atomic():
+            deleted, skipped = handler.delete_chunk(ids)
+            job.processed_count += len(ids)
+            job.deleted_count += deleted
+            job.skipped += [{'id': pk, 'reason': reason} for pk, reason in skipped.items()]
+            job.save(update_fields=['processed_count', 'deleted_count', 'skipped', 'last_modified'])
+
+    job.status = BulkDeleteStatus.COMPLETED
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'finished_at', 'last_modified'])
+
+
+def fail_bulk_delete_job(job, reason):
+    BulkDeleteJob.objects.filter(pk=job.pk).update(status=BulkDeleteStatus.FAILED, failure_reason=reason, last_modified=timezone.now())
@@ -1,17 +1,87 @@
+import threading
+import time
+import uuid
 from abc import ABC, abstractmethod
 from decimal import Decimal
 from typing import Dict, List
 from django.conf import settings
+from django.db import transaction
+from nxtbn.core.batching import OnCommitBatch
+from nxtbn.core.graphql_cache import invalidate_storefront_graphql_cache
 from nxtbn.core.models import CurrencyExchange
+from nxtbn.core.signal_initiators import exchange_rates_changed
 from django.core.cache import caches
-from babel.numbers import format_currency
+from nxtbn.core.currency.formatter import get_currency_formatter
+
+
+# Process-local copy of every exchange rate, per base currency:
+# {base_currency: {'version': ..., 'rates': {target_currency: rate}, 'checked_at': monotonic time}}
+_local_rates = {}
+_lock = threading.Lock()
+
+# Rate sets and the version pointing at them expire together, after which readers start a new version
+RATE_SET_TIMEOUT = 60 * 60 * 24
+
+
+def _version_key(base_currency):
+    return f"exchange_rates_version_{base_currency}"
+
+
+def _rate_set_key(base_currency, version):
+    return f"exchange_rates_{base_currency}_{version}"
+
+
+def _bump_rates_versions(base_currencies):
+    cache = caches['generic']
+    for base_currency in base_currencies:
+        cache.set(_version_key(base_currency), uuid.uuid4().hex, timeout=RATE_SET_TIMEOUT)
+
+
+def publish_exchange_rates(base_currency, rates, changed=None):
+    """
+    Publishes `rates`, every rate of `base_currency`, as a new version with a single cache
+    write holding both the rate set and the version pointing at it, so readers switch from
+    the old set to the new one at once and never see a mix of both. `exchange_rates_changed`
+    is sent for the `changed` currencies, every currency of `rates` by default.
+    """
+    version = uuid.uuid4().hex
+    _local_rates.pop(base_currency, None)
+    caches['generic'].set_many(
+        {_rate_set_key(base_currency, version): rates, _version_key(base_currency): version},
+        timeout=RATE_SET_TIMEOUT,
+    )
+    # bulk upserts send no post_save, cached storefront responses would keep the old rates
+    invalidate_storefront_graphql_cache(CurrencyExchange)
+    changed = list(rates) if changed is None else list(changed)
+    if changed:
+        exchange_rates_changed.send(sender=CurrencyExchange, base_currency=base_currency, currencies=changed)
+
+
+_version_batch = OnCommitBatch(_bump_rates_versions)
+
+
+def invalidate_exchange_rates(base_currency):
+    """
+    Drops this process's rates right away and, once the transaction commits, bumps the
+    version in CACHES["generic"] so the other processes reload theirs at their next check.
+    """
+    _local_rates.pop(base_currency, None)
+    _version_batch.add([base_currency])
 
 
 class CurrencyBackend(ABC):
+    """
+    Exchange rates are read from a process-local dict holding every rate of the base
+    currency. The shared cache holds the current version and the rate set of each version,
+    the version being checked at most every `EXCHANGE_RATE_VERSION_CHECK_INTERVAL` seconds,
+    so converting prices costs neither queries nor cache round-trips in between. A new
+    version is loaded from its cached rate set, or with one query when there is none.
+    Without a shared cache backend the rates are reloaded after every interval.
+    """
     def __init__(self):
         self.base_currency = settings.BASE_CURRENCY
-        self.cache_key_prefix = f"exchange_rate_{self.base_currency}_to"
-        self.timeout = 604800 # Cache for 1 week
+        self.version_key = _version_key(self.base_currency)
+        self.check_interval = settings.EXCHANGE_RATE_VERSION_CHECK_INTERVAL
         self.cache_backend = 'generic'
 
 
@@ -25,42 +95,79 @@ class CurrencyBackend(ABC):
         pass
 
     def refresh_rate(self):
-        cache = caches[self.cache_backend]
+        """
+        Upserts every fetched rate with one query and, once committed, publishes the
+        full rate set of the base currency as a new version when any rate moved. Returns
+        the number of rates.
+        """
+        exchange_rate_field = CurrencyExchange._meta.get_field('exchange_rate')
+        rates = {
+            data['target_currency']: Decimal(str(data['exchange_rate'])).quantize(
+                Decimal(1).scaleb(-exchange_rate_field.decimal_places)
+            )
+            for data in self.fetch_data() or []
+        }
+        if not rates:
+            return 0
 
-        for fetch_data in self.fetch_data():
-            CurrencyExchange.objects.update_or_create(
-                base_currency=self.base_currency,
-                target_currency=fetch_data['target_currency'],
-                defaults={'exchange_rate': fetch_data['exchange_rate']}
+        with transaction.atomic():
+            previous = self.load_rates()
+            changed = [currency for currency, rate in rates.items() if previous.get(currency) != rate]
+            CurrencyExchange.objects.bulk_create(
+                [
+                    CurrencyExchange(base_currency=self.base_currency, target_currency=target_currency, exchange_rate=exchange_rate)
+                    for target_currency, exchange_rate in rates.items()
+                ],
+                update_conflicts=True,
+                unique_fields=['base_currency', 'target_currency'],
+                update_fields=['exchange_rate', 'last_modified'],
             )
-            key = f"{self.cache_key_prefix}_{fetch_data['target_currency']}"
-            cache.set(key, fetch_data['exchange_rate'], timeout=self.timeout)
+            if changed:
+                transaction.on_commit(lambda: publish_exchange_rates(self.base_currency, self.load_rates(), changed))
+        return len(rates)
+
+    def load_rates(self) -> Dict[str, Decimal]:
+        return dict(
+            CurrencyExchange.objects.filter(base_currency=self.base_currency)
+            .values_list('target_currency', 'exchange_rate')
+        )
+
+
+    def get_rates(self) -> Dict[str, Decimal]:
+        """Every exchange rate from the base currency, `{target_currency: rate}`."""
+        now = time.monotonic()
+        local = _local_rates.get(self.base_currency)
+        if local is not None and now - local['checked_at'] < self.check_interval:
+            return local['rates']
+
+        cache = caches[self.cache_backend]
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, uuid.uuid4().hex, timeout=RATE_SET_TIMEOUT)
+            version = cache.get(self.version_key)
+
+        if local is not None and version is not None and local['version'] == version:
+            local['checked_at'] = now
+            return local['rates']
+
+        rates = cache.get(_rate_set_key(self.base_currency, version)) if version is not None else None
+        if rates is None:
+            rates = self.load_rates()
+            if version is not None:
+                cache.add(_rate_set_key(self.base_currency, version), rates, timeout=RATE_SET_TIMEOUT)
+        with _lock:
+            _local_rates[self.base_currency] = {'version': version, 'rates': rates, 'checked_at': now}
+        return rates
 
 
     def get_exchange_rate(self, target_currency: str) -> float:
         if target_currency == self.base_currency:
             return 1.0
-        
-        
-        cache = caches[self.cache_backend]
-        key = f"{self.cache_key_prefix}_{target_currency}"
-        rate = cache.get(key)
-        if rate:
-            return rate
-       
-        
-        # Fallback to database if not found in cache
-        exchange_rate = CurrencyExchange.objects.filter(
-            base_currency=self.base_currency,
-            target_currency=target_currency
-        ).values_list('exchange_rate', flat=True).first()
 
+        exchange_rate = self.get_rates().get(target_currency)
         if exchange_rate is None:
             raise ValueError(f"Exchange rate not found for {target_currency}")
-        
-        
-        cache.set(key, exchange_rate, timeout=self.timeout)
-       
+
         return exchange_rate
 
 
@@ -80,7 +187,7 @@ class CurrencyBackend(ABC):
         exchange_rate = self.get_exchange_rate(target_currency)
         converted_amount = Decimal(amount) * exchange_rate
         if locale:
-            formatted_amount = format_currency(converted_amount, target_currency, locale=locale, format_type='standard')
+            formatted_amount = get_currency_formatter(target_currency, locale).format(converted_amount)
         else:
             formatted_amount = converted_amount
     
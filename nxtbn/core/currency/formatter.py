@@ -0,0 +1,103 @@
+"""
+Precompiled currency formatters.
+
+`get_currency_formatter` compiles, once per currency and locale, everything the money
+helpers of `nxtbn.core.utils` used to rebuild on each call: the currency precision, the
+quantizer, the subunit factor and the babel `NumberPattern` of the locale with its symbols
+resolved. Formatting then comes down to a quantize and a string format.
+
+Output matches babel's `format_currency(amount, currency, locale=locale)`. Patterns the
+fast path does not cover (non-uniform grouping, scientific or significant digit patterns,
+currency names) are rendered by babel itself.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+import re
+
+from babel import Locale
+from babel.numbers import get_currency_precision, get_currency_symbol, get_decimal_symbol, get_group_symbol
+from money.money import Currency
+
+
+_QUOTED = re.compile(r"'([^']*)'")
+
+
+def _unquote(text):
+    return _QUOTED.sub(lambda match: match.group(1) or "'", text)
+
+
+class CurrencyFormatter:
+
+    def __init__(self, currency_code, locale=''):
+        try:
+            Currency(currency_code)
+            self.is_valid = True
+        except ValueError:
+            self.is_valid = False # babel still formats codes py-money does not know
+        try:
+            self.precision = get_currency_precision(currency_code)
+        except KeyError:
+            raise ValueError(f"Currency precision not found for: {currency_code}")
+
+        self.currency_code = currency_code
+        self.quantizer = Decimal(1).scaleb(-self.precision)
+        self.subunit_factor = 10 ** self.precision
+        self.locale = Locale.parse(locale) if locale else None
+        self.pattern = self.locale.currency_formats['standard'] if self.locale else None
+        self._compile_pattern()
+
+    def _compile_pattern(self):
+        """Resolves the prefixes, suffixes and symbols of the pattern, or leaves `affixes` unset for babel to render."""
+        self.affixes = None
+        pattern = self.pattern
+        if pattern is None:
+            return
+        if (
+            pattern.exp_prec or '@' in pattern.pattern or pattern.scale or pattern.number_pattern == ''
+            or pattern.grouping != (3, 3) or pattern.int_prec[0] > 1
+            or any('¤¤¤' in affix for affix in (*pattern.prefix, *pattern.suffix))
+        ):
+            return
+
+        symbol = get_currency_symbol(self.currency_code, self.locale)
+
+        def resolve(affix):
+            return _unquote(affix.replace('¤¤', self.currency_code.upper()).replace('¤', symbol))
+
+        self.affixes = tuple((resolve(pattern.prefix[sign]), resolve(pattern.suffix[sign])) for sign in (0, 1))
+        self.separators = str.maketrans({',': get_group_symbol(self.locale), '.': get_decimal_symbol(self.locale)})
+
+    def validate(self):
+        if not self.is_valid:
+            raise ValueError(f"Invalid currency code: {self.currency_code}")
+        return self
+
+    def quantize(self, amount):
+        """`amount` as a `Decimal` rounded half up to the precision of the currency."""
+        return Decimal(amount).quantize(self.quantizer, rounding=ROUND_HALF_UP)
+
+    def to_subunit(self, amount):
+        return int((Decimal(amount) * self.subunit_factor).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+    def to_unit(self, subunit):
+        return (Decimal(subunit) / self.subunit_factor).quantize(self.quantizer, rounding=ROUND_HALF_UP)
+
+    def format_plain(self, amount):
+        """`amount` with the currency's number of decimal places and no symbol, rounded half even."""
+        return f"{Decimal(amount):.{self.precision}f}"
+
+    def format(self, amount):
+        """Same as babel's `format_currency(amount, currency_code, locale=locale)`."""
+        if not isinstance(amount, Decimal):
+            amount = Decimal(str(amount))
+        if self.affixes is None or not amount.is_finite():
+            return self.pattern.apply(amount, self.locale, currency=self.currency_code)
+        prefix, suffix = self.affixes[int(amount.is_signed())]
+        number = f"{abs(amount).quantize(self.quantizer):,f}".translate(self.separators)
+        return f"{prefix}{number}{suffix}"
+
+
+@lru_cache(maxsize=1024)
+def get_currency_formatter(currency_code, locale=''):
+    """The `CurrencyFormatter` of `currency_code` in `locale`, compiled on first use."""
+    return CurrencyFormatter(currency_code, locale)
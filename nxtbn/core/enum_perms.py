@@ -16,9 +16,13 @@ class PermissionsEnum(models.TextChoices):
 
     CAN_BULK_PRODUCT_STATUS_UPDATE = "can_bulk_product_status_update"
     CAN_BULK_PRODUCT_DELETE = "can_bulk_product_delete"
+    CAN_IMPORT_PRODUCTS = "can_import_products"
+    CAN_BULK_REPRICE_VARIANTS = "can_bulk_reprice_variants"
+    CAN_BULK_PROMO_CODE_DELETE = "can_bulk_promo_code_delete"
 
     CAN_RECEIVE_TRANSFERRED_STOCK = "can_receive_transferred_stock" 
     CAN_MARK_STOCK_TRANSFER_AS_COMPLETED = "can_mark_stock_transfer_as_completed"
 
     CAN_READ_CUSTOMER = "can_read_customer"
-    CAN_UPDATE_CUSTOMER = "can_create_customer"
\ No newline at end of file
+    CAN_UPDATE_CUSTOMER = "can_create_customer"
+    CAN_BULK_CUSTOMER_DELETE = "can_bulk_customer_delete"
\ No newline at end of file
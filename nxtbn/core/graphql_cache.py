@@ -0,0 +1,274 @@
+import hashlib
+import json
+import uuid
+from functools import lru_cache
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils.translation import get_language
+from graphene_django.views import GraphQLView
+from graphql import FieldNode, OperationType, TypeInfo, TypeInfoVisitor, Visitor, get_named_type, parse, print_ast, visit
+from graphql.utilities import get_operation_ast
+
+
+class ResponseCacheTags:
+    """
+    Tags of the storefront GraphQL response cache.
+
+    A tag is a model label (eg. 'product.product'). Every cached response records the version of
+    each tag it depends on; saving or deleting a row bumps the version of the model's tag, so only
+    the entries built from that model become stale.
+    """
+
+    WATCHED = frozenset({
+        'product.product',
+        'product.productvariant',
+        'product.category',
+        'product.collection',
+        'product.producttag',
+        'product.producttype',
+        'product.supplier',
+        'tax.taxclass',
+        'filemanager.image',
+        'core.currencyexchange',
+        'warehouse.stock',
+    })
+
+    # Models read implicitly by the resolvers of another model's type,
+    # eg. ProductGraphType.price reads the default variant and the exchange rate.
+    DEPENDENCIES = {
+        'product.product': ('product.productvariant', 'filemanager.image', 'core.currencyexchange'),
+        'product.productvariant': ('core.currencyexchange',),
+    }
+
+    # Non-model fields that aggregate other models, by (parent type name, field name).
+    FIELD_DEPENDENCIES = {
+        ('ProductGraphTypeConnection', 'facets'): (
+            'product.category',
+            'product.collection',
+            'product.producttype',
+            'warehouse.stock',
+        ),
+    }
+
+    # Translations are resolved through the type of the translated model.
+    PARENTS = {
+        'product.producttranslation': 'product.product',
+        'product.productvarianttranslation': 'product.productvariant',
+        'product.categorytranslation': 'product.category',
+        'product.collectiontranslation': 'product.collection',
+        'product.producttagtranslation': 'product.producttag',
+        'product.suppliertranslation': 'product.supplier',
+    }
+
+    @classmethod
+    def for_model(cls, model):
+        label = model._meta.label_lower
+        return cls.PARENTS.get(label, label)
+
+    @classmethod
+    def expand(cls, tags):
+        expanded = set(tags)
+        for tag in tags:
+            expanded.update(cls.DEPENDENCIES.get(tag, ()))
+        return frozenset(expanded)
+
+
+class _ModelTagCollector(Visitor):
+    """Collects the tags of every Django model type selected anywhere in a document."""
+
+    def __init__(self, type_info):
+        super().__init__()
+        self.type_info = type_info
+        self.tags = set()
+
+    def enter_field(self, node, *args):
+        parent_type = self.type_info.get_parent_type()
+        if parent_type is not None:
+            self.tags.update(ResponseCacheTags.FIELD_DEPENDENCIES.get((parent_type.name, node.name.value), ()))
+
+        field_type = self.type_info.get_type()
+        if field_type is None:
+            return
+        graphene_type = getattr(get_named_type(field_type), 'graphene_type', None)
+        model = getattr(getattr(graphene_type, '_meta', None), 'model', None)
+        if model is not None:
+            self.tags.add(ResponseCacheTags.for_model(model))
+
+
+class GraphQLResponseCache:
+    """
+    Tag-versioned response cache for read-only storefront GraphQL queries.
+
+    Entries are keyed by a hash of the normalized document, the variables, the active language
+    (resolved from `Accept-Language`), the request currency (resolved from `Accept-Currency`) and
+    the auth state. A lookup fetches the entry and the current versions of its tags in one
+    `get_many` round-trip and never touches the database.
+    """
+
+    cacheable_fields = frozenset({
+        'product',
+        'products',
+        'categories',
+        'categoriesHierarchical',
+        'collections',
+        'tags',
+    })
+
+    def __init__(self, schema=None):
+        self.schema = schema
+        self.cache_backend = 'generic'
+        self.key_prefix = 'storefront_gql'
+        self.timeout = getattr(settings, 'STOREFRONT_GRAPHQL_CACHE_TIMEOUT', 300)
+        self.analyze = lru_cache(maxsize=512)(self._analyze) # storefronts send a small set of distinct documents
+
+    @property
+    def cache(self):
+        return caches[self.cache_backend]
+
+    def _analyze(self, query, operation_name):
+        """
+        Returns a (normalized document hash, tags) tuple if the operation is a cacheable query, None otherwise.
+        """
+        try:
+            document = parse(query)
+        except Exception:
+            return None
+
+        operation = get_operation_ast(document, operation_name)
+        if operation is None or operation.operation != OperationType.QUERY:
+            return None
+
+        for selection in operation.selection_set.selections:
+            if not isinstance(selection, FieldNode) or selection.name.value not in self.cacheable_fields:
+                return None
+
+        type_info = TypeInfo(self.schema.graphql_schema)
+        collector = _ModelTagCollector(type_info)
+        visit(document, TypeInfoVisitor(type_info, collector))
+
+        normalized = f"{operation_name or ''}:{print_ast(document)}"
+        return hashlib.sha256(normalized.encode()).hexdigest(), ResponseCacheTags.expand(collector.tags)
+
+    def get_auth_state(self, request):
+        if request.headers.get('Authorization') or request.COOKIES.get('access_token'):
+            return 'auth'
+        user = getattr(request, 'user', None)
+        return 'auth' if user is not None and user.is_authenticated else 'anon'
+
+    def make_key(self, request, document_hash, variables):
+        parts = json.dumps(
+            [
+                document_hash,
+                variables or {},
+                get_language(),
+                getattr(request, 'currency', settings.BASE_CURRENCY),
+                self.get_auth_state(request),
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        return f"{self.key_prefix}:{hashlib.sha256(parts.encode()).hexdigest()}"
+
+    def tag_key(self, tag):
+        return f"{self.key_prefix}:tag:{tag}"
+
+    def get(self, key, tags):
+        """
+        Returns a (body, tag versions) tuple. The body is None on a miss or when any tag
+        has been bumped since the entry was stored.
+        """
+        tag_keys = {self.tag_key(tag): tag for tag in tags}
+        found = self.cache.get_many([key, *tag_keys])
+        versions = {tag: found.get(tag_key) for tag_key, tag in tag_keys.items()}
+
+        entry = found.get(key)
+        if entry is None or entry['tags'] != versions:
+            return None, versions
+        return entry['body'], versions
+
+    def set(self, key, body, versions):
+        """
+        Stores a response built while `versions` were current. Versions must be read before
+        executing the query so an invalidation that races with the execution is never lost.
+        """
+        versions = dict(versions)
+        for tag, version in versions.items():
+            if version is None:
+                versions[tag] = uuid.uuid4().hex
+                if not self.cache.add(self.tag_key(tag), versions[tag], timeout=None):
+                    return # Tag was bumped concurrently, the response may already be stale
+        self.cache.set(key, {'tags': versions, 'body': body}, timeout=self.timeout)
+
+    def invalidate(self, *tags):
+        self.cache.set_many({self.tag_key(tag): uuid.uuid4().hex for tag in tags}, timeout=None)
+
+
+def invalidate_storefront_graphql_cache(*models):
+    """Makes every cached storefront response that depends on any of the given models stale."""
+    tags = {ResponseCacheTags.for_model(model) for model in models} & ResponseCacheTags.WATCHED
+    if tags:
+        GraphQLResponseCache().invalidate(*tags)
+
+
+def _invalidate_on_change(sender, **kwargs):
+    invalidate_storefront_graphql_cache(sender)
+
+
+def _invalidate_on_m2m_change(sender, instance, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_storefront_graphql_cache(type(instance))
+
+
+def connect_storefront_graphql_cache_receivers():
+    """
+    Connects the invalidation receivers to the watched models only. Receivers without a sender
+    would disable Django's fast-path deletes for every model in the project.
+    """
+    for label in ResponseCacheTags.WATCHED | set(ResponseCacheTags.PARENTS):
+        model = apps.get_model(label)
+        post_save.connect(_invalidate_on_change, sender=model, dispatch_uid=f'storefront_gql_save_{label}')
+        post_delete.connect(_invalidate_on_change, sender=model, dispatch_uid=f'storefront_gql_delete_{label}')
+        for field in model._meta.local_many_to_many:
+            m2m_changed.connect(
+                _invalidate_on_m2m_change,
+                sender=field.remote_field.through,
+                dispatch_uid=f'storefront_gql_m2m_{label}_{field.name}',
+            )
+
+
+class CachedGraphQLView(GraphQLView):
+    """GraphQLView that serves cacheable queries from `GraphQLResponseCache` without executing resolvers."""
+
+    response_cache = None
+    _response_caches = {}  # id(schema) -> GraphQLResponseCache, as_view builds a view instance per request
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.response_cache is None:
+            response_cache = self._response_caches.get(id(self.schema))
+            if response_cache is None:
+                response_cache = self._response_caches[id(self.schema)] = GraphQLResponseCache(self.schema)
+            self.response_cache = response_cache
+
+    def get_response(self, request, data, show_graphiql=False):
+        if show_graphiql or self.batch:
+            return super().get_response(request, data, show_graphiql)
+
+        query, variables, operation_name, _id = self.get_graphql_params(request, data)
+        analysis = self.response_cache.analyze(query, operation_name) if query else None
+        if analysis is None:
+            return super().get_response(request, data, show_graphiql)
+
+        document_hash, tags = analysis
+        key = self.response_cache.make_key(request, document_hash, variables)
+        body, versions = self.response_cache.get(key, tags)
+        if body is not None:
+            return body, 200
+
+        result, status_code = super().get_response(request, data, show_graphiql)
+        if status_code == 200 and result is not None and 'errors' not in json.loads(result):
+            self.response_cache.set(key, result, versions)
+        return result, status_code
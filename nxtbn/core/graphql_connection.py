@@ -0,0 +1,135 @@
+import hashlib
+import json
+
+import graphene
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError, connections
+from django.db.models import QuerySet
+from graphene import relay
+from graphene.relay.connection import connection_adapter, page_info_adapter
+from graphene_django.filter import DjangoFilterConnectionField
+from graphene_django.utils import maybe_queryset
+from graphql_relay import get_offset_with_default, offset_to_cursor
+
+
+def estimate_count(queryset: QuerySet) -> int:
+    """
+    Returns an approximate row count for the queryset without running COUNT(*) on Postgres.
+
+    - Unfiltered querysets read the planner statistics from `pg_class.reltuples`.
+    - Filtered querysets read the `Plan Rows` estimate from `EXPLAIN (FORMAT JSON)`.
+    - Other databases, or tables never analyzed, fall back to an exact count cached
+      in CACHES["generic"] for `GRAPHQL_ESTIMATED_COUNT_TIMEOUT` seconds.
+    """
+    queryset = queryset.order_by()
+    connection = connections[queryset.db]
+
+    if connection.vendor == 'postgresql':
+        try:
+            with connection.cursor() as cursor:
+                if not queryset.query.where and not queryset.query.distinct:
+                    cursor.execute(
+                        "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                        [queryset.model._meta.db_table],
+                    )
+                    row = cursor.fetchone()
+                    if row and row[0] >= 0: # -1 until the table is analyzed for the first time
+                        return int(row[0])
+                else:
+                    sql, params = queryset.query.sql_with_params()
+                    cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+                    plan = cursor.fetchone()[0]
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    return int(plan[0]['Plan']['Plan Rows'])
+        except DatabaseError:
+            pass
+
+    sql, params = queryset.query.sql_with_params()
+    key = "estimated_count_" + hashlib.sha256(f"{sql}{params}".encode()).hexdigest()
+    cache = caches['generic']
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout=getattr(settings, 'GRAPHQL_ESTIMATED_COUNT_TIMEOUT', 60))
+    return count
+
+
+class NxtbnConnection(relay.Connection):
+    """
+    Relay connection whose counts are computed only when the client selects them.
+
+    `totalCount` runs an exact COUNT(*) over the filtered queryset, `estimatedCount`
+    uses `estimate_count` and is meant for infinite-scroll grids on large tables.
+    """
+    total_count = graphene.Int(description="Exact number of records matching the filters.")
+    estimated_count = graphene.Int(description="Approximate number of records matching the filters.")
+
+    class Meta:
+        abstract = True
+
+    def resolve_total_count(self, info):
+        if getattr(self, 'length', None) is None:
+            iterable = self.iterable
+            self.length = iterable.count() if isinstance(iterable, QuerySet) else len(iterable)
+        return self.length
+
+    def resolve_estimated_count(self, info):
+        if getattr(self, 'length', None) is not None:
+            return self.length
+        if isinstance(self.iterable, QuerySet):
+            return estimate_count(self.iterable)
+        return len(self.iterable)
+
+
+class NxtbnFilterConnectionField(DjangoFilterConnectionField):
+    """
+    DjangoFilterConnectionField that pages forward without counting the queryset.
+
+    Forward pagination (`first`/`after`/`offset`) fetches one extra row to compute
+    `hasNextPage`; backward pagination (`last`/`before`) needs the total and falls back
+    to the default implementation.
+    """
+
+    @classmethod
+    def resolve_connection(cls, connection, args, iterable, max_limit=None):
+        iterable = maybe_queryset(iterable)
+        first = max_limit if args.get("first") is None else args["first"]
+
+        if (
+            not isinstance(iterable, QuerySet)
+            or args.get("last") is not None
+            or args.get("before") is not None
+            or first is None
+        ):
+            return super().resolve_connection(connection, args, iterable, max_limit=max_limit)
+
+        offset = args.pop("offset", None)
+        after = args.get("after")
+        if offset:
+            if after:
+                offset += get_offset_with_default(after, -1) + 1
+            # input offset starts at 1 while the graphene offset starts at 0
+            args["after"] = offset_to_cursor(offset - 1)
+
+        slice_start = get_offset_with_default(args.get("after"), -1) + 1
+        nodes = list(iterable[slice_start:slice_start + first + 1])
+        has_next_page = len(nodes) > first
+        nodes = nodes[:first]
+
+        edges = [
+            connection.Edge(node=node, cursor=offset_to_cursor(slice_start + index))
+            for index, node in enumerate(nodes)
+        ]
+        page_info = page_info_adapter(
+            edges[0].cursor if edges else None,
+            edges[-1].cursor if edges else None,
+            False,
+            has_next_page,
+        )
+
+        resolved = connection_adapter(connection, edges, page_info)
+        resolved.iterable = iterable
+        resolved.length = None
+        return resolved
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.11 on 2026-10-19 04:14
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('core', '0005_invoicesettings_is_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BulkDeleteJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_modified', models.DateTimeField(auto_now=True)),
+                ('target', models.CharField(help_text="Registered handler, eg. 'product.product'.", max_length=100)),
+                ('object_ids', models.JSONField(default=list)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('COMPLETED', 'Completed'), ('FAILED', 'Failed')], default='PENDING', max_length=20)),
+                ('processed_count', models.PositiveIntegerField(default=0, help_text='Ids handled so far, a resumed job continues after them.')),
+                ('deleted_count', models.PositiveIntegerField(default=0)),
+                ('skipped', models.JSONField(blank=True, default=list, help_text="Protected objects as {'id': id, 'reason': message}.")),
+                ('failure_reason', models.TextField(blank=True, default='')),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='bulk_delete_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ('-created_at',),
+            },
+        ),
+    ]
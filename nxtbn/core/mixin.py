@@ -1,11 +1,11 @@
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from money.money import Currency, Money
-from decimal import InvalidOperation
-from money.exceptions import InvalidAmountError, CurrencyMismatchError
+from decimal import Decimal, InvalidOperation
 from typing import TypedDict
 
 from nxtbn.core import MoneyFieldTypes
+from nxtbn.core.currency.formatter import get_currency_formatter
+from nxtbn.core.subunits import is_valid_amount
 
 
 
@@ -36,17 +36,17 @@ class MonetaryMixin:
                 continue  # Skip validation if the amount is None
 
             currency_str = getattr(self, config["currency_field"])
-            try:
-                currency = Currency(currency_str)
-            except ValueError:
+            if not currency_str or not get_currency_formatter(currency_str).is_valid:
                 raise ValidationError({field_name: f"Invalid currency '{currency_str}'"})
 
-            try:
-                if config["type"] == MoneyFieldTypes.UNIT:
-                    Money(amount, currency)
-                elif config["type"] == MoneyFieldTypes.SUBUNIT:
-                    Money.from_sub_units(amount, currency)
-            except (InvalidAmountError, InvalidOperation):
+            if config["type"] == MoneyFieldTypes.UNIT:
+                valid = is_valid_amount(amount, currency_str)
+            else:
+                try:
+                    valid = Decimal(amount) == int(amount)
+                except (InvalidOperation, TypeError, ValueError, OverflowError):
+                    valid = False
+            if not valid:
                 raise ValidationError({field_name: f"Invalid amount '{amount}' for currency '{currency_str}'"})
             
             if config.get("require_base_currency", False):
@@ -5,7 +5,7 @@ from django.utils import timezone
 from django.core.exceptions import ValidationError
 
 from django_extensions.db.fields import AutoSlugField
-from nxtbn.core import CurrencyTypes, LanguageChoices, MoneyFieldTypes, PublishableStatus
+from nxtbn.core import BulkDeleteStatus, CurrencyTypes, LanguageChoices, MoneyFieldTypes, PublishableStatus
 from nxtbn.core.mixin import MonetaryMixin
 from nxtbn.users.admin import User
 from django.contrib.sites.models import Site
@@ -202,4 +202,26 @@ class CurrencyExchange(AbstractBaseModel):
         return f'{self.base_currency}1  TO  {self.target_currency}{self.exchange_rate}'
 
     def __str__(self):
-        return f"{self.base_currency} to {self.target_currency}"
\ No newline at end of file
+        return f"{self.base_currency} to {self.target_currency}"
+
+
+class BulkDeleteJob(AbstractBaseModel):
+    """
+    Objects deleted in the background by `nxtbn.core.tasks.run_bulk_delete`, in chunks,
+    with the handler registered for `target` in `nxtbn.core.bulk_delete`.
+    """
+    created_by = models.ForeignKey(User, on_delete=models.PROTECT, related_name='bulk_delete_jobs')
+    target = models.CharField(max_length=100, help_text="Registered handler, eg. 'product.product'.")
+    object_ids = models.JSONField(default=list)
+    status = models.CharField(max_length=20, choices=BulkDeleteStatus.choices, default=BulkDeleteStatus.PENDING)
+    processed_count = models.PositiveIntegerField(default=0, help_text="Ids handled so far, a resumed job continues after them.")
+    deleted_count = models.PositiveIntegerField(default=0)
+    skipped = models.JSONField(default=list, blank=True, help_text="Protected objects as {'id': id, 'reason': message}.")
+    failure_reason = models.TextField(blank=True, default='')
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ('-created_at',)
+
+    def __str__(self):
+        return f"{self.target} ({self.status})"
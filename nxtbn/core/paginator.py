@@ -1,16 +1,178 @@
+import base64
+import json
+import datetime
+from decimal import Decimal
+from uuid import UUID
+
 from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
 from django.db.models.aggregates import Count
 from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
 
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from collections import OrderedDict
 
 
+class NxtbnKeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination with opaque cursors.
+
+    Rows are ordered by the queryset ordering, or `default_ordering`, with the primary key
+    appended as a tie-breaker, and each page is fetched with a `WHERE (ordering) < (last row)`
+    condition instead of an OFFSET. No COUNT is issued, so any page costs the same as the first
+    one as long as the ordering is backed by an index, eg. (`created_at`, `id`).
+    """
+
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    default_page_size = 20
+    max_page_size = 100
+    default_ordering = ('-created_at', '-pk')
+    invalid_cursor_message = _('Invalid cursor')
+
+    def __init__(self, page_size=None):
+        self.page_size = page_size or self.default_page_size
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, queryset):
+        """
+        Returns the ordering as a list of local, non-nullable field names ending with the primary key.
+        Orderings that can't be used as a keyset (expressions, relations, nullable columns) fall back to
+        `default_ordering`.
+        """
+        opts = queryset.model._meta
+        ordering = list(queryset.query.order_by) or list(opts.ordering)
+
+        if not ordering or not all(self._is_keyset_field(opts, field) for field in ordering):
+            ordering = list(self.default_ordering)
+            if not self._is_keyset_field(opts, ordering[0]):
+                ordering = ['-pk']
+
+        ordering = [
+            field.replace('pk', opts.pk.name) if field.lstrip('-') == 'pk' else field
+            for field in ordering
+        ]
+        if not any(field.lstrip('-') == opts.pk.name for field in ordering):
+            ordering.append(('-' if ordering[-1].startswith('-') else '') + opts.pk.name)
+        return ordering
+
+    def _is_keyset_field(self, opts, field):
+        if not isinstance(field, str):
+            return False
+        name = field.lstrip('-')
+        if name == 'pk':
+            return True
+        try:
+            model_field = opts.get_field(name)
+        except FieldDoesNotExist:
+            return False
+        return model_field.concrete and not model_field.many_to_many and not model_field.null
+
+    def encode_cursor(self, values, reverse=False):
+        def encode(value):
+            if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+                return value.isoformat()
+            if isinstance(value, (Decimal, UUID)):
+                return str(value)
+            return value
+
+        payload = json.dumps({'v': [encode(value) for value in values], 'r': int(reverse)})
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor: # An empty cursor opts into keyset pagination from the first page
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+            values, reverse = payload['v'], bool(payload['r'])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def get_seek_filter(self, values, reverse):
+        """Builds `(a, b) < (x, y)` as `a < x OR (a = x AND b < y)` honoring each column direction."""
+        seek = Q()
+        for index, field in enumerate(self.ordering):
+            descending = field.startswith('-') != reverse
+            condition = Q(**{f"{field.lstrip('-')}__{'lt' if descending else 'gt'}": values[index]})
+            for previous, value in zip(self.ordering[:index], values):
+                condition &= Q(**{previous.lstrip('-'): value})
+            seek |= condition
+        return seek
+
+    def get_values(self, obj):
+        return [getattr(obj, obj._meta.get_field(field.lstrip('-')).attname) for field in self.ordering]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+
+        values, reverse = self.decode_cursor(request)
+        ordering = self.ordering
+        if reverse:
+            ordering = [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self.get_seek_filter(values, reverse))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, values is not None
+
+        self.page = rows
+        return rows
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_values(self.page[-1]))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.get_values(self.page[0]), reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next_page_url', self.get_next_link()),
+            ('previous_page_url', self.get_previous_link()),
+            ('page_size', self.page_size),
+            ('results', data),
+        ]))
+
+
 class NxtbnPagination(PageNumberPagination):
     """
     Custom pagination class for Django REST Framework that allows for configurable
     page sizes. The page size can be set at the view level, and it defaults to `default_page_size`.
+
+    Clients can opt into keyset pagination per request by sending a `cursor` query parameter
+    (empty for the first page), which skips the COUNT and OFFSET of page number pagination.
+    See `NxtbnKeysetPagination`.
     """
 
     default_page_size = 20  # Default number of items per page
@@ -25,8 +187,15 @@ class NxtbnPagination(PageNumberPagination):
                           it defaults to `default_page_size`.
         """
         self.page_size = page_size or self.default_page_size
+        self.keyset_paginator = None
         super().__init__()
 
+    def paginate_queryset(self, queryset, request, view=None):
+        if NxtbnKeysetPagination.cursor_query_param in request.query_params:
+            self.keyset_paginator = NxtbnKeysetPagination(page_size=self.page_size)
+            return self.keyset_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
     def get_paginated_response(self, data):
         """
         Returns a paginated response with the given data.
@@ -34,6 +203,9 @@ class NxtbnPagination(PageNumberPagination):
         :param data: The paginated data to be returned in the response.
         :return: A `Response` object containing pagination details and the results.
         """
+        if self.keyset_paginator is not None:
+            return self.keyset_paginator.get_paginated_response(data)
+
         return Response(OrderedDict([
             ('count', self.page.paginator.count),
             ('current_pagination_step', self.get_html_context()),
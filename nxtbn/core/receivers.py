@@ -1,7 +1,10 @@
 import os
-from django.db.models.signals import post_migrate
+from django.db.models.signals import post_delete, post_migrate, post_save
 from django.dispatch import receiver
-from nxtbn.core.models import InvoiceSettings, SiteSettings
+from nxtbn.core.currency.abstract_base_currency import invalidate_exchange_rates
+from nxtbn.core.graphql_cache import connect_storefront_graphql_cache_receivers
+from nxtbn.core.models import CurrencyExchange, InvoiceSettings, SiteSettings
+from nxtbn.core.signal_initiators import exchange_rates_changed
 from django.contrib.sites.models import Site
 
 from nxtbn.plugins.utils import PLUGIN_BASE_DIR
@@ -66,4 +69,14 @@ def create_default_site_settings(sender, **kwargs):
                         )
                 else:
                     print(f"{plugin_name} plugin not found in {PLUGIN_BASE_DIR}.")
-            
\ No newline at end of file
+
+
+
+@receiver(post_save, sender=CurrencyExchange)
+@receiver(post_delete, sender=CurrencyExchange)
+def invalidate_exchange_rates_on_change(sender, instance, **kwargs):
+    invalidate_exchange_rates(instance.base_currency)
+    exchange_rates_changed.send(sender=CurrencyExchange, base_currency=instance.base_currency, currencies=[instance.target_currency])
+
+
+connect_storefront_graphql_cache_receivers()
@@ -2,3 +2,4 @@ from django.dispatch import Signal
 
 order_created = Signal()
 customer_logged_in = Signal()
+exchange_rates_changed = Signal() # base_currency, currencies
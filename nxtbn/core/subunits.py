@@ -0,0 +1,101 @@
+"""
+Integer-subunit money arithmetic.
+
+Amounts are ints in the smallest unit of their currency (cents, fils, yen), the way `Order`
+and `OrderLineItem` store them. Sums and quantities are exact; percentages are rounded once
+per call, half up or half even (banker's rounding), with integer arithmetic only. Unit
+amounts are converted at the edges with `to_subunits` and `to_units`, using the currency
+precision of `nxtbn.core.currency.formatter`.
+
+Floats are converted through their shortest repr, so 0.1 is 10 cents and never
+0.1000000000000000055511151231257827 dollars.
+"""
+from decimal import Decimal, InvalidOperation, ROUND_HALF_EVEN, ROUND_HALF_UP
+
+from nxtbn.core.currency.formatter import get_currency_formatter
+
+
+ROUNDING_MODES = (ROUND_HALF_UP, ROUND_HALF_EVEN)
+
+
+def _decimal(amount):
+    if isinstance(amount, Decimal):
+        return amount
+    if isinstance(amount, float):
+        return Decimal(repr(amount))
+    return Decimal(amount)
+
+
+def divide(numerator: int, denominator: int, rounding=ROUND_HALF_UP) -> int:
+    """`numerator / denominator` rounded to an int, `rounding` being `ROUND_HALF_UP` or `ROUND_HALF_EVEN`."""
+    if rounding not in ROUNDING_MODES:
+        raise ValueError(f"Unsupported rounding: {rounding}")
+    if denominator < 0:
+        numerator, denominator = -numerator, -denominator
+    quotient, remainder = divmod(abs(numerator), denominator)
+    if remainder * 2 > denominator or (
+        remainder * 2 == denominator and (rounding == ROUND_HALF_UP or quotient % 2)
+    ):
+        quotient += 1
+    return quotient if numerator >= 0 else -quotient
+
+
+def is_valid_amount(amount, currency_code: str) -> bool:
+    """Whether the unit `amount` has no more decimal places than the currency allows."""
+    try:
+        amount = _decimal(amount)
+        return amount.is_finite() and amount == amount.quantize(get_currency_formatter(currency_code).quantizer)
+    except InvalidOperation:
+        return False
+
+
+def to_subunits(amount, currency_code: str, rounding=None) -> int:
+    """
+    Converts a unit `amount` to subunits. Without `rounding`, amounts with more decimal
+    places than the currency allows raise `ValueError`.
+    """
+    formatter = get_currency_formatter(currency_code)
+    try:
+        scaled = _decimal(amount) * formatter.subunit_factor
+        if rounding is None:
+            if scaled != scaled.to_integral_value():
+                raise ValueError(f"{amount} has more decimal places than {currency_code} allows")
+            return int(scaled)
+        numerator, denominator = scaled.as_integer_ratio()
+    except (InvalidOperation, ArithmeticError):
+        raise ValueError(f"Invalid amount: {amount} for currency '{currency_code}'")
+    return divide(numerator, denominator, rounding)
+
+
+def to_units(subunits: int, currency_code: str) -> Decimal:
+    """Converts `subunits` to a unit `Decimal` with the currency's number of decimal places."""
+    return get_currency_formatter(currency_code).to_unit(subunits)
+
+
+def multiply(subunits: int, quantity: int) -> int:
+    return subunits * quantity
+
+
+def percentage(subunits: int, percent, rounding=ROUND_HALF_UP) -> int:
+    """`percent` % of `subunits`, eg. a tax or discount rate of 8.875, rounded to a subunit."""
+    numerator, denominator = _decimal(percent).as_integer_ratio()
+    return divide(subunits * numerator, denominator * 100, rounding)
+
+
+def allocate(subunits: int, weights) -> list:
+    """
+    Splits `subunits` in proportion to `weights` (ints), handing the subunits left over by
+    flooring to the largest remainders, so the parts always add up to `subunits`.
+    """
+    weights = list(weights)
+    total = sum(weights)
+    if total == 0:
+        return [0] * len(weights)
+    parts = [subunits * weight // total for weight in weights]
+    remainders = sorted(
+        range(len(weights)),
+        key=lambda index: (-(subunits * weights[index] % total), index),
+    )
+    for index in remainders[:subunits - sum(parts)]:
+        parts[index] += 1
+    return parts
@@ -0,0 +1,25 @@
+from celery import shared_task
+
+from nxtbn.core import BulkDeleteStatus
+from nxtbn.core.bulk_delete import fail_bulk_delete_job, run_bulk_delete_job
+from nxtbn.core.currency.backend import currency_Backend
+from nxtbn.core.models import BulkDeleteJob
+
+
+@shared_task(acks_late=True)
+def run_bulk_delete(job_id):
+    """Runs a bulk delete. Redelivered or re-queued jobs continue after their last committed chunk."""
+    job = BulkDeleteJob.objects.get(pk=job_id)
+    if job.status == BulkDeleteStatus.COMPLETED:
+        return
+    try:
+        run_bulk_delete_job(job)
+    except Exception as e:
+        fail_bulk_delete_job(job, str(e))
+        raise
+
+
+@shared_task
+def refresh_exchange_rates():
+    """Fetches and publishes the rates of the base currency, a no-op when the backend fetches nothing."""
+    return currency_Backend().refresh_rate()
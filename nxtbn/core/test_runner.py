@@ -0,0 +1,25 @@
+import shutil
+import tempfile
+
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TemporaryMediaRootRunner(DiscoverRunner):
+    """
+    Runs the test suite against a throwaway MEDIA_ROOT.
+
+    Factories such as ProductFactory upload images for every product they
+    build, so without this each run would leave its files under BASE_DIR/media.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._media_root = tempfile.mkdtemp(prefix='nxtbn-media-')
+        self._media_override = override_settings(MEDIA_ROOT=self._media_root)
+        self._media_override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._media_override.disable()
+        shutil.rmtree(self._media_root, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
@@ -1,3 +1,311 @@
+from decimal import Decimal, ROUND_HALF_EVEN
+from unittest import mock
+
+from babel.numbers import format_currency
+from django.contrib.auth.models import Permission
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from nxtbn.core import BulkDeleteStatus, MoneyFieldTypes
+from nxtbn.core.bulk_delete import run_bulk_delete_job
+from nxtbn.core.currency import abstract_base_currency
+from nxtbn.core.enum_perms import PermissionsEnum
+from nxtbn.core.currency.abstract_base_currency import CurrencyBackend
+from nxtbn.core.currency.formatter import get_currency_formatter
+from nxtbn.core.graphql_cache import GraphQLResponseCache
+from nxtbn.core.mixin import MonetaryMixin
+from nxtbn.core.models import BulkDeleteJob, CurrencyExchange
+from nxtbn.core.signal_initiators import exchange_rates_changed
+from nxtbn.core.subunits import allocate, divide, percentage, to_subunits, to_units
+from nxtbn.core.utils import apply_exchange_rate, build_currency_amount, to_currency_subunit, to_currency_unit
+from nxtbn.discount.models import PromoCode
+from nxtbn.discount.tests import PromoCodeFactory
+from nxtbn.home.base_tests import BaseTestCase
+from nxtbn.order.models import Order, OrderLineItem
+from nxtbn.product.models import Product, ProductListingEntry, ProductTranslation, ProductVariant
+from nxtbn.product.tests import ProductFactory, ProductVariantFactory
+from nxtbn.product.tests.test_product_query_storefront_cache import LOCMEM_CACHES
+from nxtbn.users import UserRole
+from nxtbn.users.models import User
+from nxtbn.users.tests import UserFactory
+from nxtbn.warehouse.models import Stock, Warehouse
+
+
+class BulkDeleteTest(TestCase):
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.warehouse = Warehouse.objects.create(name="Main", location="Dhaka")
+
+    def run_job(self, target, ids, chunk_size=2):
+        job = BulkDeleteJob.objects.create(created_by=self.user, target=target, object_ids=ids)
+        run_bulk_delete_job(job, chunk_size=chunk_size)
+        return BulkDeleteJob.objects.get(pk=job.pk)
+
+    def order_variant(self, variant, customer=None):
+        order = Order.objects.create(user=customer, total_price=1000)
+        OrderLineItem.objects.create(order=order, variant=variant, quantity=1, price_per_unit=Decimal('10.00'), total_price=1000)
+
+    def test_products_are_deleted_with_their_cascades(self):
+        products = [ProductFactory() for _ in range(3)]
+        for product in products:
+            variant = ProductVariantFactory(product=product)
+            Stock.objects.create(warehouse=self.warehouse, product_variant=variant, quantity=3)
+            ProductTranslation.objects.create(product=product, language_code='fr-FR', name="Produit", summary="", description="")
+        ids = [product.id for product in products]
+
+        job = self.run_job('product.product', ids)
+
+        self.assertEqual(job.status, BulkDeleteStatus.COMPLETED)
+        self.assertEqual((job.processed_count, job.deleted_count, job.skipped), (3, 3, []))
+        self.assertFalse(Product.objects.filter(id__in=ids).exists())
+        self.assertFalse(ProductVariant.objects.filter(product_id__in=ids).exists())
+        self.assertFalse(Stock.objects.exists())
+        self.assertFalse(ProductTranslation.objects.filter(product_id__in=ids).exists())
+        self.assertFalse(ProductListingEntry.objects.filter(product_id__in=ids).exists())
+
+    def test_protected_products_are_skipped(self):
+        ordered, free = ProductFactory(), ProductFactory()
+        self.order_variant(ProductVariantFactory(product=ordered))
+        ProductVariantFactory(product=free)
+
+        job = self.run_job('product.product', [ordered.id, free.id, 0])
+
+        self.assertEqual(job.deleted_count, 1)
+        self.assertEqual([skipped['id'] for skipped in job.skipped], [ordered.id, 0])
+        self.assertTrue(Product.objects.filter(id=ordered.id).exists())
+        self.assertFalse(Product.objects.filter(id=free.id).exists())
+
+    def test_resumes_after_processed_ids(self):
+        first, second = ProductFactory(), ProductFactory()
+        job = BulkDeleteJob.objects.create(created_by=self.user, target='product.product', object_ids=[first.id, second.id], processed_count=1)
+
+        run_bulk_delete_job(job, chunk_size=1)
+
+        self.assertTrue(Product.objects.filter(id=first.id).exists())
+        self.assertFalse(Product.objects.filter(id=second.id).exists())
+
+    def test_promo_codes_and_customers(self):
+        promo_codes = PromoCodeFactory.create_batch(2)
+        job = self.run_job('discount.promocode', [promo_code.id for promo_code in promo_codes])
+        self.assertEqual(job.deleted_count, 2)
+        self.assertFalse(PromoCode.objects.exists())
+
+        customer = UserFactory(role=UserRole.CUSTOMER, is_staff=False, is_superuser=False)
+        with_order = UserFactory(role=UserRole.CUSTOMER, is_staff=False, is_superuser=False)
+        self.order_variant(ProductVariantFactory(product=ProductFactory()), customer=with_order)
+
+        job = self.run_job('users.user', [customer.id, with_order.id, self.user.id])
+
+        self.assertEqual(job.deleted_count, 1)
+        self.assertEqual({skipped['id'] for skipped in job.skipped}, {with_order.id, self.user.id})
+        self.assertFalse(User.objects.filter(id=customer.id).exists())
+
+
+class BulkDeleteAPITest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.adminLogin()
+
+    def test_bulk_product_delete_queues_a_job(self):
+        products = [ProductFactory(), ProductFactory()]
+        ids = ','.join(str(product.id) for product in products)
+
+        with mock.patch('nxtbn.core.tasks.run_bulk_delete') as run_bulk_delete:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.auth_client.delete(f"{reverse('bulk-product-status-delete')}?product_ids={ids}")
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['total_count'], 2)
+        run_bulk_delete.delay.assert_called_once_with(response.data['id'])
+        self.assertEqual(Product.objects.filter(id__in=[product.id for product in products]).count(), 2)
+
+        run_bulk_delete_job(BulkDeleteJob.objects.get(pk=response.data['id']))
+        response = self.auth_client.get(reverse('bulk-delete-job-detail', args=[response.data['id']]))
+        self.assertEqual((response.data['status'], response.data['deleted_count']), (BulkDeleteStatus.COMPLETED, 2))
+
+    def test_store_staff_with_the_permissions(self):
+        staff = UserFactory(is_superuser=False, is_staff=True, is_store_staff=True)
+        client = APIClient()
+        promo_code = PromoCodeFactory()
+        customer = UserFactory(role=UserRole.CUSTOMER, is_staff=False, is_superuser=False)
+        endpoints = [
+            (f"{reverse('bulk-promo-code-delete')}?ids={promo_code.id}", PermissionsEnum.CAN_BULK_PROMO_CODE_DELETE),
+            (f"{reverse('bulk-customer-delete')}?ids={customer.id}", PermissionsEnum.CAN_BULK_CUSTOMER_DELETE),
+        ]
+
+        for url, codename in endpoints:
+            client.force_authenticate(User.objects.get(pk=staff.pk))
+            self.assertEqual(client.delete(url).status_code, status.HTTP_403_FORBIDDEN)
+
+            staff.user_permissions.add(Permission.objects.get(codename=codename))
+            client.force_authenticate(User.objects.get(pk=staff.pk))
+            with mock.patch('nxtbn.core.tasks.run_bulk_delete'), self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(client.delete(url).status_code, status.HTTP_202_ACCEPTED)
+
+
+@override_settings(CACHES=LOCMEM_CACHES, BASE_CURRENCY='USD')
+class ExchangeRateCacheTest(TestCase):
+
+    def setUp(self):
+        abstract_base_currency._local_rates.clear()
+        caches['generic'].clear()
+        self.eur = CurrencyExchange.objects.create(base_currency='USD', target_currency='EUR', exchange_rate=Decimal('0.9'))
+        CurrencyExchange.objects.create(base_currency='USD', target_currency='GBP', exchange_rate=Decimal('0.8'))
+        abstract_base_currency._local_rates.clear()
+
+    def test_rates_are_loaded_once_per_process(self):
+        backend = CurrencyBackend()
+        with self.assertNumQueries(1):
+            self.assertEqual(backend.get_exchange_rate('EUR'), Decimal('0.9'))
+
+        with self.assertNumQueries(0), mock.patch.object(caches['generic'], 'get') as cache_get:
+            self.assertEqual(CurrencyBackend().get_exchange_rate('GBP'), Decimal('0.8'))
+            self.assertEqual(CurrencyBackend().to_target_currency('EUR', 10), Decimal('9.0'))
+        cache_get.assert_not_called()
+
+        with self.assertRaises(ValueError):
+            backend.get_exchange_rate('JPY')
+
+    def test_saving_a_rate_invalidates_every_process(self):
+        backend = CurrencyBackend()
+        backend.get_exchange_rate('EUR')
+        version = caches['generic'].get(backend.version_key)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.eur.exchange_rate = Decimal('0.95')
+            self.eur.save()
+
+        self.assertEqual(backend.get_exchange_rate('EUR'), Decimal('0.95'))
+        self.assertNotEqual(caches['generic'].get(backend.version_key), version)
+
+    def test_other_processes_reload_after_the_check_interval(self):
+        backend = CurrencyBackend()
+        backend.get_exchange_rate('EUR')
+        # Another process changed the rate: the row and the shared version move, this process's dict does not
+        CurrencyExchange.objects.filter(pk=self.eur.pk).update(exchange_rate=Decimal('0.95'))
+        caches['generic'].set(backend.version_key, 'other', timeout=None)
+
+        self.assertEqual(backend.get_exchange_rate('EUR'), Decimal('0.9'))
+        with mock.patch('nxtbn.core.currency.abstract_base_currency.time.monotonic', return_value=10 ** 9):
+            self.assertEqual(backend.get_exchange_rate('EUR'), Decimal('0.95'))
+
+    def test_refresh_publishes_the_rate_set_at_once(self):
+        backend = CurrencyBackend()
+        backend.get_exchange_rate('EUR')
+        fetched = [{'target_currency': 'EUR', 'exchange_rate': 0.95}, {'target_currency': 'JPY', 'exchange_rate': 150.1234}]
+
+        with mock.patch.object(CurrencyBackend, 'fetch_data', return_value=fetched):
+            with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks() as callbacks:
+                with mock.patch.object(caches['generic'], 'set') as cache_set:
+                    self.assertEqual(backend.refresh_rate(), 2)
+            cache_set.assert_not_called()
+        self.assertEqual([query['sql'].split()[0] for query in queries if 'SAVEPOINT' not in query['sql']], ['SELECT', 'INSERT'])
+        tag_key = GraphQLResponseCache().tag_key('core.currencyexchange')
+        caches['generic'].set(tag_key, 'before', timeout=None)
+        with self.assertNumQueries(1), mock.patch.object(caches['generic'], 'set_many', wraps=caches['generic'].set_many) as set_many:
+            for callback in callbacks:
+                callback()
+        self.assertIn(backend.version_key, set_many.call_args_list[0].args[0]) # written with its rate set
+        # Bulk upserts send no post_save, the storefront GraphQL responses are invalidated on publish
+        self.assertNotEqual(caches['generic'].get(tag_key), 'before')
+
+        self.assertEqual(CurrencyExchange.objects.get(target_currency='EUR').exchange_rate, Decimal('0.95'))
+        # Other processes switch to the published set without querying the database
+        abstract_base_currency._local_rates.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                CurrencyBackend().get_rates(),
+                {'EUR': Decimal('0.95'), 'GBP': Decimal('0.8'), 'JPY': Decimal('150.1234')},
+            )
+
+    def test_refresh_signals_only_the_moved_rates(self):
+        fetched = [{'target_currency': 'EUR', 'exchange_rate': 0.9}, {'target_currency': 'JPY', 'exchange_rate': 151}]
+        receiver = mock.Mock()
+        exchange_rates_changed.connect(receiver)
+        self.addCleanup(exchange_rates_changed.disconnect, receiver)
+
+        with mock.patch.object(CurrencyBackend, 'fetch_data', return_value=fetched), mock.patch('nxtbn.product.tasks.refresh_variant_prices_in_currencies'):
+            with self.captureOnCommitCallbacks(execute=True):
+                CurrencyBackend().refresh_rate()
+            receiver.assert_called_once()
+            self.assertEqual(receiver.call_args.kwargs['currencies'], ['JPY'])
+
+            receiver.reset_mock()
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                CurrencyBackend().refresh_rate()
+            self.assertEqual(callbacks, [])
+            receiver.assert_not_called()
+
+    def test_refresh_without_fetched_rates(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(CurrencyBackend().refresh_rate(), 0)
+
+
+class CurrencyFormatterTest(TestCase):
+
+    def test_formats_like_babel(self):
+        amounts = [Decimal('0'), Decimal('-0.004'), Decimal('1234567.895'), Decimal('-1234.5'), 2.675, 1000000]
+        for currency in ['USD', 'EUR', 'JPY', 'KWD', 'BDT', 'INR', 'CHF']:
+            for locale in ['en_US', 'de_DE', 'fr_FR', 'bn_BD', 'ar_KW', 'en_IN', 'de_CH']:
+                formatter = get_currency_formatter(currency, locale)
+                for amount in amounts:
+                    self.assertEqual(formatter.format(amount), format_currency(amount, currency, locale=locale), (currency, locale, amount))
+
+    def test_money_helpers(self):
+        self.assertEqual(build_currency_amount(204.175, 'USD'), '204.18')
+        self.assertEqual(build_currency_amount(204.17, 'KWD'), '204.170')
+        self.assertEqual(build_currency_amount(1204.5, 'JPY', 'en_US'), '¥1,205')
+        self.assertEqual(to_currency_subunit('20.455', 'USD'), 2046)
+        self.assertEqual(to_currency_unit(204170, 'KWD'), '204.170')
+        self.assertEqual(to_currency_unit(2045, 'EUR', 'de_DE'), '20,45\xa0€')
+        self.assertEqual(apply_exchange_rate('10', '0.9', 'EUR'), '9.00')
+        with self.assertRaises(ValueError):
+            build_currency_amount(1, 'XYZ')
+
+
+class SubunitsTest(TestCase):
+
+    def test_rounding_modes(self):
+        self.assertEqual([divide(n, 2) for n in (1, 3, 5, -1, -3)], [1, 2, 3, -1, -2])
+        self.assertEqual([divide(n, 2, ROUND_HALF_EVEN) for n in (1, 3, 5, -1, -3)], [0, 2, 2, 0, -2])
+        self.assertEqual(percentage(1999, Decimal('8.875')), 177)
+        self.assertEqual(percentage(200, Decimal('0.25')), 1)
+        self.assertEqual(percentage(200, Decimal('0.25'), ROUND_HALF_EVEN), 0)
+
+    def test_unit_conversions(self):
+        self.assertEqual(to_subunits(0.1, 'USD'), 10)
+        self.assertEqual(to_subunits('1.234', 'KWD'), 1234)
+        self.assertEqual(to_subunits(Decimal('1205'), 'JPY'), 1205)
+        self.assertEqual(to_subunits('20.455', 'USD', rounding=ROUND_HALF_EVEN), 2046)
+        self.assertEqual(to_units(1234, 'KWD'), Decimal('1.234'))
+        with self.assertRaises(ValueError):
+            to_subunits('20.455', 'USD')
+        with self.assertRaises(ValueError):
+            to_subunits('abc', 'USD')
+
+    def test_allocate_adds_up(self):
+        self.assertEqual(allocate(100, [1, 1, 1]), [34, 33, 33])
+        self.assertEqual(allocate(7, [0, 0]), [0, 0])
+        parts = allocate(1001, [333, 667, 1, 0])
+        self.assertEqual(sum(parts), 1001)
+        self.assertEqual(parts[3], 0)
+
+    def test_validate_amount(self):
+        class Priced(MonetaryMixin):
+            money_validator_map = {'price': {'currency_field': 'currency', 'type': MoneyFieldTypes.UNIT}}
+
+            def __init__(self, price, currency):
+                self.price, self.currency = price, currency
 
-# Create your tests here.
+        Priced(Decimal('1.234'), 'KWD').validate_amount()
+        for price, currency in [(Decimal('1.234'), 'USD'), (Decimal('1.5'), 'JPY'), (Decimal('1'), 'XYZ')]:
+            with self.assertRaises(ValidationError):
+                Priced(price, currency).validate_amount()
@@ -1,10 +1,8 @@
 import os
 from django.conf import settings
-from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
-from money.money import Currency, Money
-from babel.numbers import get_currency_precision, format_currency
-from money.exceptions import InvalidAmountError
+from decimal import Decimal, InvalidOperation
 from nxtbn.core.currency.backend import currency_Backend
+from nxtbn.core.currency.formatter import get_currency_formatter
 
 def make_path(module_path):
     return os.path.join(*module_path.split('.')) + '/'
@@ -31,35 +29,19 @@ def build_currency_amount(amount: float, currency_code: str, locale: str = ''):
     print(build_currency_amount(204.170, 'KWD'))  # Output: "د.ك 204.170"
     print(build_currency_amount(204.000, 'JPY'))  # Output: "¥ 204" (JPY has 0 decimal places)
     """
-    # Ensure the currency is valid
-    try:
-        currency = Currency(currency_code)
-    except ValueError:
-        raise ValueError(f"Invalid currency code: {currency_code}")
-
-    # Determine the precision for the currency
-    try:
-        decimal_places = get_currency_precision(currency_code)
-    except KeyError:
-        raise ValueError(f"Currency precision not found for: {currency_code}")
+    formatter = get_currency_formatter(currency_code, locale).validate()
 
     # Round the amount to the correct number of decimal places
     try:
-        formatted_amount = Decimal(amount).quantize(Decimal(f'1.{"0" * decimal_places}'), rounding=ROUND_HALF_UP)
+        formatted_amount = formatter.quantize(amount)
     except (InvalidOperation, ValueError):
         raise ValueError(f"Invalid amount: {amount} for currency '{currency_code}'")
 
-    # Create Money object (optional)
-    try:
-        money = Money(formatted_amount, currency)
-    except InvalidAmountError:
-        raise ValueError(f"Invalid amount '{formatted_amount}' for currency '{currency_code}'")
-
     # Format the currency for output
     if locale:
-        formatted_currency = format_currency(money.amount, currency_code, locale=locale)
+        formatted_currency = formatter.format(formatted_amount)
     else:
-        formatted_currency = f"{formatted_amount:.{decimal_places}f}"
+        formatted_currency = formatter.format_plain(formatted_amount)
 
     return formatted_currency
 
@@ -80,27 +62,14 @@ def to_currency_subunit(amount: float, currency_code: str) -> int:
     print(to_currency_subunit(204.170, 'KWD'))  # Output: 204170 (in fils)
     print(to_currency_subunit(204.000, 'JPY'))  # Output: 204 (no subunits for JPY)
     """
-    # Ensure the currency is valid
-    try:
-        currency = Currency(currency_code)
-    except ValueError:
-        raise ValueError(f"Invalid currency code: {currency_code}")
-
-    # Get the correct number of decimal places for the currency (subunit factor)
-    try:
-        decimal_places = get_currency_precision(currency_code)
-    except KeyError:
-        raise ValueError(f"Currency precision not found for: {currency_code}")
+    formatter = get_currency_formatter(currency_code).validate()
 
     # Multiply the amount by 10^decimal_places to convert it into subunits (e.g., 20.45 USD -> 2045 cents)
     try:
-        subunit_amount = Decimal(amount) * (10 ** decimal_places)
-        subunit_amount = subunit_amount.quantize(Decimal('1'), rounding=ROUND_HALF_UP)  # Round to the nearest whole number
+        return formatter.to_subunit(amount)
     except (InvalidOperation, ValueError):
         raise ValueError(f"Invalid amount: {amount} for currency '{currency_code}'")
 
-    return int(subunit_amount)
-
 
 def to_currency_unit(subunit: int, currency_code: str, locale: str = ''):
     """
@@ -124,27 +93,17 @@ def to_currency_unit(subunit: int, currency_code: str, locale: str = ''):
         print(to_currency_unit(20456, 'JPY'))  # Output: "¥ 20456"  # JPY has no decimal places
     """
    
-    # Ensure the currency is valid
-    try:
-        currency = Currency(currency_code)
-    except ValueError:
-        raise ValueError(f"Invalid currency code: {currency_code}")
-    
-    try:
-        decimal_places = get_currency_precision(currency_code)
-    except KeyError:
-        raise ValueError(f"Currency precision not found for: {currency_code}")
-    
+    formatter = get_currency_formatter(currency_code, locale).validate()
+
     # Divide the subunit amount by 10^decimal_places to convert it into units (e.g., 2045 cents -> 20.45 USD)
     try:
-        unit_amount = Decimal(subunit) / (10 ** decimal_places)
-        unit_amount = unit_amount.quantize(Decimal(f'1.{"0" * decimal_places}'), rounding=ROUND_HALF_UP)
+        unit_amount = formatter.to_unit(subunit)
     except (InvalidOperation, ValueError):
         raise ValueError(f"Invalid subunit amount: {subunit} for currency '{currency_code}'")
-    
+
     # Format the currency for output
     if locale:
-        formatted_currency = format_currency(unit_amount, currency_code, locale=locale)
+        formatted_currency = formatter.format(unit_amount)
     else:
         formatted_currency = f"{unit_amount}"
 
@@ -169,12 +128,7 @@ def normalize_amount_currencywise(amount: float, currency_code: str) -> Decimal:
     Returns:
     - Decimal: The formatted amount with the appropriate precision.
     """
-    precision = get_currency_precision(currency_code)
-    amount_decimal = Decimal(str(amount))
-    quantize_format = '1.' + '0' * precision
-    formatted_amount = amount_decimal.quantize(Decimal(quantize_format), rounding=ROUND_HALF_UP)
-    
-    return formatted_amount
+    return get_currency_formatter(currency_code).quantize(str(amount))
 
 
 def get_in_user_currency(amount: float, user_currency: str, base_currency: str, locale: str = '') -> str:
@@ -216,11 +170,11 @@ def apply_exchange_rate(amount: str, exchange_rate: str, target_currency: str, l
         raise ValueError(f"Invalid amount '{amount}' or exchange rate '{exchange_rate}'")
 
     # Format the converted amount for output
+    formatter = get_currency_formatter(target_currency, locale)
     if locale:
-        formatted_currency = format_currency(converted_amount, target_currency, locale=locale)
+        formatted_currency = formatter.format(converted_amount)
     else:
         # Return unformatted converted amount with the correct precision
-        decimal_places = get_currency_precision(target_currency)
-        formatted_currency = f"{converted_amount:.{decimal_places}f}"
+        formatted_currency = formatter.format_plain(converted_amount)
 
     return formatted_currency
\ No newline at end of file
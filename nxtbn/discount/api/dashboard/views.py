@@ -2,6 +2,8 @@ from rest_framework import generics, viewsets
 from rest_framework.response import Response
 from rest_framework import status
 from nxtbn.core.admin_permissions import CommonPermissions
+from nxtbn.core.api.dashboard.views import BulkDeleteAPIView
+from nxtbn.core.enum_perms import PermissionsEnum
 from nxtbn.core.paginator import NxtbnPagination
 from nxtbn.discount.models import PromoCode, PromoCodeCustomer, PromoCodeProduct, PromoCodeUsage
 from nxtbn.discount.api.dashboard.serializers import AttachPromoCodeEntitiesSerializer, PromoCodeCustomerSerializer, PromoCodeProductSerializer, PromoCodeCountedSerializer, PromoCodeUsageSerializer
@@ -66,6 +68,13 @@ class PromoCodeUpdateRetrieveDeleteView(generics.RetrieveUpdateDestroyAPIView):
     lookup_field = 'id'
 
 
+class BulkPromoCodeDeleteAPIView(BulkDeleteAPIView):
+    model = PromoCode
+    required_perm = PermissionsEnum.CAN_BULK_PROMO_CODE_DELETE
+    queryset = PromoCode.objects.all()
+    bulk_delete_target = 'discount.promocode'
+
+
 class AttachPromoCodeEntitiesAPIView(generics.CreateAPIView):
     permission_classes = (CommonPermissions, )
     model = PromoCode
@@ -0,0 +1,7 @@
+from nxtbn.core.bulk_delete import BulkDeleteHandler, register_bulk_delete
+from nxtbn.discount.models import PromoCode
+
+
+@register_bulk_delete
+class PromoCodeBulkDeleteHandler(BulkDeleteHandler):
+    model = PromoCode
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-19 04:14
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('discount', '0005_promocodetranslation'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='promocode',
+            options={'permissions': [('can_bulk_promo_code_delete', 'Can bulk delete promo codes')], 'verbose_name': 'Promo Code', 'verbose_name_plural': 'Promo Codes'},
+        ),
+    ]
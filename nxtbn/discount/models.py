@@ -4,6 +4,7 @@ from nxtbn.users.models import User
 from django.forms import ValidationError
 from django.utils import timezone
 
+from nxtbn.core.enum_perms import PermissionsEnum
 from nxtbn.core.models import AbstractBaseModel, AbstractTranslationModel
 from nxtbn.discount import PromoCodeType
 from nxtbn.order import OrderStatus
@@ -169,6 +170,9 @@ class PromoCode(AbstractBaseModel):
     class Meta:
         verbose_name = "Promo Code"
         verbose_name_plural = "Promo Codes"
+        permissions = [
+            (PermissionsEnum.CAN_BULK_PROMO_CODE_DELETE, 'Can bulk delete promo codes'),
+        ]
 
 
 
@@ -1,13 +1,13 @@
 from django.conf import settings
 import graphene
 from graphql import GraphQLError
-from graphene_django.filter import DjangoFilterConnectionField
+from nxtbn.core.graphql_connection import NxtbnFilterConnectionField
 from nxtbn.filemanager.models import Image
 from nxtbn.filemanager.admin_types import ImageType
 
 
 class ImageQuery(graphene.ObjectType):
-    images = DjangoFilterConnectionField(ImageType)
+    images = NxtbnFilterConnectionField(ImageType)
     image = graphene.Field(ImageType, id=graphene.ID(required=True))
 
     def resolve_images(self, info, **kwargs):
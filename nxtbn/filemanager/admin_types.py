@@ -3,6 +3,7 @@ import graphene
 from graphene_django import DjangoObjectType
 from graphene import relay
 from nxtbn.filemanager.models import Image
+from nxtbn.core.graphql_connection import NxtbnConnection
 
 
 class ImageType(DjangoObjectType):
@@ -27,6 +28,7 @@ class ImageType(DjangoObjectType):
             'last_modified',
         )
         interfaces = (relay.Node, )
+        connection_class = NxtbnConnection
         filter_fields = {
             'name': ['exact', 'icontains'],
         }
\ No newline at end of file
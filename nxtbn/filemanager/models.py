@@ -12,6 +12,13 @@ class Image(AbstractBaseModel):
     image_xs = models.ImageField(upload_to='images/xs/', null=True, blank=True)
     image_alt_text = models.CharField(max_length=255)
 
+    def get_relative_urls(self):
+        """Returns `(image_url, image_xs_url)`, the xs URL falling back to the full image."""
+        if not self.image:
+            return None, None
+        image_url = self.image.url
+        return image_url, self.image_xs.url if self.image_xs else image_url
+
     def get_image_url(self,request):
         if self.image:
             return request.build_absolute_uri(self.image.url)
@@ -1,6 +1,6 @@
 from django.conf import settings
 import graphene
-from graphene_django.filter import DjangoFilterConnectionField
+from nxtbn.core.graphql_connection import NxtbnFilterConnectionField
 
 from nxtbn.core.admin_permissions import gql_store_admin_required
 from nxtbn.core.models import SiteSettings
@@ -10,10 +10,10 @@ from nxtbn.users import UserRole
 
 
 class AdminOrderQuery(graphene.ObjectType):
-    orders = DjangoFilterConnectionField(OrderType)
+    orders = NxtbnFilterConnectionField(OrderType)
     order = graphene.Field(OrderType, alias=graphene.UUID(required=True))
-    order_device_meta = DjangoFilterConnectionField(OrderDeviceMetaType)
-    order_device_metas = DjangoFilterConnectionField(OrderDeviceMetaType)
+    order_device_meta = NxtbnFilterConnectionField(OrderDeviceMetaType)
+    order_device_metas = NxtbnFilterConnectionField(OrderDeviceMetaType)
 
     order_invoice = graphene.Field(OrderInvoiceType, order_id=graphene.Int(required=True))
     order_invoices = graphene.List(OrderInvoiceType, order_ids=graphene.List(graphene.Int))
@@ -6,6 +6,7 @@ from nxtbn.core.models import SiteSettings
 from nxtbn.order.models import Address, Order, OrderDeviceMeta, OrderLineItem
 
 from nxtbn.order.admin_filters import OrderFilter
+from nxtbn.core.graphql_connection import NxtbnConnection
 
 class AddressGraphType(DjangoObjectType):
     db_id = graphene.Int(source='id')
@@ -128,6 +129,7 @@ class OrderType(DjangoObjectType):
             'due'
         )
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filterset_class = OrderFilter
 
 
@@ -217,6 +219,7 @@ class OrderDeviceMetaType(DjangoObjectType):
             'device_type',
         )
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filter_fields = (
             'order__alias',
         )
\ No newline at end of file
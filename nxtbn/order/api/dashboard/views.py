@@ -8,7 +8,7 @@ from rest_framework.exceptions import APIException
 from rest_framework.exceptions import ValidationError
 
 from rest_framework.views import APIView
-from django.db.models import Sum, Count, F
+from django.db.models import Sum, Count, F, Prefetch
 from django.db import transaction
 from django.db.models.functions import TruncMonth, TruncDay, TruncWeek, TruncHour
 
@@ -112,7 +112,9 @@ class OrderListView(generics.ListAPIView):
 
 class OrderDetailView(generics.RetrieveAPIView):
     permission_classes = (CommonPermissions, )
-    queryset = Order.objects.all()
+    queryset = Order.objects.prefetch_related(
+        Prefetch('line_items', queryset=OrderLineItem.objects.select_related('variant__product'))
+    )
     serializer_class = OrderDetailsSerializer
     lookup_field = 'alias'
 
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-19 03:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0040_alter_order_reservation_status'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['created_at', 'id'], name='order_order_created_47a984_idx'),
+        ),
+    ]
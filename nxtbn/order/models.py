@@ -250,6 +250,9 @@ class Order(MonetaryMixin, AbstractBaseUUIDModel):
 
     class Meta:
         ordering = ('-created_at',) # Most recent orders first
+        indexes = [
+            models.Index(fields=['created_at', 'id']), # keyset pagination, see NxtbnKeysetPagination
+        ]
         permissions = [
             (PermissionsEnum.CAN_APPROVE_ORDER, 'Can approve order'),
             (PermissionsEnum.CAN_CANCEL_ORDER, 'Can cancel order'),
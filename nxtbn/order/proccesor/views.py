@@ -6,13 +6,15 @@ from rest_framework import status
 from django.db import transaction
 
 from nxtbn.core import CurrencyTypes
+from nxtbn.cart.hydration import load_cart_variants
+from nxtbn.core.subunits import allocate, multiply, percentage, to_subunits, to_units
 from nxtbn.core.utils import apply_exchange_rate, build_currency_amount
 from nxtbn.discount import PromoCodeType
 from nxtbn.discount.models import PromoCode
 from nxtbn.order import AddressType, OrderAuthorizationStatus, OrderChargeStatus, OrderStatus
 from nxtbn.order.proccesor.serializers import OrderEstimateSerializer
 from nxtbn.order.models import Address, Order, OrderDeviceMeta, OrderLineItem
-from nxtbn.product.models import Product, ProductVariant
+from nxtbn.product.models import Product
 from decimal import Decimal, InvalidOperation
 
 from nxtbn.shipping.models import ShippingRate
@@ -130,43 +132,42 @@ class TaxCalculator:
         """
         Calculate tax based on each product's tax_class and the applicable TaxRate.
         Hierarchy for TaxRate: State > Country
+        Amounts are in BASE_CURRENCY subunits, the tax of each class is rounded once.
         """
         from collections import defaultdict
 
         # Group subtotal by tax_class
-        tax_class_subtotals = defaultdict(Decimal)
+        tax_class_subtotals = defaultdict(int)
         for variant in variants:
             tax_class = variant['tax_class']
-            variant_subtotal = variant['quantity'] * variant['price']
-            tax_class_subtotals[tax_class] += variant_subtotal
+            tax_class_subtotals[tax_class] += multiply(variant['price_subunits'], variant['quantity'])
 
-        # Calculate total subtotal for proportional discount allocation
-        total_subtotal = sum(tax_class_subtotals.values())
-        if total_subtotal > 0 and discount > 0:
-            for tax_class in tax_class_subtotals:
-                # Allocate discount proportionally based on subtotal
-                tax_class_subtotals[tax_class] -= (tax_class_subtotals[tax_class] / total_subtotal) * discount
+        # Allocate the discount proportionally based on subtotal, the parts add up to the discount
+        if discount > 0:
+            tax_classes = list(tax_class_subtotals)
+            allocated = allocate(discount, [tax_class_subtotals[tax_class] for tax_class in tax_classes])
+            for tax_class, class_discount in zip(tax_classes, allocated):
+                tax_class_subtotals[tax_class] -= class_discount
 
-        estimated_tax = Decimal('0.00')
+        estimated_tax = 0
         tax_details = []
 
         for tax_class, class_subtotal in tax_class_subtotals.items():
             tax_rate_instance = self.get_tax_rate(tax_class, shipping_address)
             if tax_rate_instance:
-                tax_rate = tax_rate_instance.rate / Decimal('100')  # Assuming rate is percentage
+                tax_percentage = tax_rate_instance.rate
                 tax_type = tax_rate_instance.tax_class.name  # Assuming you want the tax class name
             else:
-                tax_rate = Decimal('0.00')
+                tax_percentage = Decimal('0.00')
                 tax_type = 'No Tax'
 
-            # TODO: wrong tax calculation when currency is KWD, the precisison is 3
-            class_tax = (class_subtotal * tax_rate)
+            class_tax = percentage(class_subtotal, tax_percentage, settings.MONEY_ROUNDING)
             estimated_tax += class_tax
 
             tax_details.append({
                 'tax_class': tax_type,
-                'tax_percentage': str(tax_rate * 100),
-                'tax_amount': str(class_tax),
+                'tax_percentage': str(tax_percentage),
+                'tax_amount': str(to_units(class_tax, settings.BASE_CURRENCY)),
             })
 
         return estimated_tax, tax_details
@@ -200,17 +201,18 @@ class DiscountCalculator:
         """
         Calculate discount based on custom discount amount and/or promo code.
         Priority can be given to promo code over custom discount or vice versa based on business logic.
+        `subtotal` and the returned discount are in BASE_CURRENCY subunits.
         """
-        discount = Decimal('0.00')
+        discount = 0
         discount_name = 'No Discount'
 
         # Apply Promo Code Discount if available
         if promocode:
             if promocode.code_type == PromoCodeType.FIXED_AMOUNT:
-                discount = promocode.value
+                discount = to_subunits(promocode.value, settings.BASE_CURRENCY, settings.MONEY_ROUNDING)
                 discount_name = f"Promo Code {promocode.code}"
             elif promocode.code_type == PromoCodeType.PERCENTAGE:
-                discount = (subtotal * promocode.value) / Decimal('100')
+                discount = percentage(subtotal, promocode.value, settings.MONEY_ROUNDING)
                 discount_name = f"Promo Code {promocode.code} ({promocode.value}%)"
             # Ensure discount does not exceed subtotal
             discount = min(discount, subtotal)
@@ -218,10 +220,10 @@ class DiscountCalculator:
         # Apply Custom Discount if available and no Promo Code is used
         elif custom_discount_amount:
             try:
-                discount = Decimal(custom_discount_amount['price'])
+                discount = to_subunits(custom_discount_amount['price'], settings.BASE_CURRENCY, settings.MONEY_ROUNDING)
                 discount_name = custom_discount_amount.get('name', 'Custom Discount')
                 discount = min(discount, subtotal)
-            except (KeyError, InvalidOperation):
+            except (KeyError, ValueError):
                 raise serializers.ValidationError({"custom_discount_amount": "Invalid discount amount."})
 
         return discount, discount_name
@@ -310,17 +312,17 @@ class OrderCreator:
                 "billing_address_id": billing_address_id,
 
                 "currency": settings.BASE_CURRENCY,
-                "total_price": int(self.total * 100),  #  total is in units, convert to cents/subunits
-                "total_price_without_tax":  int(self.total_without_tax * 100),
+                "total_price": self.total,
+                "total_price_without_tax": self.total_without_tax,
                 "customer_currency": customer_currency,
                 # "total_price_in_customer_currency": build_currency_amount(self.total, customer_currency),
                 "status": OrderStatus.PENDING,
                 "authorize_status": OrderAuthorizationStatus.NONE,
                 "charge_status": OrderChargeStatus.DUE,
                 "promo_code": promocode,
-                "total_shipping_cost": int(self.shipping_fee * 100),  # Convert to cents
-                "total_discounted_amount": int(self.discount * 100),  # Convert to cents
-                "total_tax": int(self.estimated_tax * 100),  # Convert to cents
+                "total_shipping_cost": self.shipping_fee,
+                "total_discounted_amount": self.discount,
+                "total_tax": self.estimated_tax,
                 'order_source': self.order_source,
                 'note': self.validated_data.get('note', ''),
             }
@@ -336,7 +338,7 @@ class OrderCreator:
                     quantity=variant['quantity'],
                     price_per_unit=variant['price'],
                     currency=order.currency,
-                    total_price=int(variant['quantity'] * variant['price'] * 100),  # Convert to cents
+                    total_price=multiply(variant['price_subunits'], variant['quantity']),
                     customer_currency=order.customer_currency,
                     # total_price_in_customer_currency=variant['quantity'] * variant['price'],
                     tax_rate=self.get_tax_rate(variant['tax_class'], shipping_address).rate if self.get_tax_rate(variant['tax_class'], shipping_address) else Decimal('0.00'),
@@ -378,6 +380,10 @@ class OrderCreator:
         return address
 
 class OrderCalculation(ShippingFeeCalculator, TaxCalculator, DiscountCalculator, OrderCreator):
+    """
+    Totals of an order, as ints in BASE_CURRENCY subunits. Prices are converted to
+    subunits once when the variants are loaded and back to units only for the response.
+    """
     def __init__(self, validated_data, order_source, create_order=False, collect_user_agent=False, request=None):
         self.validated_data = validated_data
         self.create_order = create_order
@@ -394,12 +400,13 @@ class OrderCalculation(ShippingFeeCalculator, TaxCalculator, DiscountCalculator,
             self.validated_data.get('custom_discount_amount'),
             self.get_promocode_instance(self.validated_data.get('promocode'))
         )
-        self.discount_percentage = (self.discount / self.total_subtotal * 100) if self.total_subtotal > 0 else 0
-        self.shipping_fee, self.shipping_name = self.get_total_shipping_fee(
+        self.discount_percentage = (Decimal(self.discount) / self.total_subtotal * 100) if self.total_subtotal > 0 else 0
+        shipping_fee, self.shipping_name = self.get_total_shipping_fee(
             self.variants,
             self.validated_data.get('shipping_method_id', ''),
             self.validated_data.get('shipping_address', {})
         )
+        self.shipping_fee = to_subunits(shipping_fee, settings.BASE_CURRENCY, settings.MONEY_ROUNDING)
         self.estimated_tax, self.tax_details = self.calculate_tax(
             self.variants,
             self.discount,
@@ -410,18 +417,22 @@ class OrderCalculation(ShippingFeeCalculator, TaxCalculator, DiscountCalculator,
 
     def get_response(self):
         exchange_rate = currency_Backend().get_exchange_rate(self.request.currency)
+
+        def in_user_currency(subunits):
+            return apply_exchange_rate(to_units(subunits, settings.BASE_CURRENCY), exchange_rate, self.request.currency, 'en_US')
+
         response_data = {
-            "subtotal":  apply_exchange_rate(self.total_subtotal, exchange_rate, self.request.currency, 'en_US'),
+            "subtotal": in_user_currency(self.total_subtotal),
             "total_items": self.total_items,
-            "discount": apply_exchange_rate(self.discount, exchange_rate, self.request.currency, 'en_US'),
+            "discount": in_user_currency(self.discount),
             "discount_percentage": self.discount_percentage,
             "discount_name": self.discount_name,
-            "shipping_fee": apply_exchange_rate(self.shipping_fee, exchange_rate, self.request.currency, 'en_US'),
+            "shipping_fee": in_user_currency(self.shipping_fee),
             "shipping_name": self.shipping_name,
-            "estimated_tax": apply_exchange_rate(self.estimated_tax, exchange_rate, self.request.currency, 'en_US'),
+            "estimated_tax": in_user_currency(self.estimated_tax),
             "tax_details": self.tax_details,
-            "total": apply_exchange_rate(self.total, exchange_rate, self.request.currency, 'en_US'), # total amount that will be charged
-            "total_without_tax": apply_exchange_rate(self.total_without_tax, exchange_rate, self.request.currency, 'en_US'),
+            "total": in_user_currency(self.total), # total amount that will be charged
+            "total_without_tax": in_user_currency(self.total_without_tax),
         }
         return response_data
 
@@ -429,30 +440,31 @@ class OrderCalculation(ShippingFeeCalculator, TaxCalculator, DiscountCalculator,
     def get_variants(self):
         variants_data = self.validated_data.get('variants')
         variants = []
+        loaded = load_cart_variants({variant_data['alias'] for variant_data in variants_data}, field_name='alias')
+        loaded = {str(alias): variant for alias, variant in loaded.items()} # keyed by UUID, aliases come in as strings
 
         for variant_data in variants_data:
-            try:
-                variant = ProductVariant.objects.get(alias=variant_data['alias'])
-                quantity = variant_data['quantity']
-                weight = variant.weight_value if variant.weight_value is not None else Decimal('0.00')
-
-                variants.append({
-                    'variant': variant,
-                    'quantity': quantity,
-                    'weight': weight,
-                    'price': variant.price,
-                    'tax_class': variant.product.tax_class,
-                })
-
-            except ProductVariant.DoesNotExist:
+            variant = loaded.get(str(variant_data['alias']))
+            if variant is None:
                 raise serializers.ValidationError({
                     "variants": f"Variant with alias '{variant_data['alias']}' not found."
                 })
+            quantity = variant_data['quantity']
+            weight = variant.weight_value if variant.weight_value is not None else Decimal('0.00')
+
+            variants.append({
+                'variant': variant,
+                'quantity': quantity,
+                'weight': weight,
+                'price': variant.price,
+                'price_subunits': to_subunits(variant.price, settings.BASE_CURRENCY),
+                'tax_class': variant.product.tax_class,
+            })
 
         return variants
 
     def get_subtotal(self, variants):
-        return sum(variant['quantity'] * variant['price'] for variant in variants)
+        return sum(multiply(variant['price_subunits'], variant['quantity']) for variant in variants)
 
     def get_total_items(self, variants):
         return sum(variant['quantity'] for variant in variants)
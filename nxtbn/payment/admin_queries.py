@@ -1,6 +1,6 @@
 from django.conf import settings
 import graphene
-from graphene_django.filter import DjangoFilterConnectionField
+from nxtbn.core.graphql_connection import NxtbnFilterConnectionField
 
 from nxtbn.core.admin_permissions import gql_store_admin_required
 from nxtbn.payment.admin_types import PaymentType
@@ -8,7 +8,7 @@ from nxtbn.payment.models import Payment
 
 
 class AdminPaymentQuery(graphene.ObjectType):
-    payments = DjangoFilterConnectionField(PaymentType)
+    payments = NxtbnFilterConnectionField(PaymentType)
     payment = graphene.Field(PaymentType, id=graphene.Int(required=True))
 
     @gql_store_admin_required
@@ -4,6 +4,7 @@ from graphene_django import DjangoObjectType
 from graphene import relay
 
 from nxtbn.payment.models import Payment
+from nxtbn.core.graphql_connection import NxtbnConnection
 
 class PaymentType(DjangoObjectType):
     db_id = graphene.Int(source='id')
@@ -27,6 +28,7 @@ class PaymentType(DjangoObjectType):
         )
 
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filter_fields = (
             'order__alias',
         )
@@ -41,3 +41,27 @@ class StockStatus(models.TextChoices):
 
     IN_STOCK = 'IN_STOCK', 'In Stock'
     OUT_OF_STOCK = 'OUT_OF_STOCK', 'Out of Stock'
+
+class ImportFileFormat(models.TextChoices):
+    """File formats accepted by the bulk product import.
+
+    - 'CSV': Comma separated values with a header row.
+    - 'JSONL': One JSON object per line.
+    """
+
+    CSV = 'CSV', 'CSV'
+    JSONL = 'JSONL', 'JSON Lines'
+
+class ImportJobStatus(models.TextChoices):
+    """Defines the lifecycle of a bulk product import.
+
+    - 'PENDING': Uploaded, waiting for a worker.
+    - 'RUNNING': Rows are being imported.
+    - 'COMPLETED': Every row was processed, see the error report for rejected rows.
+    - 'FAILED': Stopped by an unexpected error, can be resumed from the last processed row.
+    """
+
+    PENDING = 'PENDING', 'Pending'
+    RUNNING = 'RUNNING', 'Running'
+    COMPLETED = 'COMPLETED', 'Completed'
+    FAILED = 'FAILED', 'Failed'
@@ -1,6 +1,8 @@
 from django import forms
 from django.contrib import admin
-from nxtbn.product.models import Category,Collection, Color,Product, ProductVariant, Supplier
+from nxtbn.core.subunits import to_units
+from nxtbn.product.models import Category,Collection, Color,Product, ProductVariant, Supplier, VariantPrice
+from nxtbn.product.price_lists import set_price_override
 
 # Register your models here.
 
@@ -56,6 +58,22 @@ class ProductAdmin(admin.ModelAdmin):
     list_display = ('id', 'product', 'name', 'currency', 'price', "currency")
 
 
+@admin.register(VariantPrice)
+class VariantPriceAdmin(admin.ModelAdmin):
+    list_display = ('variant', 'currency', 'price_subunit', 'override_price_subunit', 'exchange_rate', 'last_refreshed')
+    list_filter = ('currency',)
+    list_select_related = ('variant__product',)
+    fields = ('variant', 'currency', 'price_subunit', 'compare_at_price_subunit', 'override_price_subunit', 'exchange_rate', 'formatted_price', 'last_refreshed')
+    readonly_fields = ('variant', 'currency', 'price_subunit', 'compare_at_price_subunit', 'exchange_rate', 'formatted_price', 'last_refreshed')
+
+    def has_add_permission(self, request):
+        return False # rows are maintained by nxtbn.product.price_lists, only overrides are edited
+
+    def save_model(self, request, obj, form, change):
+        override = obj.override_price_subunit
+        set_price_override(obj.variant_id, obj.currency, to_units(override, obj.currency) if override is not None else None)
+
+
 class ColorAdminForm(forms.ModelForm):
     class Meta:
         model = Color
@@ -1,6 +1,6 @@
 import django_filters as filters
 from nxtbn.product.models import Category, CategoryTranslation, Collection, CollectionTranslation, Product, ProductTag, ProductTagTranslation, ProductTranslation, Supplier
-from django.db.models import Q
+from nxtbn.product.search import search_products
 
 
 class ProductFilter(filters.FilterSet):
@@ -42,10 +42,9 @@ class ProductFilter(filters.FilterSet):
 
     def filter_search(self, queryset, name, value):
         """
-        Custom search method to search across multiple fields: name, description, and alias.
+        Full-text search across names, descriptions, variants and translations, ordered by relevance.
         """
-        lookup = Q(name__icontains=value) | Q(description__icontains=value) | Q(alias__icontains=value)
-        return queryset.filter(lookup)
+        return search_products(queryset, value)
     
 class ProductTranslationFilter(filters.FilterSet):
     name = filters.CharFilter(lookup_expr='icontains')
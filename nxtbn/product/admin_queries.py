@@ -2,7 +2,7 @@
 
 import graphene
 
-from graphene_django.filter import DjangoFilterConnectionField
+from nxtbn.core.graphql_connection import NxtbnFilterConnectionField
 from nxtbn.core.admin_permissions import gql_store_admin_required
 from nxtbn.product.admin_types import CategoryTranslationType, CategoryType, CollectionTranslationType, CollectionType, ProductGraphType, ProductTagTranslationType, ProductTagType, ProductTranslationType, ProductVariantAdminType, SupplierType
 from nxtbn.product.models import Category, CategoryTranslation, Collection, CollectionTranslation, Product, ProductTag, ProductTagTranslation, ProductTranslation, Supplier
@@ -11,35 +11,35 @@ from nxtbn.users import UserRole
 
 class ProductQuery(graphene.ObjectType):
     product = graphene.Field(ProductGraphType, id=graphene.ID(required=True))
-    products = DjangoFilterConnectionField(ProductGraphType)
+    products = NxtbnFilterConnectionField(ProductGraphType)
 
     
 
     collection = graphene.Field(CollectionType, id=graphene.ID(required=True))
-    collections = DjangoFilterConnectionField(CollectionType)
+    collections = NxtbnFilterConnectionField(CollectionType)
 
     producttag = graphene.Field(ProductTagType, id=graphene.ID(required=True))
-    producttags = DjangoFilterConnectionField(ProductTagType)
+    producttags = NxtbnFilterConnectionField(ProductTagType)
 
     supplier = graphene.Field(SupplierType, id=graphene.ID(required=True))
-    suppliers = DjangoFilterConnectionField(SupplierType)
-    product_variants = DjangoFilterConnectionField(ProductVariantAdminType)
+    suppliers = NxtbnFilterConnectionField(SupplierType)
+    product_variants = NxtbnFilterConnectionField(ProductVariantAdminType)
 
     category = graphene.Field(CategoryType, id=graphene.ID(required=True))
-    categories = DjangoFilterConnectionField(CategoryType)
+    categories = NxtbnFilterConnectionField(CategoryType)
     # All translations
 
     product_translation = graphene.Field(ProductTranslationType, base_product_id=graphene.ID(required=True), lang_code=graphene.String(required=True))
-    product_translations = DjangoFilterConnectionField(ProductTranslationType)
+    product_translations = NxtbnFilterConnectionField(ProductTranslationType)
 
     category_translation = graphene.Field(CategoryTranslationType, base_category_id=graphene.ID(required=True), lang_code=graphene.String(required=True))
-    category_translations = DjangoFilterConnectionField(CategoryTranslationType)
+    category_translations = NxtbnFilterConnectionField(CategoryTranslationType)
 
     collection_translation = graphene.Field(CollectionTranslationType, base_collection_id=graphene.ID(required=True), lang_code=graphene.String(required=True))
-    collection_translations = DjangoFilterConnectionField(CollectionTranslationType)
+    collection_translations = NxtbnFilterConnectionField(CollectionTranslationType)
 
     producttags_translation = graphene.Field(ProductTagTranslationType, base_tag_id=graphene.ID(required=True), lang_code=graphene.String(required=True))
-    tags_translations = DjangoFilterConnectionField(ProductTagTranslationType)
+    tags_translations = NxtbnFilterConnectionField(ProductTagTranslationType)
 
  
     @gql_store_admin_required
@@ -1,10 +1,12 @@
 import graphene
 from graphene_django.types import DjangoObjectType
 from nxtbn.product.models import Category, CategoryTranslation, Collection, CollectionTranslation, ProductTag, ProductTagTranslation, ProductTranslation, Product, ProductVariant, ProductVariantTranslation, Supplier, SupplierTranslation
-from graphene_django.filter import DjangoFilterConnectionField
+from nxtbn.core.graphql_connection import NxtbnFilterConnectionField
+from nxtbn.product.category_tree import get_request_category_tree
 from graphene import relay
 
 from nxtbn.product.admin_filters import CategoryFilter, CategoryTranslationFilter, CollectionFilter, CollectionTranslationFilter, ProductFilter, ProductTagsFilter, ProductTranslationFilter, TagsTranslationFilter
+from nxtbn.core.graphql_connection import NxtbnConnection
 
 
 class ProductVariantNonPaginatedType(DjangoObjectType):
@@ -87,6 +89,7 @@ class ProductGraphType(DjangoObjectType):
         )
 
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filterset_class = ProductFilter
 
     def resolve_description_html(self, info):
@@ -106,6 +109,7 @@ class CollectionType(DjangoObjectType):
             'image',
         )
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filterset_class = CollectionFilter
 
 
@@ -126,10 +130,11 @@ class CategoryType(DjangoObjectType):
             'parent',
         )
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filterset_class = CategoryFilter
 
     def resolve_child_info(self, info):
-        has_child = self.subcategories.exists()
+        has_child = bool(get_request_category_tree(info.context).children(self.id))
         return CategoryChildInfoType(has_child=has_child)
     
 
@@ -144,6 +149,7 @@ class ProductTagType(DjangoObjectType):
             'name',
         )
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filterset_class = ProductTagsFilter
 
 
@@ -155,6 +161,7 @@ class SupplierType(DjangoObjectType):
             'name',
         )
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filter_fields = ('name',)
 
 
@@ -169,7 +176,7 @@ class ProductVariantAdminType(DjangoObjectType):
         return self.humanize_total_price()
     
     def resolve_variant_thumbnail(self, info):
-        return self.variant_thumbnail()
+        return self.variant_thumbnail(info.context)
     class Meta:
         model = ProductVariant
         fields = (
@@ -181,6 +188,7 @@ class ProductVariantAdminType(DjangoObjectType):
             'variant_thumbnail',
         )
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filter_fields = ('name', 'sku', 'track_inventory', 'product', 'price')
 
     def resolve_display_name(self, info):
@@ -206,7 +214,7 @@ class CategoryHierarchicalType(DjangoObjectType):
     children = graphene.List(lambda: CategoryHierarchicalType)
     
     def resolve_children(self, info):
-        return self.subcategories.all()
+        return get_request_category_tree(info.context).children(self.id)
     
     class Meta:
         model = Category
@@ -219,6 +227,7 @@ class CategoryHierarchicalType(DjangoObjectType):
             'children',
         )
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filterset_class = CategoryFilter
 
 
@@ -240,6 +249,7 @@ class ProductTranslationType(DjangoObjectType):
             'meta_description',
         )
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filterset_class = ProductTranslationFilter
 
     def resolve_description_html(self, info):
@@ -260,6 +270,7 @@ class CategoryTranslationType(DjangoObjectType):
             'meta_description',
         )
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filterset_class = CategoryTranslationFilter
 
 class SupplierTranslationType(DjangoObjectType):
@@ -292,6 +303,7 @@ class ProductTagTranslationType(DjangoObjectType):
         )
 
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filterset_class = TagsTranslationFilter
 
 
@@ -306,4 +318,5 @@ class CollectionTranslationType(DjangoObjectType):
             'meta_description',
         )
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filterset_class = CollectionTranslationFilter
\ No newline at end of file
@@ -1,3 +1,4 @@
+from decimal import Decimal
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
@@ -6,9 +7,12 @@ from rest_framework.exceptions import ValidationError
 
 
 from nxtbn.core import PublishableStatus
-from nxtbn.core.utils import normalize_amount_currencywise
+from nxtbn.core.utils import normalize_amount_currencywise, to_currency_unit
+from nxtbn.product import ImportFileFormat
+from nxtbn.product.repricing import PRICE_FIELDS
 from nxtbn.filemanager.api.dashboard.serializers import ImageSerializer
-from nxtbn.product.models import CategoryTranslation, CollectionTranslation, Color, Product, Category, Collection, ProductTag, ProductTagTranslation, ProductTranslation, ProductType, ProductVariant, Supplier, SupplierTranslation
+from nxtbn.product.category_tree import get_request_category_tree
+from nxtbn.product.models import CategoryTranslation, CollectionTranslation, Color, Product, Category, Collection, ProductImportJob, ProductListingEntry, ProductTag, ProductTagTranslation, ProductTranslation, ProductType, ProductVariant, Supplier, SupplierTranslation
 from nxtbn.tax.models import TaxClass
 from nxtbn.filemanager.models import Image
 
@@ -62,8 +66,8 @@ class RecursiveCategorySerializer(serializers.ModelSerializer):
         fields = ('id', 'name', 'description', 'children')
 
     def get_children(self, obj):
-        children = obj.subcategories.all()
-        return RecursiveCategorySerializer(children, many=True).data
+        children = get_request_category_tree(self.context.get('request')).children(obj.id)
+        return RecursiveCategorySerializer(children, many=True, context=self.context).data
 
 class CollectionSerializer(serializers.ModelSerializer):
     images_details = ImageSerializer(read_only=True, source='image')
@@ -146,6 +150,37 @@ class ProductSerializer(serializers.ModelSerializer):
     
     def get_total_variant(self, obj):
         return obj.variants.count()
+
+
+class ProductListingSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source='product_id')
+    category = serializers.CharField(source='category_path')
+    product_thumbnail = serializers.SerializerMethodField()
+    product_price_range = serializers.SerializerMethodField()
+    total_variant = serializers.IntegerField(source='variant_count')
+
+    class Meta:
+        model = ProductListingEntry
+        ref_name = 'product_listing_dashboard_get'
+        fields = (
+            'id',
+            'name',
+            'category',
+            'status',
+            'product_thumbnail',
+            'product_price_range',
+            'total_variant',
+            'available_stock',
+            'stock_status',
+        )
+
+    def get_product_price_range(self, obj):
+        if obj.min_price_subunit is None:
+            return "No variants available."
+        return f"{to_currency_unit(obj.min_price_subunit, obj.currency, 'en_US')} - {to_currency_unit(obj.max_price_subunit, obj.currency, 'en_US')}"
+
+    def get_product_thumbnail(self, obj):
+        return self.context['request'].build_absolute_uri(obj.thumbnail) if obj.thumbnail else None
     
 
 
@@ -467,6 +502,24 @@ class ProductStatusUpdateBulkSerializer(serializers.Serializer):
     status = serializers.ChoiceField(choices=PublishableStatus.choices, required=True)
 
 
+class VariantRepricingSerializer(serializers.Serializer):
+    """A percentage or absolute change of the filtered variants, or a CSV price list of `sku` and prices."""
+    field = serializers.ChoiceField(choices=PRICE_FIELDS, default='price')
+    percentage = serializers.DecimalField(max_digits=6, decimal_places=2, required=False, min_value=Decimal('-100'))
+    amount = serializers.DecimalField(max_digits=12, decimal_places=3, required=False)
+    price_list = serializers.FileField(required=False)
+    category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.all(), required=False)
+    product_type = serializers.PrimaryKeyRelatedField(queryset=ProductType.objects.all(), required=False)
+    collection = serializers.PrimaryKeyRelatedField(queryset=Collection.objects.all(), required=False)
+    dry_run = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        given = [key for key in ('percentage', 'amount', 'price_list') if attrs.get(key) is not None]
+        if len(given) != 1:
+            raise ValidationError(_("Give exactly one of percentage, amount or price_list."))
+        return attrs
+
+
 
 
 class ProductVariantShortSerializer(serializers.ModelSerializer):
@@ -570,3 +623,49 @@ class SupplierNameSerializer(serializers.ModelSerializer):
 
 
 
+
+
+class ProductImportJobSerializer(serializers.ModelSerializer):
+    file_format = serializers.ChoiceField(choices=ImportFileFormat.choices, required=False)
+
+    class Meta:
+        model = ProductImportJob
+        fields = (
+            'id',
+            'file',
+            'file_format',
+            'status',
+            'total_rows',
+            'processed_rows',
+            'created_count',
+            'updated_count',
+            'error_count',
+            'errors',
+            'failure_reason',
+            'created_at',
+            'finished_at',
+        )
+        read_only_fields = (
+            'status',
+            'total_rows',
+            'processed_rows',
+            'created_count',
+            'updated_count',
+            'error_count',
+            'errors',
+            'failure_reason',
+            'finished_at',
+        )
+
+    def validate(self, attrs):
+        if not attrs.get('file_format'):
+            extension = attrs['file'].name.rsplit('.', 1)[-1].lower()
+            formats = {'csv': ImportFileFormat.CSV, 'jsonl': ImportFileFormat.JSONL, 'ndjson': ImportFileFormat.JSONL}
+            if extension not in formats:
+                raise ValidationError({'file_format': _("Could not be detected from the file name, use CSV or JSONL.")})
+            attrs['file_format'] = formats[extension]
+        return attrs
+
+    def create(self, validated_data):
+        validated_data['created_by'] = self.context['request'].user
+        return super().create(validated_data)
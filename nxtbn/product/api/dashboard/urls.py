@@ -5,6 +5,7 @@ from nxtbn.core.url_converters import IdOrNoneConverter
 
 from nxtbn.product.api.dashboard.views import (
     ProductListView,
+    ProductListingView,
     ProductDetailView,
     CategoryListView,
     CategoryByParentView,
@@ -21,6 +22,10 @@ from nxtbn.product.api.dashboard.views import (
     TaxClassView,
     BulkProductStatusUpdateAPIView,
     BulkProductDeleteAPIView,
+    BulkVariantRepricingAPIView,
+    ProductImportView,
+    ProductImportDetailView,
+    ProductImportResumeView,
     ProductVariants,
     InventoryListView,
     SupplierModelViewSet
@@ -40,6 +45,7 @@ router.register(r'suppliers', SupplierModelViewSet)
 urlpatterns = [
     path('', include(router.urls)),
     path('products/', ProductListView.as_view(), name='product-list'),
+    path('products/listing/', ProductListingView.as_view(), name='product-listing'),
     path('products/minimal/', ProductMinimalListView.as_view(), name='product-minimal-list'),
     path('products/with-detailed-variants/', ProductListDetailVariantView.as_view(), name='product-list-with-detailed-variants'),
     path('products/<int:id>/', ProductDetailView.as_view(), name='product-detail'),
@@ -53,6 +59,10 @@ urlpatterns = [
     path('tax-class/', TaxClassView.as_view(), name='tax-class'),
     path('products/update/bulk/', BulkProductStatusUpdateAPIView.as_view(), name='bulk-product-status-update'),
     path('products/delete/bulk/', BulkProductDeleteAPIView.as_view(), name='bulk-product-status-delete'),
+    path('variants/reprice/bulk/', BulkVariantRepricingAPIView.as_view(), name='bulk-variant-reprice'),
+    path('products/import/', ProductImportView.as_view(), name='product-import'),
+    path('products/import/<int:pk>/', ProductImportDetailView.as_view(), name='product-import-detail'),
+    path('products/import/<int:pk>/resume/', ProductImportResumeView.as_view(), name='product-import-resume'),
     path('products-variants/', ProductVariants.as_view(), name='products-variants'),
     path('inventory/', InventoryListView.as_view(), name='product-inventory'),
 
@@ -1,10 +1,11 @@
 from django.forms import ValidationError
+from django.db import transaction
 from django.db.models import Sum, F, Count
 
 from django.shortcuts import get_object_or_404
 from rest_framework import generics, status
 from rest_framework.response import Response
-from django.utils.translation import gettext_lazy as _
+from django.utils.translation import get_language, gettext_lazy as _
 from rest_framework.permissions  import AllowAny
 from rest_framework.exceptions import APIException
 from rest_framework import viewsets
@@ -15,14 +16,21 @@ from django_filters import rest_framework as filters
 
 from nxtbn.core import PublishableStatus
 from nxtbn.core.admin_permissions import CommonPermissions, GranularPermission
+from nxtbn.core.api.dashboard.views import BulkDeleteAPIView
 from nxtbn.core.enum_perms import PermissionsEnum
+from nxtbn.core.graphql_cache import invalidate_storefront_graphql_cache
 from nxtbn.core.paginator import NxtbnPagination
-from nxtbn.product.models import CategoryTranslation, CollectionTranslation, Color, Product, Category, Collection, ProductTag, ProductTagTranslation, ProductTranslation, ProductType, ProductVariant, Supplier, SupplierTranslation
+from nxtbn.product import ImportJobStatus
+from nxtbn.product.autocomplete import schedule_autocomplete_update
+from nxtbn.product.listing import get_listing_queryset
+from nxtbn.product.models import CategoryTranslation, CollectionTranslation, Color, Product, Category, Collection, ProductImportJob, ProductListingEntry, ProductTag, ProductTagTranslation, ProductTranslation, ProductType, ProductVariant, Supplier, SupplierTranslation
 from nxtbn.product.api.dashboard.serializers import (
     BasicCategorySerializer,
     ColorSerializer,
     InventorySerializer,
     ProductCreateSerializer,
+    ProductImportJobSerializer,
+    ProductListingSerializer,
     ProductMinimalSerializer,
     ProductMutationSerializer,
     ProductSerializer,
@@ -35,8 +43,11 @@ from nxtbn.product.api.dashboard.serializers import (
     ProductWithVariantSerializer,
     RecursiveCategorySerializer,
     TaxClassSerializer,
+    VariantRepricingSerializer,
     SupplierSerializer
 )
+from nxtbn.product.repricing import adjust_prices, apply_price_list, filter_variants, read_price_list
+from nxtbn.product.tasks import import_products
 from nxtbn.tax.models import TaxClass
 from nxtbn.users import UserRole
 
@@ -49,6 +60,7 @@ class ProductFilter(filters.FilterSet):
     promo_code = filters.CharFilter(field_name='promo_codes__code', lookup_expr='iexact')
     name = filters.CharFilter(field_name='name', lookup_expr='icontains')
     is_multi_variant = filters.BooleanFilter(method='filter_is_multi_variant') 
+    in_stock = filters.BooleanFilter(field_name='in_stock')
 
     class Meta:
         model = Product
@@ -70,6 +82,7 @@ class ProductFilter(filters.FilterSet):
             'promo_code',
             'status',
             'is_multi_variant',
+            'in_stock',
         ]
     def filter_is_multi_variant(self, queryset, name, value):
         """
@@ -101,6 +114,8 @@ class ProductFilterMixin:
         'created_at',
         'status',
         'default_variant__price',
+        'min_price_subunit',
+        'total_available_stock',
         'total_sales'
     ]
     filterset_class = ProductFilter
@@ -123,6 +138,32 @@ class ProductListView(ProductFilterMixin, generics.ListCreateAPIView):
             return ProductCreateSerializer
         return ProductSerializer
 
+class ProductListingFilter(filters.FilterSet):
+    name = filters.CharFilter(lookup_expr='icontains')
+    category = filters.NumberFilter(field_name='category_id')
+    created_at = filters.DateFromToRangeFilter(field_name='created_at')
+
+    class Meta:
+        model = ProductListingEntry
+        fields = ('name', 'category', 'status', 'stock_status', 'created_at')
+
+
+class ProductListingView(generics.ListAPIView):
+    """Product list served from the `ProductListingEntry` read model in the active language."""
+    permission_classes = (CommonPermissions, )
+    serializer_class = ProductListingSerializer
+    pagination_class = NxtbnPagination
+    filter_backends = [
+        django_filters.rest_framework.DjangoFilterBackend,
+        drf_filters.OrderingFilter,
+    ]
+    filterset_class = ProductListingFilter
+    ordering_fields = ['name', 'created_at', 'status', 'min_price_subunit', 'available_stock']
+
+    def get_queryset(self):
+        return get_listing_queryset(get_language())
+
+
 class ProductMinimalListView(ProductFilterMixin, generics.ListAPIView):
     permission_classes = (CommonPermissions, )
     model = Product
@@ -295,22 +336,93 @@ class BulkProductStatusUpdateAPIView(generics.UpdateAPIView):
         product_ids = serializer.validated_data['product_ids']
 
         Product.objects.filter(id__in=product_ids).update(status=product_status)
+        ProductListingEntry.objects.filter(product_id__in=product_ids).update(status=product_status)
+        schedule_autocomplete_update(product_ids)
+        invalidate_storefront_graphql_cache(Product) # queryset.update() does not send post_save
         return Response(status=status.HTTP_204_NO_CONTENT)
     
 
-class BulkProductDeleteAPIView(generics.DestroyAPIView):
-    permission_classes = (GranularPermission, )
+class BulkProductDeleteAPIView(BulkDeleteAPIView):
     model = Product
     required_perm = PermissionsEnum.CAN_BULK_PRODUCT_DELETE
     queryset = Product.objects.all()
+    bulk_delete_target = 'product.product'
+    ids_param = 'product_ids'
 
 
-    def destroy(self, request, *args, **kwargs):
-       
-        product_ids = request.query_params.get('product_ids')
-        product_ids = product_ids.split(',') if product_ids else []
-        Product.objects.filter(id__in=product_ids).delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
+class BulkVariantRepricingAPIView(generics.GenericAPIView):
+    """
+    Reprices the variants of a category, product type or collection (or all of them) by a
+    percentage or an amount, or sets prices from a CSV price list. `dry_run` returns the
+    changes without writing them. See `nxtbn.product.repricing`.
+    """
+    permission_classes = (GranularPermission, )
+    required_perm = PermissionsEnum.CAN_BULK_REPRICE_VARIANTS
+    queryset = ProductVariant.objects.all()
+    serializer_class = VariantRepricingSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        variants = filter_variants(
+            category=data.get('category'),
+            product_type=data.get('product_type'),
+            collection=data.get('collection'),
+        )
+        try:
+            if data.get('price_list'):
+                result = apply_price_list(read_price_list(data['price_list']), variants, dry_run=data['dry_run'])
+            else:
+                result = adjust_prices(
+                    variants,
+                    field=data['field'],
+                    percentage=data.get('percentage'),
+                    amount=data.get('amount'),
+                    dry_run=data['dry_run'],
+                )
+        except ValidationError as e:
+            return Response({'detail': e.messages}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result)
+
+
+class ProductImportView(generics.ListCreateAPIView):
+    """Uploads a CSV or JSONL file of products, imported in the background. See `nxtbn.product.importer`."""
+    permission_classes = (GranularPermission, )
+    required_perm = PermissionsEnum.CAN_IMPORT_PRODUCTS
+    queryset = ProductImportJob.objects.all()
+    serializer_class = ProductImportJobSerializer
+    pagination_class = NxtbnPagination
+
+    def perform_create(self, serializer):
+        job = serializer.save()
+        transaction.on_commit(lambda: import_products.delay(job.id))
+
+
+class ProductImportDetailView(generics.RetrieveAPIView):
+    """Progress and rejected rows of an import."""
+    permission_classes = (GranularPermission, )
+    required_perm = PermissionsEnum.CAN_IMPORT_PRODUCTS
+    queryset = ProductImportJob.objects.all()
+    serializer_class = ProductImportJobSerializer
+
+
+class ProductImportResumeView(generics.GenericAPIView):
+    """Queues a failed import again, it continues after the last processed row."""
+    permission_classes = (GranularPermission, )
+    required_perm = PermissionsEnum.CAN_IMPORT_PRODUCTS
+    queryset = ProductImportJob.objects.all()
+    serializer_class = ProductImportJobSerializer
+
+    def post(self, request, *args, **kwargs):
+        job = self.get_object()
+        if job.status != ImportJobStatus.FAILED:
+            return Response({'detail': _("Only failed imports can be resumed.")}, status=status.HTTP_400_BAD_REQUEST)
+        job.status = ImportJobStatus.PENDING
+        job.save(update_fields=['status', 'last_modified'])
+        transaction.on_commit(lambda: import_products.delay(job.id))
+        return Response(self.get_serializer(job).data)
 
 
 
@@ -4,10 +4,12 @@ from rest_framework import serializers
 from django.db import transaction
 
 from nxtbn.core.models import CurrencyExchange
-from nxtbn.core.utils import apply_exchange_rate, get_in_user_currency
+from nxtbn.core.utils import apply_exchange_rate, get_in_user_currency, to_currency_unit
+from nxtbn.product import StockStatus
 from nxtbn.product.api.dashboard.serializers import RecursiveCategorySerializer
 from nxtbn.filemanager.api.dashboard.serializers import ImageSerializer
-from nxtbn.product.models import Product, Collection, Category, ProductVariant
+from nxtbn.product.models import Product, Collection, Category, ProductListingEntry, ProductVariant
+from nxtbn.product.price_lists import listed_price, variant_listed_price
 from django.utils.translation import get_language
 
 from nxtbn.core.currency.backend import currency_Backend
@@ -382,3 +384,203 @@ class ProductDetailWithRelatedLinkImageListMinimalSerializer(serializers.ModelSe
             'meta_title': obj.meta_title,
             'meta_description': obj.meta_description
         }
+
+
+class ProductListingSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source='product_id')
+    texts = serializers.SerializerMethodField()
+    price_range = serializers.SerializerMethodField()
+    product_thumbnail = serializers.SerializerMethodField()
+    product_thumbnail_xs = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ProductListingEntry
+        fields = (
+            'id',
+            'texts',
+            'slug',
+            'category_path',
+            'price_range',
+            'product_thumbnail',
+            'product_thumbnail_xs',
+            'variant_count',
+            'stock_status',
+        )
+
+    def get_texts(self, obj):
+        return {
+            'name': obj.name,
+            'summary': obj.summary,
+        }
+
+    def get_price_range(self, obj):
+        if obj.min_price_subunit is None:
+            return None
+        target_currency = self.context['request'].currency
+        exchange_rate = self.context['exchange_rate']
+        row_exchange_rate = getattr(obj, 'price_exchange_rate', None)
+        listed_min = listed_price(getattr(obj, 'min_price_formatted', None), row_exchange_rate, exchange_rate, 'en_US')
+        listed_max = listed_price(getattr(obj, 'max_price_formatted', None), row_exchange_rate, exchange_rate, 'en_US')
+        if listed_min and listed_max:
+            return {'min': listed_min, 'max': listed_max}
+        return {
+            'min': apply_exchange_rate(to_currency_unit(obj.min_price_subunit, obj.currency), exchange_rate, target_currency, 'en_US'),
+            'max': apply_exchange_rate(to_currency_unit(obj.max_price_subunit, obj.currency), exchange_rate, target_currency, 'en_US'),
+        }
+
+    def get_product_thumbnail(self, obj):
+        return self.context['request'].build_absolute_uri(obj.thumbnail) if obj.thumbnail else None
+
+    def get_product_thumbnail_xs(self, obj):
+        return self.context['request'].build_absolute_uri(obj.thumbnail_xs) if obj.thumbnail_xs else None
+
+
+def _page_translation(obj):
+    """Translation loaded by `nxtbn.product.page`, or None when the default language is requested or missing."""
+    translations = getattr(obj, 'page_translations', None)
+    return translations[0] if translations else None
+
+
+def _listed_variant_price(obj, field, exchange_rate):
+    """`field` of the `VariantPrice` loaded by `nxtbn.product.page`, or None to convert the price at read time."""
+    return variant_listed_price(obj, exchange_rate, field)
+
+
+class ProductPageVariantSerializer(serializers.ModelSerializer):
+    name = serializers.SerializerMethodField()
+    price = serializers.SerializerMethodField()
+    compare_at_price = serializers.SerializerMethodField()
+    stock_status = serializers.SerializerMethodField()
+    variant_thumbnail = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ProductVariant
+        fields = [
+            'id',
+            'alias',
+            'name',
+            'sku',
+            'price',
+            'compare_at_price',
+            'stock_status',
+            'purchase_limit_per_order',
+            'variant_thumbnail',
+        ]
+
+    def get_name(self, obj):
+        translation = _page_translation(obj)
+        return translation.name if translation else obj.name
+
+    def get_price(self, obj):
+        listed = _listed_variant_price(obj, 'formatted_price', self.context['exchange_rate'])
+        if listed:
+            return listed
+        return apply_exchange_rate(obj.price, self.context['exchange_rate'], self.context['request'].currency, 'en_US')
+
+    def get_compare_at_price(self, obj):
+        if obj.compare_at_price is None:
+            return None
+        listed = _listed_variant_price(obj, 'formatted_compare_at_price', self.context['exchange_rate'])
+        if listed:
+            return listed
+        return apply_exchange_rate(obj.compare_at_price, self.context['exchange_rate'], self.context['request'].currency, 'en_US')
+
+    def get_stock_status(self, obj):
+        return StockStatus.IN_STOCK if obj.sellable else StockStatus.OUT_OF_STOCK
+
+    def get_variant_thumbnail(self, obj):
+        return obj.variant_thumbnail(self.context['request'])
+
+
+class ProductPageBreadcrumbSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    slug = serializers.CharField()
+    name = serializers.SerializerMethodField()
+
+    def get_name(self, obj):
+        translation = self.context['category_tree'].translation(obj.id, get_language())
+        return translation.name if translation else obj.name
+
+
+class ProductPagePriceRangeMixin:
+    def get_price_range(self, obj):
+        if obj.min_price_subunit is None:
+            return None
+        target_currency = self.context['request'].currency
+        exchange_rate = self.context['exchange_rate']
+        return {
+            'min': apply_exchange_rate(to_currency_unit(obj.min_price_subunit, settings.BASE_CURRENCY), exchange_rate, target_currency, 'en_US'),
+            'max': apply_exchange_rate(to_currency_unit(obj.max_price_subunit, settings.BASE_CURRENCY), exchange_rate, target_currency, 'en_US'),
+        }
+
+
+class ProductPageRecommendationSerializer(ProductPagePriceRangeMixin, serializers.ModelSerializer):
+    texts = serializers.SerializerMethodField()
+    price_range = serializers.SerializerMethodField()
+    product_thumbnail = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Product
+        fields = (
+            'id',
+            'texts',
+            'slug',
+            'price_range',
+            'in_stock',
+            'product_thumbnail',
+        )
+
+    def get_texts(self, obj):
+        translation = _page_translation(obj) or obj
+        return {
+            'name': translation.name,
+            'summary': translation.summary,
+        }
+
+    def get_product_thumbnail(self, obj):
+        return obj.product_thumbnail(self.context['request'])
+
+
+class ProductPageSerializer(ProductPagePriceRangeMixin, serializers.ModelSerializer):
+    """Serializes a product loaded by `nxtbn.product.page.load_product_page`, without further queries."""
+    texts = serializers.SerializerMethodField()
+    price_range = serializers.SerializerMethodField()
+    stock_status = serializers.SerializerMethodField()
+    product_thumbnail = serializers.SerializerMethodField()
+    variants = ProductPageVariantSerializer(many=True)
+    images = ImageSerializer(many=True)
+    breadcrumbs = ProductPageBreadcrumbSerializer(many=True)
+    recommended = ProductPageRecommendationSerializer(many=True)
+
+    class Meta:
+        model = Product
+        fields = (
+            'id',
+            'slug',
+            'texts',
+            'brand',
+            'default_variant',
+            'price_range',
+            'stock_status',
+            'product_thumbnail',
+            'variants',
+            'images',
+            'breadcrumbs',
+            'recommended',
+        )
+
+    def get_texts(self, obj):
+        translation = _page_translation(obj) or obj
+        return {
+            'name': translation.name,
+            'summary': translation.summary,
+            'description_html': translation.description_html(),
+            'meta_title': translation.meta_title,
+            'meta_description': translation.meta_description,
+        }
+
+    def get_stock_status(self, obj):
+        return StockStatus.IN_STOCK if obj.in_stock else StockStatus.OUT_OF_STOCK
+
+    def get_product_thumbnail(self, obj):
+        return obj.product_thumbnail(self.context['request'])
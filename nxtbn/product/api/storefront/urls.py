@@ -8,6 +8,9 @@ router = DefaultRouter()
 router.register(r'products', product_views.ProductViewSet, basename='product')
 
 urlpatterns = [
+    path('products/autocomplete/', product_views.ProductAutocompleteView.as_view(), name='product-autocomplete'),
+    path('products/listing/', product_views.ProductListingView.as_view(), name='storefront-product-listing'),
+    path('products/<slug:slug>/page/', product_views.ProductPageView.as_view(), name='product-page'),
     path('', include(router.urls)),
     path('collections/', product_views.CollectionListView.as_view(), name='collection-list'),
     path('recursive-categories/', product_views.CategoryListView.as_view(), name='category-list'),
@@ -1,4 +1,8 @@
 from django.conf import settings
+from django.core.cache import caches
+from django.http import Http404
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework import generics, status
@@ -6,16 +10,29 @@ from rest_framework.response import Response
 from django.utils.translation import gettext_lazy as _
 from rest_framework.permissions  import AllowAny
 from rest_framework.exceptions import APIException
+from rest_framework.views import APIView
 
 from rest_framework import filters as drf_filters
 import django_filters
 from django_filters import rest_framework as filters
-from django.contrib.postgres.search import TrigramSimilarity
 
 
+from django.utils.translation import get_language
+
+from nxtbn.core import PublishableStatus
 from nxtbn.core.paginator import NxtbnPagination
-from nxtbn.product.api.storefront.serializers import CategorySerializer, CollectionSerializer, ProductDetailImageListSerializer, ProductDetailSerializer, ProductDetailWithRelatedLinkImageListMinimalSerializer, ProductWithDefaultVariantImageListSerializer, ProductWithDefaultVariantSerializer, ProductWithVariantSerializer, ProductDetailWithRelatedLinkMinimalSerializer
-from nxtbn.product.models import Category, Collection, Product
+from nxtbn.core.subunits import to_subunits
+from nxtbn.core.utils import to_currency_subunit
+from nxtbn.product import StockStatus
+from nxtbn.product.api.storefront.serializers import CategorySerializer, CollectionSerializer, ProductDetailImageListSerializer, ProductDetailSerializer, ProductDetailWithRelatedLinkImageListMinimalSerializer, ProductListingSerializer, ProductPageSerializer, ProductWithDefaultVariantImageListSerializer, ProductWithDefaultVariantSerializer, ProductWithVariantSerializer, ProductDetailWithRelatedLinkMinimalSerializer
+from nxtbn.product.autocomplete import autocomplete_products
+from nxtbn.product.category_tree import get_request_category_tree
+from nxtbn.product.listing import get_listing_queryset
+from nxtbn.product.recommendations import get_recommended_products
+from nxtbn.product.facets import compute_product_facets
+from nxtbn.product.page import get_product_page_version, load_product_page, product_page_key
+from nxtbn.product.price_lists import annotate_price_range
+from nxtbn.product.models import Category, Collection, Product, ProductListingEntry, ProductType
 from nxtbn.product.models import Supplier
 from nxtbn.core.currency.backend import currency_Backend
 
@@ -26,15 +43,26 @@ class ProductFilter(filters.FilterSet):
     description = filters.CharFilter(lookup_expr='icontains')
     category = filters.ModelChoiceFilter(field_name='category', queryset=Category.objects.all())
     category_name = filters.CharFilter(field_name='category__name', lookup_expr='icontains')
+    category_tree = filters.ModelChoiceFilter(field_name='category__ancestor_links__ancestor', queryset=Category.objects.all(), label='Category including its subcategories')
     supplier = filters.ModelChoiceFilter(field_name='supplier', queryset=Supplier.objects.all())
     brand = filters.CharFilter(lookup_expr='icontains')
     type = filters.CharFilter(field_name='type', lookup_expr='exact')
     related_to = filters.CharFilter(field_name='related_to__name', lookup_expr='icontains')
     collection = filters.ModelChoiceFilter(field_name='collections', queryset=Collection.objects.all())
+    min_price = filters.NumberFilter(method='filter_min_price', label='Cheapest variant price from, in base currency')
+    max_price = filters.NumberFilter(method='filter_max_price', label='Cheapest variant price below, in base currency')
+    product_type = filters.ModelChoiceFilter(field_name='product_type', queryset=ProductType.objects.all())
+    in_stock = filters.BooleanFilter(field_name='in_stock')
 
     class Meta:
         model = Product
-        fields = ('name', 'summary', 'description', 'category', 'category_name', 'supplier', 'brand', 'type', 'related_to', 'collection')
+        fields = ('name', 'summary', 'description', 'category', 'category_name', 'category_tree', 'supplier', 'brand', 'type', 'related_to', 'collection', 'min_price', 'max_price', 'product_type', 'in_stock')
+
+    def filter_min_price(self, queryset, name, value):
+        return queryset.filter(min_price_subunit__gte=to_currency_subunit(value, settings.BASE_CURRENCY))
+
+    def filter_max_price(self, queryset, name, value):
+        return queryset.filter(min_price_subunit__lt=to_currency_subunit(value, settings.BASE_CURRENCY))
 
 
 class ProductViewSet(viewsets.ReadOnlyModelViewSet):
@@ -47,7 +75,7 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
         drf_filters.OrderingFilter,
     ]
     filterset_class = ProductFilter
-    ordering_fields = ['name', 'created_at']
+    ordering_fields = ['name', 'created_at', 'min_price_subunit']
     lookup_field = 'slug'
 
     def get_serializer_context(self):
@@ -55,6 +83,12 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
         context['exchange_rate'] = self.get_exchange_rate()
         return context
 
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        if request.query_params.get('facets') in ('1', 'true') and isinstance(response.data, dict):
+            response.data['facets'] = compute_product_facets(self.filter_queryset(self.get_queryset()))
+        return response
+
     def get_exchange_rate(self):
         if settings.IS_MULTI_CURRENCY:
             return currency_Backend().get_exchange_rate(self.request.currency)
@@ -114,9 +148,7 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=True, methods=['get'], url_path='with-recommended') # list via single product
     def with_recommended(self, request, slug=None):
         product = self.get_object()
-        queryset = Product.objects.annotate(
-            similarity=TrigramSimilarity('name', product.name)
-        ).order_by('-similarity')[:20]
+        queryset = get_recommended_products(product)
 
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
@@ -130,14 +162,119 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=True, methods=['get'], url_path='with-recommended/image-list') # list via single product
     def with_recommended_image_list(self, request, slug=None):
         product = self.get_object()
-        queryset = Product.objects.annotate(
-            similarity=TrigramSimilarity('name', product.name)
-        ).order_by('-similarity')[:20]
+        queryset = get_recommended_products(product)
 
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
-    
+
+
+class ProductPageView(APIView):
+    """
+    Everything a product page renders in one response: variants with prices and stock status,
+    images, translated texts, category breadcrumbs and recommendations, see `nxtbn.product.page`.
+
+    Cached per product, language and currency until the product changes; the ETag follows
+    the product's `last_modified` and a matching `If-None-Match` is answered with 304.
+    """
+    permission_classes = (AllowAny,)
+
+    def get(self, request, slug):
+        version = get_product_page_version(slug)
+        if version is None:
+            raise Http404
+        language_code = get_language()
+        if settings.IS_MULTI_CURRENCY:
+            exchange_rate = currency_Backend().get_exchange_rate(request.currency)
+        else:
+            exchange_rate = 1.0
+        key = product_page_key(version, language_code, request.currency, exchange_rate, request.build_absolute_uri('/'))
+        etag = f'"{key}"'
+
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            cache = caches['generic']
+            data = cache.get(f'product_page:{key}')
+            if data is None:
+                context = {
+                    'request': request,
+                    'exchange_rate': exchange_rate,
+                    'category_tree': get_request_category_tree(request),
+                }
+                data = ProductPageSerializer(load_product_page(version[0], language_code, request, request.currency), context=context).data
+                cache.set(f'product_page:{key}', data, timeout=settings.PRODUCT_PAGE_CACHE_TIMEOUT)
+            response = Response(data)
+
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+        patch_vary_headers(response, ('Accept-Language', 'Accept-Currency'))
+        return response
+
+
+class ProductListingFilter(filters.FilterSet):
+    name = filters.CharFilter(lookup_expr='icontains')
+    category = filters.NumberFilter(field_name='category_id')
+    stock_status = filters.ChoiceFilter(choices=StockStatus.choices)
+    min_price = filters.NumberFilter(method='filter_min_price', label='Cheapest variant price from, in the requested currency')
+    max_price = filters.NumberFilter(method='filter_max_price', label='Cheapest variant price below, in the requested currency')
+
+    class Meta:
+        model = ProductListingEntry
+        fields = ('name', 'category', 'stock_status', 'min_price', 'max_price')
+
+    def filter_min_price(self, queryset, name, value):
+        return queryset.filter(price__gte=to_subunits(value, self.request.currency, settings.MONEY_ROUNDING))
+
+    def filter_max_price(self, queryset, name, value):
+        return queryset.filter(price__lt=to_subunits(value, self.request.currency, settings.MONEY_ROUNDING))
+
+
+class ProductListingView(generics.ListAPIView):
+    """
+    Published products served from the `ProductListingEntry` read model, one indexed query per page.
+    Prices come from the `VariantPrice` rows of the requested currency, `price` sorts by the
+    cheapest variant in that currency.
+    """
+    permission_classes = (AllowAny,)
+    pagination_class = NxtbnPagination
+    serializer_class = ProductListingSerializer
+    filter_backends = [
+        django_filters.rest_framework.DjangoFilterBackend,
+        drf_filters.OrderingFilter,
+    ]
+    filterset_class = ProductListingFilter
+    ordering_fields = ['name', 'created_at', 'min_price_subunit', 'price']
+
+    def get_queryset(self):
+        queryset = get_listing_queryset(get_language()).filter(status=PublishableStatus.PUBLISHED)
+        return annotate_price_range(queryset, self.request.currency)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if settings.IS_MULTI_CURRENCY:
+            context['exchange_rate'] = currency_Backend().get_exchange_rate(self.request.currency)
+        else:
+            context['exchange_rate'] = 1.0
+        return context
+
+
+class ProductAutocompleteView(APIView):
+    """
+    Type-ahead suggestions for `?q=`, served from the in-memory prefix index without database queries.
+    """
+    permission_classes = (AllowAny,)
+    authentication_classes = ()
+    max_limit = 50
+
+    def get(self, request):
+        try:
+            limit = min(int(request.query_params.get('limit', settings.PRODUCT_AUTOCOMPLETE_LIMIT)), self.max_limit)
+        except ValueError:
+            limit = settings.PRODUCT_AUTOCOMPLETE_LIMIT
+        return Response(autocomplete_products(request.query_params.get('q', ''), get_language(), max(limit, 1)))
+
+
 class CollectionListView(generics.ListAPIView):
     permission_classes = (AllowAny,)
     pagination_class = None
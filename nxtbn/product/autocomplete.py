@@ -0,0 +1,261 @@
+"""
+Type-ahead autocomplete for published product names.
+
+Each process keeps an in-memory prefix index, per language a sorted list of
+`(term, product_id, position)` where the terms are every word-suffix of the normalized
+product names, so "shi" matches "Linen Shirt". Lookups are a bisect plus a bounded scan
+and never touch the database.
+
+Processes stay in sync through a versioned counter in CACHES["generic"]: changed product
+ids are published under the new version and replayed by the other processes, which
+only fall back to a full rebuild when they are too far behind or the cache lost them.
+Without a shared cache backend each process replays its own changes and rebuilds its
+index every LOCAL_INDEX_MAX_AGE seconds to pick up the others'.
+"""
+import threading
+import time
+import unicodedata
+import uuid
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Prefetch
+from django.utils.translation import get_language
+
+from nxtbn.core import PublishableStatus
+from nxtbn.core.batching import OnCommitBatch
+from nxtbn.product.models import Product, ProductTranslation
+
+
+GENERATION_KEY = 'product_autocomplete_generation'
+VERSION_KEY = 'product_autocomplete_version'
+CHANGES_KEY = 'product_autocomplete_changes:{}'
+CHANGES_TIMEOUT = 60 * 60 * 24
+
+# Versions a process replays before rebuilding the whole index instead.
+MAX_REPLAY = 100
+
+# Seconds a process keeps its index when there is no shared cache to hear about changes.
+LOCAL_INDEX_MAX_AGE = 60 * 5
+
+# Index entries examined per lookup, bounds the cost of one or two letter prefixes.
+MAX_SCAN = 2000
+
+
+def normalize(value):
+    """Case-folded, accent-stripped, whitespace-collapsed form of `value`."""
+    value = unicodedata.normalize('NFKD', value or '')
+    value = ''.join(char for char in value if not unicodedata.combining(char))
+    return ' '.join(value.casefold().split())
+
+
+def _terms(aliases):
+    terms = set()
+    for alias in aliases:
+        alias = normalize(alias)
+        position = 0
+        for index, char in enumerate(alias):
+            if index == 0 or alias[index - 1] == ' ':
+                terms.add((alias[index:], position))
+                position += 1
+    return terms
+
+
+class AutocompleteIndex:
+    """
+    Prefix index of published products, one sorted term list per language. The default
+    language is indexed from `Product`, the others from `ProductTranslation`.
+    """
+
+    def __init__(self):
+        self._terms = defaultdict(list)
+        self._entries = {}  # (language_code, product_id) -> (slug, name, terms)
+        self._translated = defaultdict(set)  # language_code -> product ids with a translation
+
+    def _add(self, added, language_code, product_id, slug, name, aliases):
+        terms = _terms(aliases)
+        self._entries[(language_code, product_id)] = (slug, name, terms)
+        added[language_code].extend((term, product_id, position) for term, position in terms)
+        if language_code != settings.LANGUAGE_CODE:
+            self._translated[language_code].add(product_id)
+
+    def _remove(self, product_id):
+        for language_code in list(self._terms):
+            entry = self._entries.pop((language_code, product_id), None)
+            if entry is None:
+                continue
+            entries = self._terms[language_code]
+            for term, position in entry[2]:
+                index = bisect_left(entries, (term, product_id, position))
+                if index < len(entries) and entries[index] == (term, product_id, position):
+                    del entries[index]
+            self._translated[language_code].discard(product_id)
+
+    def refresh(self, product_ids):
+        """Re-reads the given products, dropping the ones deleted or no longer published."""
+        for product_id in product_ids:
+            self._remove(product_id)
+
+        products = (
+            Product.objects.filter(id__in=product_ids, status=PublishableStatus.PUBLISHED)
+            .only('id', 'slug', 'name', 'name_when_in_relation')
+            .prefetch_related(
+                Prefetch('translations', queryset=ProductTranslation.objects.only('product_id', 'language_code', 'name', 'name_when_in_relation'))
+            )
+        )
+        added = defaultdict(list)
+        for product in products.iterator(chunk_size=2000):
+            self._add(added, settings.LANGUAGE_CODE, product.id, product.slug, product.name, (product.name, product.name_when_in_relation))
+            for translation in product.translations.all():
+                if translation.language_code == settings.LANGUAGE_CODE:
+                    continue
+                self._add(
+                    added, translation.language_code, product.id, product.slug, translation.name,
+                    (translation.name, translation.name_when_in_relation, product.name),
+                )
+        # One sort per language, the list stays sorted runs so this is close to linear
+        for language_code, terms in added.items():
+            entries = self._terms[language_code]
+            entries.extend(terms)
+            entries.sort()
+
+    @classmethod
+    def build(cls):
+        index = cls()
+        index.refresh(list(Product.objects.filter(status=PublishableStatus.PUBLISHED).values_list('id', flat=True)))
+        return index
+
+    def _scan(self, language_code, prefix, matches, skip=()):
+        entries = self._terms.get(language_code, [])
+        start = bisect_left(entries, (prefix,))
+        for term, product_id, position in entries[start:start + MAX_SCAN]:
+            if not term.startswith(prefix):
+                break
+            if product_id in skip:
+                continue
+            slug, name, _ = self._entries[(language_code, product_id)]
+            rank = (position, len(name), name.casefold())
+            if product_id not in matches or rank < matches[product_id][0]:
+                matches[product_id] = (rank, slug, name)
+
+    def search(self, prefix, language_code=None, limit=None):
+        """
+        Returns up to `limit` `{'slug', 'name'}` of the products with a word starting with
+        `prefix`, names starting with it first, then shorter names. Products without a
+        translation in `language_code` are matched by their default language name.
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        limit = limit or settings.PRODUCT_AUTOCOMPLETE_LIMIT
+        language_code = language_code or settings.LANGUAGE_CODE
+
+        matches = {}
+        if language_code != settings.LANGUAGE_CODE:
+            self._scan(language_code, prefix, matches)
+        self._scan(settings.LANGUAGE_CODE, prefix, matches, skip=self._translated.get(language_code, ()))
+
+        ranked = sorted(matches.values(), key=lambda match: match[0])[:limit]
+        return [{'slug': slug, 'name': name} for _, slug, name in ranked]
+
+
+_local_index = {'generation': None, 'version': None, 'index': None, 'built_at': None, 'pending': set()}
+_lock = threading.Lock()  # guards _local_index and lookups against incremental refreshes
+_build_lock = threading.Lock()  # one full build at a time, taken without holding _lock
+
+
+def _shared_state(cache):
+    state = cache.get_many([GENERATION_KEY, VERSION_KEY])
+    if len(state) < 2:
+        # A new generation tells processes to drop indexes built against a flushed counter
+        cache.add(GENERATION_KEY, uuid.uuid4().hex, timeout=None)
+        cache.add(VERSION_KEY, 0, timeout=None)
+        state = cache.get_many([GENERATION_KEY, VERSION_KEY])
+    if len(state) < 2:
+        return None  # no shared cache backend, e.g. DummyCache
+    return state[GENERATION_KEY], state[VERSION_KEY]
+
+
+def _bring_up_to_date(cache, state):
+    """Replays pending changes into the local index, under `_lock`. Returns False when it needs a full build."""
+    index = _local_index['index']
+    if index is None:
+        return False
+    if state is None:
+        if time.monotonic() - _local_index['built_at'] > LOCAL_INDEX_MAX_AGE:
+            return False
+        if _local_index['pending']:
+            index.refresh(_local_index['pending'])
+            _local_index['pending'] = set()
+        return True
+
+    generation, version = state
+    local_version = _local_index['version']
+    if _local_index['generation'] != generation or local_version is None or local_version > version or version - local_version > MAX_REPLAY:
+        return False
+    if local_version < version:
+        keys = [CHANGES_KEY.format(number) for number in range(local_version + 1, version + 1)]
+        changes = cache.get_many(keys)
+        if len(changes) < len(keys):
+            return False
+        index.refresh(set().union(*changes.values()))
+        _local_index['version'] = version
+    _local_index['pending'] = set()  # published changes are replayed through the shared counter
+    return True
+
+
+def _sync_index():
+    cache = caches['generic']
+    state = _shared_state(cache)
+    with _lock:
+        if _bring_up_to_date(cache, state):
+            return _local_index['index']
+        stale = _local_index['index']
+
+    # While another thread rebuilds, lookups are served from the stale index if there is one
+    if not _build_lock.acquire(blocking=stale is None):
+        return stale
+    try:
+        with _lock:
+            # Another thread may have built it while this one waited
+            if _bring_up_to_date(cache, state):
+                return _local_index['index']
+            pending = set(_local_index['pending'])
+        index = AutocompleteIndex.build()
+        with _lock:
+            generation, version = state if state is not None else (None, None)
+            _local_index.update(generation=generation, version=version, index=index, built_at=time.monotonic())
+            _local_index['pending'] -= pending
+        return index
+    finally:
+        _build_lock.release()
+
+
+def autocomplete_products(prefix, language_code=None, limit=None):
+    """Top `limit` products whose name has a word starting with `prefix`, see `AutocompleteIndex.search`."""
+    index = _sync_index()
+    with _lock:
+        return index.search(prefix, language_code or get_language(), limit)
+
+
+def publish_autocomplete_changes(product_ids):
+    """Bumps the index version with the changed product ids, every process replays them on its next lookup."""
+    with _lock:
+        _local_index['pending'].update(product_ids)
+    cache = caches['generic']
+    try:
+        version = cache.incr(VERSION_KEY)
+    except ValueError:
+        # Missing counter, the next lookup starts a new generation and every process rebuilds
+        cache.delete(GENERATION_KEY)
+        return
+    cache.set(CHANGES_KEY.format(version), sorted(product_ids), timeout=CHANGES_TIMEOUT)
+
+
+_publish_batch = OnCommitBatch(publish_autocomplete_changes)
+
+
+def schedule_autocomplete_update(product_ids):
+    _publish_batch.add(product_ids)
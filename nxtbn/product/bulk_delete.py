@@ -0,0 +1,21 @@
+from nxtbn.core.bulk_delete import BulkDeleteHandler, register_bulk_delete
+from nxtbn.core.graphql_cache import invalidate_storefront_graphql_cache
+from nxtbn.product.autocomplete import schedule_autocomplete_update
+from nxtbn.product.models import Product, ProductVariant
+from nxtbn.product.search import schedule_search_document_update
+
+
+@register_bulk_delete
+class ProductBulkDeleteHandler(BulkDeleteHandler):
+    """
+    Products are deleted with raw cascades. Variants, stocks, translations, listing entries
+    and recommendations go with them, so only the search and autocomplete documents and the
+    storefront cache need the work their delete receivers would have done.
+    """
+    model = Product
+    raw_delete = True
+
+    def after_delete(self, ids):
+        schedule_search_document_update(ids)
+        schedule_autocomplete_update(ids)
+        invalidate_storefront_graphql_cache(Product, ProductVariant)
@@ -0,0 +1,90 @@
+import threading
+import uuid
+from collections import defaultdict
+
+from django.core.cache import caches
+from django.db.models import Prefetch
+
+from nxtbn.product.models import Category, CategoryTranslation
+
+
+TREE_VERSION_KEY = 'category_tree_version'
+
+
+class CategoryTree:
+    """
+    In-memory snapshot of the whole category hierarchy with translations, built with two queries.
+
+    Categories are shared across requests of a process, never modify them.
+    """
+
+    def __init__(self, categories):
+        self.nodes = {category.id: category for category in categories}
+        self._children = defaultdict(list)
+        self.roots = []
+        for category in categories:
+            if category.parent_id is None:
+                self.roots.append(category)
+            else:
+                self._children[category.parent_id].append(category)
+
+    def get(self, category_id):
+        return self.nodes.get(category_id)
+
+    def children(self, category_id):
+        return self._children.get(category_id, [])
+
+    def translation(self, category_id, language_code):
+        category = self.nodes.get(category_id)
+        if category is None:
+            return None
+        for translation in category.translations.all():
+            if translation.language_code == language_code:
+                return translation
+        return None
+
+
+_local_tree = {'version': None, 'tree': None}
+_lock = threading.Lock()
+
+
+def get_category_tree():
+    """
+    Returns the process-level `CategoryTree`, rebuilt whenever the version stored in
+    CACHES["generic"] has been bumped by `invalidate_category_tree`. Without a shared cache
+    backend the tree is rebuilt on every call.
+    """
+    cache = caches['generic']
+    version = cache.get(TREE_VERSION_KEY)
+    if version is None:
+        cache.add(TREE_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(TREE_VERSION_KEY)
+
+    cached = _local_tree
+    if version is not None and cached['version'] == version:
+        return cached['tree']
+
+    tree = CategoryTree(list(
+        Category.objects.order_by('pk').prefetch_related(
+            Prefetch('translations', queryset=CategoryTranslation.objects.all())
+        )
+    ))
+    if version is not None:
+        with _lock:
+            _local_tree['version'] = version
+            _local_tree['tree'] = tree
+    return tree
+
+
+def invalidate_category_tree():
+    caches['generic'].set(TREE_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def get_request_category_tree(request):
+    """`get_category_tree` memoized on the request, so a response is rendered from a single snapshot."""
+    if request is None:
+        return get_category_tree()
+    tree = getattr(request, '_category_tree', None)
+    if not isinstance(tree, CategoryTree):
+        tree = request._category_tree = get_category_tree()
+    return tree
@@ -0,0 +1,100 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Case, Count, IntegerField, Value, When
+from django.utils.translation import get_language
+
+from nxtbn.core.utils import to_currency_subunit
+from nxtbn.product.category_tree import get_category_tree
+from nxtbn.product.models import Product
+
+
+def get_price_bucket_bounds():
+    """Upper bounds of the price buckets in the base currency, eg. [25, 50, 100] gives <25, 25-50, 50-100 and >=100."""
+    return sorted(Decimal(str(bound)) for bound in settings.PRODUCT_FACET_PRICE_BUCKETS)
+
+
+def _price_bucket_expression(bounds):
+    whens = [When(min_price_subunit__isnull=True, then=Value(None))]
+    whens.extend(
+        When(min_price_subunit__lt=to_currency_subunit(bound, settings.BASE_CURRENCY), then=Value(index))
+        for index, bound in enumerate(bounds)
+    )
+    return Case(*whens, default=Value(len(bounds)), output_field=IntegerField())
+
+
+def _category_name(tree, category_id):
+    if settings.USE_I18N and settings.LANGUAGE_CODE != get_language():
+        translation = tree.translation(category_id, get_language())
+        if translation:
+            return translation.name
+    category = tree.get(category_id)
+    return category.name if category else None
+
+
+def compute_product_facets(queryset):
+    """
+    Returns the facet counts of a filtered Product queryset.
+
+    Category, product type, price bucket (of the cheapest variant) and stock counts come from
+    one grouped query; collections, a many-to-many relation, from a second one. Counts reflect
+    the filters already applied to `queryset`.
+    """
+    matching = Product.objects.filter(pk__in=queryset.order_by().values('pk'))
+    bounds = get_price_bucket_bounds()
+
+    rows = (
+        matching.annotate(price_bucket=_price_bucket_expression(bounds))
+        .values('category_id', 'product_type_id', 'product_type__name', 'price_bucket', 'in_stock')
+        .annotate(count=Count('pk'))
+        .order_by()
+    )
+
+    categories, product_types, prices, stock = {}, {}, {}, {True: 0, False: 0}
+    for row in rows:
+        categories[row['category_id']] = categories.get(row['category_id'], 0) + row['count']
+        product_type = product_types.setdefault(
+            row['product_type_id'], {'id': row['product_type_id'], 'name': row['product_type__name'], 'count': 0}
+        )
+        product_type['count'] += row['count']
+        if row['price_bucket'] is not None:
+            prices[row['price_bucket']] = prices.get(row['price_bucket'], 0) + row['count']
+        stock[bool(row['in_stock'])] += row['count']
+
+    tree = get_category_tree()
+    collections = (
+        matching.filter(collections__isnull=False)
+        .values('collections__id', 'collections__name')
+        .annotate(count=Count('pk'))
+        .order_by('-count', 'collections__name')
+    )
+    lower_bounds = [None, *bounds]
+    upper_bounds = [*bounds, None]
+
+    return {
+        'category': sorted(
+            (
+                {'id': category_id, 'name': _category_name(tree, category_id), 'count': count}
+                for category_id, count in categories.items()
+            ),
+            key=lambda item: -item['count'],
+        ),
+        'collection': [
+            {'id': row['collections__id'], 'name': row['collections__name'], 'count': row['count']}
+            for row in collections
+        ],
+        'product_type': sorted(product_types.values(), key=lambda item: -item['count']),
+        'price': [
+            {
+                'min': str(lower_bounds[index]) if lower_bounds[index] is not None else None,
+                'max': str(upper_bounds[index]) if upper_bounds[index] is not None else None,
+                'currency': settings.BASE_CURRENCY,
+                'count': prices.get(index, 0),
+            }
+            for index in range(len(bounds) + 1)
+        ],
+        'in_stock': [
+            {'value': True, 'count': stock[True]},
+            {'value': False, 'count': stock[False]},
+        ],
+    }
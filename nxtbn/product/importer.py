@@ -0,0 +1,515 @@
+"""
+Bulk product import from CSV or JSONL files.
+
+A row describes one variant; the product columns repeat on every variant row of the product
+and each is taken from the first row carrying it. Products are matched on `product_slug` and
+variants on `sku`, so importing a file again updates the rows instead of duplicating them.
+
+The file is streamed from storage and imported `PRODUCT_IMPORT_CHUNK_SIZE` rows at a time.
+A chunk is validated without queries, its categories, product types, products, variants,
+translations and images are then resolved and written in bulk inside one transaction, which
+also commits the job progress. An interrupted job resumes after the last committed chunk.
+
+Columns:
+    product_slug, name, summary, description, brand, status, category, product_type, images,
+    sku, variant_name, price, cost_per_unit, compare_at_price, track_inventory,
+    allow_backorder, weight_value
+
+- `category` is the path of category names from the root, eg. "Men > Shirts"; missing
+  categories are created.
+- `product_type` is a product type name, created when missing.
+- `description` is in the dashboard editor's JSON format.
+- `images` are storage paths of uploaded files, separated by "|".
+- prices are in BASE_CURRENCY units.
+- translations are `name:<language_code>`, `summary:<language_code>` and
+  `description:<language_code>` columns, or in JSONL a `translations` object
+  `{language_code: {field: value}}`.
+
+New products need `name`, `category` and `product_type`, new variants `price` and
+`cost_per_unit`; empty columns leave existing values untouched.
+"""
+import csv
+import io
+import itertools
+import json
+import posixpath
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from nxtbn.core.graphql_cache import invalidate_storefront_graphql_cache
+from nxtbn.filemanager.models import Image
+from nxtbn.product import ImportFileFormat, ImportJobStatus
+from nxtbn.product.autocomplete import schedule_autocomplete_update
+from nxtbn.product.listing import schedule_product_listing_refresh
+from nxtbn.product.models import Category, Product, ProductImportJob, ProductTranslation, ProductType, ProductVariant
+from nxtbn.product.price_lists import refresh_variant_prices
+from nxtbn.product.search import schedule_search_document_update
+from nxtbn.product.summary import refresh_product_summaries
+from nxtbn.product.thumbnails import refresh_product_thumbnails
+from nxtbn.product.utils import json_to_html
+
+
+CATEGORY_SEPARATOR = '>'
+IMAGE_SEPARATOR = '|'
+
+PRODUCT_FIELDS = ['name', 'summary', 'description', 'brand', 'status']
+VARIANT_FIELDS = ['price', 'cost_per_unit', 'compare_at_price', 'track_inventory', 'allow_backorder', 'weight_value']
+BOOLEAN_FIELDS = ['track_inventory', 'allow_backorder']
+TRANSLATED_FIELDS = ['name', 'summary', 'description']
+
+REQUIRED_FOR_NEW_PRODUCT = ['name', 'category', 'product_type']
+REQUIRED_FOR_NEW_VARIANT = ['price', 'cost_per_unit']
+
+# Rejected rows kept on the job, the count keeps going
+MAX_STORED_ERRORS = 1000
+
+TRUE_VALUES = {'1', 'true', 'yes', 'y'}
+FALSE_VALUES = {'0', 'false', 'no', 'n'}
+
+
+def read_rows(file, file_format):
+    """Yields the rows of a binary import file as dicts, or None for lines that are not JSON objects."""
+    lines = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+    if file_format == ImportFileFormat.CSV:
+        yield from csv.DictReader(lines)
+        return
+
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield row if isinstance(row, dict) else None
+
+
+def _is_empty(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _to_bool(value):
+    if isinstance(value, bool):
+        return value
+    normalized = str(value).strip().lower()
+    if normalized in TRUE_VALUES:
+        return True
+    if normalized in FALSE_VALUES:
+        return False
+    raise ValidationError(f"'{value}' is not a boolean.")
+
+
+def _validated(model, values):
+    """Runs the model's field validation on `values` without touching the database, returns the converted values."""
+    instance = model(**values)
+    instance.clean_fields(exclude=[field.name for field in model._meta.fields if field.name not in values])
+    if hasattr(instance, 'validate_amount'):
+        instance.validate_amount()
+    return {field: getattr(instance, field) for field in values}
+
+
+def clean_row(raw):
+    """Validates one row, returns its normalized form or raises `ValidationError` with a message per column."""
+    if not isinstance(raw, dict):
+        raise ValidationError({'row': "Expected a JSON object."})
+
+    row = {key.strip(): value.strip() if isinstance(value, str) else value for key, value in raw.items() if key}
+    errors = {}
+
+    for key in ['product_slug', 'sku']:
+        if _is_empty(row.get(key)):
+            errors[key] = "This field is required."
+
+    product = {field: row[field] for field in PRODUCT_FIELDS if not _is_empty(row.get(field))}
+    variant = {field: row[field] for field in VARIANT_FIELDS if not _is_empty(row.get(field))}
+    if not _is_empty(row.get('variant_name')):
+        variant['name'] = row['variant_name']
+    for field in BOOLEAN_FIELDS:
+        if field in variant:
+            try:
+                variant[field] = _to_bool(variant[field])
+            except ValidationError as e:
+                errors[field] = e.messages[0]
+
+    translations = {}
+    raw_translations = row.get('translations') or {}
+    if not isinstance(raw_translations, dict) or not all(isinstance(fields, dict) for fields in raw_translations.values()):
+        errors['translations'] = "Expected an object keyed by language code, holding an object of fields per language."
+    else:
+        for language_code, fields in raw_translations.items():
+            translations[language_code] = {field: value for field, value in fields.items() if field in TRANSLATED_FIELDS}
+    for key, value in row.items():
+        field, _, language_code = key.partition(':')
+        if language_code and field in TRANSLATED_FIELDS and not _is_empty(value):
+            translations.setdefault(language_code, {})[field] = value
+
+    images = row.get('images') or []
+    if isinstance(images, str):
+        images = [path.strip() for path in images.split(IMAGE_SEPARATOR) if path.strip()]
+    elif not isinstance(images, list) or not all(isinstance(path, str) for path in images):
+        errors['images'] = f"Expected a list of paths or paths separated by '{IMAGE_SEPARATOR}'."
+
+    category = row.get('category')
+    category_path = None
+    if not _is_empty(category):
+        if isinstance(category, str):
+            category_path = tuple(name.strip() for name in category.split(CATEGORY_SEPARATOR) if name.strip())
+        else:
+            errors['category'] = f"Expected category names separated by '{CATEGORY_SEPARATOR}'."
+
+    if not _is_empty(row.get('product_type')) and not isinstance(row['product_type'], str):
+        errors['product_type'] = "Expected a product type name."
+
+    if errors:
+        raise ValidationError(errors)
+
+    try:
+        product = _validated(Product, {'slug': row['product_slug'], **product})
+        variant = _validated(ProductVariant, {'sku': row['sku'], 'currency': settings.BASE_CURRENCY, **variant})
+        for language_code, fields in translations.items():
+            translations[language_code] = _validated(ProductTranslation, {'language_code': language_code, **fields})
+    except ValidationError as e:
+        raise ValidationError(e.message_dict if hasattr(e, 'error_dict') else {'row': e.messages})
+
+    return {
+        'slug': product.pop('slug'),
+        'sku': variant.pop('sku'),
+        'product': product,
+        'variant': variant,
+        'category': category_path,
+        'product_type': row.get('product_type') or None,
+        'images': images,
+        'translations': {
+            language_code: {field: value for field, value in fields.items() if field != 'language_code'}
+            for language_code, fields in translations.items()
+        },
+    }
+
+
+def resolve_categories(paths):
+    """
+    Returns `{path: Category}` for the given name paths, creating the missing categories
+    from the root down, and `{path: message}` for the paths that can not be created.
+
+    Each level is matched by name under the category resolved for the level above.
+    Category names are unique, so a name already used under another parent is an error.
+    """
+    names = {name for path in paths for name in path}
+    existing = {category.name: category for category in Category.objects.filter(name__in=names)}
+    categories = {(category.parent_id, name): category for name, category in existing.items()}
+    resolved, errors = {}, {}
+    for path in sorted(paths, key=len):
+        parent, depth = None, 0
+        while depth < len(path) and (parent.pk if parent else None, path[depth]) in categories:
+            parent = categories[(parent.pk if parent else None, path[depth])]
+            depth += 1
+        missing = path[depth:]
+        if len(set(missing)) < len(missing):
+            errors[path] = "A category name can not appear twice in a path."
+            continue
+        taken = next((existing[name] for name in missing if name in existing), None)
+        if taken is not None:
+            errors[path] = f"Category '{taken.name}' already exists under {taken.parent or 'the root'}."
+            continue
+        try:
+            for name in missing:
+                category = Category(name=name, parent=parent)
+                category.save() # keeps the closure table
+                categories[(category.parent_id, name)] = existing[name] = category
+                parent = category
+        except ValidationError as e:
+            errors[path] = e.messages[0]
+            continue
+        resolved[path] = parent
+    return resolved, errors
+
+
+def resolve_product_types(names):
+    """Returns `{name: ProductType}`, creating the missing product types in one query."""
+    product_types = {product_type.name: product_type for product_type in ProductType.objects.filter(name__in=names)}
+    missing = [ProductType(name=name) for name in names if name not in product_types]
+    for product_type in ProductType.objects.bulk_create(missing):
+        product_types[product_type.name] = product_type
+    return product_types
+
+
+def _apply(instance, values):
+    """Sets the values that differ on `instance`, returns the names of the changed fields."""
+    changed = []
+    for field, value in values.items():
+        if getattr(instance, field) != value:
+            setattr(instance, field, value)
+            changed.append(field)
+    if 'description' in changed:
+        instance.rendered_description = json_to_html(instance.description)
+        changed.append('rendered_description')
+    return changed
+
+
+def _bulk_update(model, instances, fields):
+    if instances:
+        model.objects.bulk_update(instances, sorted(fields), batch_size=500)
+
+
+class ChunkImporter:
+    """
+    Writes one chunk of validated rows: everything that can reject a row is checked first,
+    so a rejected row never leaves a partial product behind.
+    """
+
+    def __init__(self, rows, user):
+        self.rows = rows # [(row_number, cleaned row)]
+        self.user = user
+        self.errors = {}
+        self.now = timezone.now()
+
+    def reject(self, row_number, errors):
+        self.errors.setdefault(row_number, {}).update(errors)
+
+    def reject_product(self, slug, errors):
+        for row_number, row in self.rows:
+            if row['slug'] == slug:
+                self.reject(row_number, errors)
+
+    def accepted(self):
+        return [(row_number, row) for row_number, row in self.rows if row_number not in self.errors]
+
+    def run(self):
+        """Returns `(products by slug, variants created, variants updated)`."""
+        existing_products = Product.objects.in_bulk({row['slug'] for _, row in self.rows}, field_name='slug')
+        existing_variants = ProductVariant.objects.in_bulk({row['sku'] for _, row in self.rows}, field_name='sku')
+        self.check_variants(existing_products, existing_variants)
+
+        merged = self.merged_products()
+        languages = {language_code for product in merged.values() for language_code in product['translations']}
+        existing_translations = {
+            (translation.product_id, translation.language_code): translation
+            for translation in ProductTranslation.objects.filter(
+                product_id__in=[product.id for product in existing_products.values()], language_code__in=languages,
+            )
+        } if languages else {}
+        # In file order, so the first row wins when two paths claim the same name
+        categories, category_errors = resolve_categories(
+            list(dict.fromkeys(product['category'] for product in merged.values() if product['category']))
+        )
+
+        for slug, product in list(merged.items()):
+            errors = {}
+            if product['category'] in category_errors:
+                errors['category'] = category_errors[product['category']]
+            existing = existing_products.get(slug)
+            if existing is None:
+                for field in REQUIRED_FOR_NEW_PRODUCT:
+                    if not product['values'].get(field) and not product.get(field):
+                        errors[field] = "Required for new products."
+            for language_code, fields in product['translations'].items():
+                if not fields.get('name') and (existing is None or (existing.id, language_code) not in existing_translations):
+                    errors[f'name:{language_code}'] = "Required for new translations."
+            if errors:
+                self.reject_product(slug, errors)
+                del merged[slug]
+
+        product_types = resolve_product_types({product['product_type'] for product in merged.values() if product['product_type']})
+        products = self.write_products(merged, existing_products, categories, product_types)
+        created, updated = self.write_variants(products, existing_variants)
+        self.write_translations(merged, products, existing_translations)
+        self.write_images(merged, products)
+        return products, created, updated
+
+    def check_variants(self, existing_products, existing_variants):
+        seen = set()
+        for row_number, row in self.rows:
+            if row['sku'] in seen:
+                self.reject(row_number, {'sku': "Duplicate SKU in the file."})
+                continue
+            seen.add(row['sku'])
+
+            variant = existing_variants.get(row['sku'])
+            if variant is None:
+                missing = [field for field in REQUIRED_FOR_NEW_VARIANT if field not in row['variant']]
+                if missing:
+                    self.reject(row_number, {field: "Required for new variants." for field in missing})
+            elif row['slug'] not in existing_products or existing_products[row['slug']].id != variant.product_id:
+                self.reject(row_number, {'sku': "This SKU belongs to another product."})
+
+    def merged_products(self):
+        """Product columns of the accepted rows per slug, each taken from the first row carrying it."""
+        merged = {}
+        for _, row in self.accepted():
+            product = merged.setdefault(row['slug'], {'values': {}, 'category': None, 'product_type': None, 'images': [], 'translations': {}})
+            for field, value in row['product'].items():
+                product['values'].setdefault(field, value)
+            product['category'] = product['category'] or row['category']
+            product['product_type'] = product['product_type'] or row['product_type']
+            product['images'].extend(path for path in row['images'] if path not in product['images'])
+            for language_code, fields in row['translations'].items():
+                for field, value in fields.items():
+                    product['translations'].setdefault(language_code, {}).setdefault(field, value)
+        return merged
+
+    def write_products(self, merged, existing_products, categories, product_types):
+        products, new_products, changed_products, changed_fields = {}, [], [], set()
+        for slug, product in merged.items():
+            values = dict(product['values'])
+            if product['category']:
+                values['category_id'] = categories[product['category']].id
+            if product['product_type']:
+                values['product_type_id'] = product_types[product['product_type']].id
+
+            instance = existing_products.get(slug)
+            if instance is None:
+                instance = Product(slug=slug, created_by=self.user, summary='', description='')
+                _apply(instance, values)
+                new_products.append(instance)
+            else:
+                changed = _apply(instance, values)
+                if changed:
+                    instance.last_modified_by = self.user
+                    instance.last_modified = self.now
+                    changed_fields.update(changed, ['last_modified_by', 'last_modified'])
+                    changed_products.append(instance)
+            products[slug] = instance
+
+        Product.objects.bulk_create(new_products, batch_size=500)
+        _bulk_update(Product, changed_products, changed_fields)
+        return products
+
+    def write_variants(self, products, existing_variants):
+        new_variants, changed_variants, changed_fields = [], [], set()
+        updated = 0
+        for _, row in self.accepted():
+            variant = existing_variants.get(row['sku'])
+            if variant is None:
+                new_variants.append(ProductVariant(product=products[row['slug']], sku=row['sku'], **row['variant']))
+                continue
+            changed = _apply(variant, row['variant'])
+            if changed:
+                changed_fields.update(changed)
+                changed_variants.append(variant)
+            updated += 1
+
+        ProductVariant.objects.bulk_create(new_variants, batch_size=500)
+        _bulk_update(ProductVariant, changed_variants, changed_fields)
+
+        first_variants = {}
+        for variant in new_variants:
+            first_variants.setdefault(variant.product_id, variant)
+        without_default = [product for product in products.values() if not product.default_variant_id and product.id in first_variants]
+        for product in without_default:
+            product.default_variant = first_variants[product.id]
+        Product.objects.bulk_update(without_default, ['default_variant'], batch_size=500)
+        return len(new_variants), updated
+
+    def write_translations(self, merged, products, existing_translations):
+        new_translations, changed_translations, changed_fields = [], [], set()
+        for slug, product in merged.items():
+            product_id = products[slug].id
+            for language_code, fields in product['translations'].items():
+                translation = existing_translations.get((product_id, language_code))
+                if translation is None:
+                    translation = ProductTranslation(product_id=product_id, language_code=language_code, summary='', description='')
+                    _apply(translation, fields)
+                    new_translations.append(translation)
+                elif changed := _apply(translation, fields):
+                    changed_fields.update(changed)
+                    changed_translations.append(translation)
+
+        ProductTranslation.objects.bulk_create(new_translations, batch_size=500)
+        _bulk_update(ProductTranslation, changed_translations, changed_fields)
+
+    def write_images(self, merged, products):
+        paths = {path for product in merged.values() for path in product['images']}
+        if not paths:
+            return
+        images = {image.image.name: image for image in Image.objects.filter(image__in=paths)}
+        new_images = []
+        for slug, product in merged.items():
+            for path in product['images']:
+                if path not in images:
+                    images[path] = Image(
+                        created_by=self.user,
+                        name=posixpath.basename(path),
+                        image=path,
+                        image_alt_text=products[slug].name,
+                    )
+                    new_images.append(images[path])
+        Image.objects.bulk_create(new_images, batch_size=500)
+
+        Product.images.through.objects.bulk_create(
+            [
+                Product.images.through(product_id=products[slug].id, image_id=images[path].id)
+                for slug, product in merged.items()
+                for path in product['images']
+            ],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+
+
+def import_rows(rows, user):
+    """
+    Imports `[(row_number, raw row)]` in the current transaction, without sending model signals.
+    Returns `(created, updated, errors)`: the number of variants created and updated and
+    the rejected rows as `[{'row': row_number, 'errors': {column: message}}]`.
+    """
+    cleaned, errors = [], {}
+    for row_number, raw in rows:
+        try:
+            cleaned.append((row_number, clean_row(raw)))
+        except ValidationError as e:
+            errors[row_number] = e.message_dict
+
+    importer = ChunkImporter(cleaned, user)
+    products, created, updated = importer.run()
+    errors.update(importer.errors)
+
+    product_ids = [product.id for product in products.values()]
+    if product_ids:
+        refresh_product_summaries(product_ids)
+        refresh_variant_prices(list(ProductVariant.objects.filter(product_id__in=product_ids).values_list('id', flat=True)))
+        refresh_product_thumbnails(product_ids)
+        schedule_product_listing_refresh(product_ids)
+        schedule_search_document_update(product_ids)
+        schedule_autocomplete_update(product_ids)
+        invalidate_storefront_graphql_cache(Product)
+
+    return created, updated, [{'row': row_number, 'errors': errors[row_number]} for row_number in sorted(errors)]
+
+
+def count_rows(job):
+    with job.file.open('rb') as file:
+        return sum(1 for _ in read_rows(file, job.file_format))
+
+
+def run_import_job(job, chunk_size=None):
+    """Imports the rows of `job` after its `processed_rows`, committing the progress with every chunk."""
+    chunk_size = chunk_size or settings.PRODUCT_IMPORT_CHUNK_SIZE
+
+    job.status = ImportJobStatus.RUNNING
+    job.failure_reason = ''
+    if job.total_rows is None:
+        job.total_rows = count_rows(job)
+    job.save(update_fields=['status', 'failure_reason', 'total_rows', 'last_modified'])
+
+    with job.file.open('rb') as file:
+        rows = itertools.islice(enumerate(read_rows(file, job.file_format), start=1), job.processed_rows, None)
+        while chunk := list(itertools.islice(rows, chunk_size)):
+            with transaction.atomic():
+                created, updated, errors = import_rows(chunk, job.created_by)
+                job.processed_rows = chunk[-1][0]
+                job.created_count += created
+                job.updated_count += updated
+                job.error_count += len(errors)
+                job.errors = (job.errors + errors)[:MAX_STORED_ERRORS]
+                job.save(update_fields=['processed_rows', 'created_count', 'updated_count', 'error_count', 'errors', 'last_modified'])
+
+    job.status = ImportJobStatus.COMPLETED
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'finished_at', 'last_modified'])
+
+
+def fail_import_job(job, reason):
+    ProductImportJob.objects.filter(pk=job.pk).update(status=ImportJobStatus.FAILED, failure_reason=reason, last_modified=timezone.now())
@@ -0,0 +1,117 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Q
+
+from nxtbn.core.batching import OnCommitBatch
+from nxtbn.product import StockStatus
+from nxtbn.product.models import CategoryClosure, Product, ProductListingEntry
+
+
+def _category_paths(category_ids):
+    """`{category_id: "Root > ... > Category"}`, read from the closure table in one query whatever the depth."""
+    names = defaultdict(list)
+    for category_id, name in (
+        CategoryClosure.objects.filter(descendant_id__in=category_ids)
+        .order_by('descendant_id', '-depth')
+        .values_list('descendant_id', 'ancestor__name')
+    ):
+        names[category_id].append(name)
+    return {category_id: ' > '.join(path) for category_id, path in names.items()}
+
+
+def build_listing_entries(product_ids):
+    """
+    Computes the `ProductListingEntry` rows of the given products with a fixed number of queries.
+
+    One row is built for `settings.LANGUAGE_CODE` from the product's own texts and one for each
+    language the product has a translation in.
+    """
+    products = (
+        Product.objects.filter(id__in=product_ids)
+        .prefetch_related('translations')
+        .annotate(total_variant=Count('variants', distinct=True))
+    )
+    category_paths = _category_paths({product.category_id for product in products if product.category_id})
+
+    currency = settings.BASE_CURRENCY
+    entries = []
+    for product in products:
+        common = {
+            'product': product,
+            'status': product.status,
+            'slug': product.slug,
+            'category_id': product.category_id,
+            'category_path': category_paths.get(product.category_id, ''),
+            'min_price_subunit': product.min_price_subunit, # materialized by nxtbn.product.summary
+            'max_price_subunit': product.max_price_subunit,
+            'currency': currency,
+            'thumbnail': product.thumbnail_url,
+            'thumbnail_xs': product.thumbnail_xs_url,
+            'variant_count': product.total_variant,
+            'available_stock': product.total_available_stock,
+            'stock_status': StockStatus.IN_STOCK if product.in_stock else StockStatus.OUT_OF_STOCK,
+            'created_at': product.created_at,
+        }
+
+        entries.append(ProductListingEntry(
+            language_code=settings.LANGUAGE_CODE,
+            name=product.name,
+            summary=product.summary,
+            **common,
+        ))
+        for translation in product.translations.all():
+            if translation.language_code == settings.LANGUAGE_CODE:
+                continue
+            entries.append(ProductListingEntry(
+                language_code=translation.language_code,
+                name=translation.name,
+                summary=translation.summary,
+                **common,
+            ))
+    return entries
+
+
+def refresh_product_listing(product_ids):
+    """Replaces the listing rows of the given products; rows of deleted products are removed."""
+    product_ids = list(set(product_ids))
+    if not product_ids:
+        return
+    entries = build_listing_entries(product_ids)
+    with transaction.atomic():
+        ProductListingEntry.objects.filter(product_id__in=product_ids).delete()
+        ProductListingEntry.objects.bulk_create(entries)
+
+
+def rebuild_product_listing(chunk_size=500):
+    """Rebuilds the whole listing table, `chunk_size` products at a time. Yields the size of each chunk."""
+    product_ids = list(Product.objects.order_by('pk').values_list('pk', flat=True))
+    ProductListingEntry.objects.exclude(product_id__in=Product.objects.values('pk')).delete()
+    for start in range(0, len(product_ids), chunk_size):
+        chunk = product_ids[start:start + chunk_size]
+        refresh_product_listing(chunk)
+        yield len(chunk)
+
+
+def get_listing_queryset(language_code):
+    """
+    Returns the listing rows in `language_code`, falling back to the rows in
+    `settings.LANGUAGE_CODE` for products without a translation.
+    """
+    default_language = settings.LANGUAGE_CODE
+    if language_code == default_language:
+        return ProductListingEntry.objects.filter(language_code=default_language)
+
+    translated = ProductListingEntry.objects.filter(product_id=OuterRef('product_id'), language_code=language_code)
+    return ProductListingEntry.objects.filter(
+        Q(language_code=language_code) | (Q(language_code=default_language) & ~Exists(translated))
+    )
+
+
+_refresh_batch = OnCommitBatch(refresh_product_listing)
+
+
+def schedule_product_listing_refresh(product_ids):
+    """Queues the products for a listing refresh once the current transaction commits."""
+    _refresh_batch.add(product_ids)
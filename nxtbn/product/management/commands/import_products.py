@@ -0,0 +1,53 @@
+import os
+
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+
+from nxtbn.product import ImportFileFormat
+from nxtbn.product.importer import run_import_job
+from nxtbn.product.models import ProductImportJob
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Import products from a CSV or JSONL file, or resume an interrupted import'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', help='CSV or JSONL file to import')
+        parser.add_argument('--username', default='admin', help='User recorded as the creator of the products')
+        parser.add_argument('--resume', type=int, help='Id of an import job to continue after its last processed row')
+        parser.add_argument('--chunk_size', type=int, default=None, help='Number of rows imported per transaction')
+
+    def handle(self, *args, **options):
+        if options['resume']:
+            job = ProductImportJob.objects.filter(pk=options['resume']).first()
+            if job is None:
+                raise CommandError(f"Import job {options['resume']} does not exist")
+        elif options['path']:
+            job = self.create_job(options['path'], options['username'])
+        else:
+            raise CommandError('Give a file to import or --resume <job id>')
+
+        run_import_job(job, chunk_size=options['chunk_size'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Import {job.id}: {job.processed_rows} rows, {job.created_count} variants created, "
+            f"{job.updated_count} updated, {job.error_count} rejected"
+        ))
+
+    def create_job(self, path, username):
+        extension = os.path.splitext(path)[1].lower()
+        formats = {'.csv': ImportFileFormat.CSV, '.jsonl': ImportFileFormat.JSONL, '.ndjson': ImportFileFormat.JSONL}
+        if extension not in formats:
+            raise CommandError('Only .csv and .jsonl files can be imported')
+
+        user = User.objects.filter(username=username).first()
+        if user is None:
+            raise CommandError(f'User "{username}" does not exist')
+
+        job = ProductImportJob(created_by=user, file_format=formats[extension])
+        with open(path, 'rb') as file:
+            job.file.save(os.path.basename(path), File(file))
+        return job
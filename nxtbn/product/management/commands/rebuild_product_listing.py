@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from tqdm import tqdm
+
+from nxtbn.product.listing import rebuild_product_listing
+from nxtbn.product.models import Product
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalized product listing table (ProductListingEntry)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk_size', type=int, default=500, help='Number of products refreshed per transaction')
+
+    def handle(self, *args, **options):
+        with tqdm(total=Product.objects.count(), desc="Rebuilding product listing", unit="product") as pbar:
+            for refreshed in rebuild_product_listing(chunk_size=options['chunk_size']):
+                pbar.update(refreshed)
+
+        self.stdout.write(self.style.SUCCESS('Successfully rebuilt the product listing'))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from tqdm import tqdm
+
+from nxtbn.product.models import Product
+from nxtbn.product.search import rebuild_search_documents
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search documents of every product'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk_size', type=int, default=500, help='Number of products indexed per batch')
+
+    def handle(self, *args, **options):
+        with tqdm(total=Product.objects.count(), desc="Indexing products", unit="product") as pbar:
+            for indexed in rebuild_search_documents(chunk_size=options['chunk_size']):
+                pbar.update(indexed)
+
+        self.stdout.write(self.style.SUCCESS('Successfully rebuilt the product search index'))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from tqdm import tqdm
+
+from nxtbn.product.models import Product
+from nxtbn.product.summary import rebuild_product_summaries
+
+
+class Command(BaseCommand):
+    help = 'Backfill the materialized price range and stock summary of products'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk_size', type=int, default=500, help='Number of products refreshed per batch')
+
+    def handle(self, *args, **options):
+        with tqdm(total=Product.objects.count(), desc="Rebuilding product summaries", unit="product") as pbar:
+            for refreshed in rebuild_product_summaries(chunk_size=options['chunk_size']):
+                pbar.update(refreshed)
+
+        self.stdout.write(self.style.SUCCESS('Successfully rebuilt the product summaries'))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from tqdm import tqdm
+
+from nxtbn.product.models import ProductVariant
+from nxtbn.product.price_lists import rebuild_variant_prices
+
+
+class Command(BaseCommand):
+    help = 'Backfill the prices of every variant in each storefront currency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk_size', type=int, default=1000, help='Number of variants refreshed per batch')
+
+    def handle(self, *args, **options):
+        with tqdm(total=ProductVariant.objects.count(), desc="Rebuilding variant prices", unit="variant") as pbar:
+            for refreshed in rebuild_variant_prices(chunk_size=options['chunk_size']):
+                pbar.update(refreshed)
+
+        self.stdout.write(self.style.SUCCESS('Successfully rebuilt the variant prices'))
@@ -0,0 +1,59 @@
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from nxtbn.product.models import Category, Collection, ProductType
+from nxtbn.product.repricing import PRICE_FIELDS, adjust_prices, apply_price_list, filter_variants, read_price_list
+
+
+class Command(BaseCommand):
+    help = 'Reprice variants by a percentage or an amount, or from a CSV price list of sku and prices'
+
+    def add_arguments(self, parser):
+        change = parser.add_mutually_exclusive_group(required=True)
+        change.add_argument('--percentage', type=Decimal, help='Relative change, eg. -15 for 15%% off')
+        change.add_argument('--amount', type=Decimal, help='Absolute change in the currency of each variant')
+        change.add_argument('--price_list', help='CSV file with a sku column and price, compare_at_price or cost_per_unit columns')
+        parser.add_argument('--field', choices=PRICE_FIELDS, default='price', help='Field changed by --percentage or --amount')
+        parser.add_argument('--category', help='Category name, includes its subcategories')
+        parser.add_argument('--product_type', help='Product type name')
+        parser.add_argument('--collection', help='Collection name')
+        parser.add_argument('--dry_run', action='store_true', help='Show the changes without writing them')
+        parser.add_argument('--chunk_size', type=int, default=5000, help='Number of variants updated per transaction')
+
+    def handle(self, *args, **options):
+        filters = {}
+        for option, model in [('category', Category), ('product_type', ProductType), ('collection', Collection)]:
+            if options[option]:
+                filters[option] = model.objects.filter(name=options[option]).first()
+                if filters[option] is None:
+                    raise CommandError(f"{model._meta.verbose_name} \"{options[option]}\" does not exist")
+        variants = filter_variants(**filters)
+
+        try:
+            if options['price_list']:
+                with open(options['price_list'], 'rb') as file:
+                    prices = read_price_list(file)
+                result = apply_price_list(prices, variants, dry_run=options['dry_run'], chunk_size=options['chunk_size'])
+            else:
+                result = adjust_prices(
+                    variants,
+                    field=options['field'],
+                    percentage=options['percentage'],
+                    amount=options['amount'],
+                    dry_run=options['dry_run'],
+                    chunk_size=options['chunk_size'],
+                )
+        except ValidationError as e:
+            raise CommandError('\n'.join(e.messages))
+
+        for change in result['changes']:
+            self.stdout.write(f"{change['sku'] or change['id']}: {change['field']} {change['old']} -> {change['new']} {change['currency']}")
+        for sku in result.get('missing', []):
+            self.stdout.write(self.style.WARNING(f"{sku}: no such variant"))
+
+        if options['dry_run']:
+            self.stdout.write(self.style.NOTICE(f"Dry run, {result['matched']} variants would be repriced"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Repriced {result['matched']} variants"))
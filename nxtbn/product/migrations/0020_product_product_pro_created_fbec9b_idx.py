@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-19 03:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0019_productvariant_image'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['created_at', 'id'], name='product_pro_created_fbec9b_idx'),
+        ),
+    ]
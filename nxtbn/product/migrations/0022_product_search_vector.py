@@ -0,0 +1,46 @@
+# Generated by Django 4.2.11 on 2026-10-19 03:24
+
+import django.contrib.postgres.search
+from django.db import OperationalError, migrations
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS product_product_search_vector_gin "
+            "ON product_product USING gin (search_vector)"
+        )
+    elif connection.vendor == 'sqlite':
+        try:
+            schema_editor.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS product_search_fts USING fts5("
+                "product_id UNINDEXED, language_code UNINDEXED, name, summary, body, "
+                "tokenize = 'porter unicode61 remove_diacritics 2')"
+            )
+        except OperationalError:
+            pass # SQLite built without FTS5, search falls back to icontains
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS product_product_search_vector_gin")
+    elif connection.vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS product_search_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0021_productlistingentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
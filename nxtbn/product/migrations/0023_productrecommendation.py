@@ -0,0 +1,30 @@
+# Generated by Django 4.2.11 on 2026-10-19 03:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0022_product_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='product.product')),
+                ('recommended', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommended_in', to='product.product')),
+            ],
+            options={
+                'ordering': ('product', 'rank'),
+                'indexes': [models.Index(fields=['product', 'rank'], name='product_pro_product_4cc06d_idx')],
+                'unique_together': {('product', 'recommended')},
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.11 on 2026-10-19 03:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('filemanager', '0005_alter_image_image_alter_image_image_xs'),
+        ('product', '0024_categoryclosure'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='primary_image',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='filemanager.image'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='thumbnail_url',
+            field=models.CharField(blank=True, editable=False, max_length=500, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='thumbnail_xs_url',
+            field=models.CharField(blank=True, editable=False, max_length=500, null=True),
+        ),
+        migrations.AddField(
+            model_name='productvariant',
+            name='thumbnail_url',
+            field=models.CharField(blank=True, editable=False, max_length=500, null=True),
+        ),
+        migrations.AddField(
+            model_name='productvariant',
+            name='thumbnail_xs_url',
+            field=models.CharField(blank=True, editable=False, max_length=500, null=True),
+        ),
+    ]
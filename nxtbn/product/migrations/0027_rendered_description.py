@@ -0,0 +1,39 @@
+# Generated by Django 4.2.11 on 2026-10-19 03:57
+
+from django.db import migrations, models
+
+from nxtbn.product.utils import json_to_html
+
+
+def render_descriptions(apps, schema_editor):
+    for model_name in ('Product', 'ProductTranslation'):
+        model = apps.get_model('product', model_name)
+        rows = []
+        for row in model.objects.only('id', 'description').iterator(chunk_size=1000):
+            row.rendered_description = json_to_html(row.description)
+            rows.append(row)
+            if len(rows) == 1000:
+                model.objects.bulk_update(rows, ['rendered_description'])
+                rows = []
+        model.objects.bulk_update(rows, ['rendered_description'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0026_product_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='rendered_description',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='producttranslation',
+            name='rendered_description',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(render_descriptions, migrations.RunPython.noop),
+    ]
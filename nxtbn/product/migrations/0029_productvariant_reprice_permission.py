@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-19 04:10
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0028_product_import'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='productvariant',
+            options={'ordering': ('price',), 'permissions': [('can_bulk_reprice_variants', 'Can bulk reprice variants')]},
+        ),
+    ]
@@ -1,23 +1,28 @@
 import json
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
 from django.db.models import Sum
-from babel.numbers import get_currency_precision, format_currency
+from django.contrib.postgres.search import SearchVectorField
+from babel.numbers import get_currency_precision
 from django_extensions.db.fields import AutoSlugField
 
 
 from django.utils.html import escape, format_html
 
 
-from nxtbn.core import CurrencyTypes, MoneyFieldTypes
+from nxtbn.core import CurrencyTypes, MoneyFieldTypes, PublishableStatus
+from nxtbn.core.currency.formatter import get_currency_formatter
 from nxtbn.core.mixin import MonetaryMixin
+from nxtbn.core.utils import to_currency_unit
 from nxtbn.core.models import AbstractMetadata, AbstractSEOModel, AbstractTranslationModel, AbstractUUIDModel, PublishableModel, AbstractBaseUUIDModel, AbstractBaseModel, NameDescriptionAbstract, no_nested_values
 from nxtbn.filemanager.models import Document, Image
-from nxtbn.product import DimensionUnits, StockStatus, WeightUnits
+from nxtbn.core.enum_perms import PermissionsEnum
+from nxtbn.product import DimensionUnits, ImportFileFormat, ImportJobStatus, StockStatus, WeightUnits
 from nxtbn.product.utils import json_to_html
 from nxtbn.tax.models import TaxClass
 from nxtbn.users.admin import User
@@ -47,18 +52,47 @@ class Category(NameDescriptionAbstract, AbstractSEOModel):
         related_name='subcategories'
     )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Detects moves on save; left unset when `parent` is deferred, so `.only()` costs no query per row
+        if cls._meta.get_field('parent').attname in instance.__dict__:
+            instance._loaded_parent_id = instance.parent_id
+        return instance
+
+    def _get_loaded_parent_id(self):
+        """The parent id stored in the database, read once for instances not loaded with it."""
+        if not hasattr(self, '_loaded_parent_id'):
+            self._loaded_parent_id = (
+                None if self._state.adding
+                else Category.objects.filter(pk=self.pk).values_list('parent_id', flat=True).first()
+            )
+        return self._loaded_parent_id
+
     def has_sub(self):
         return self.subcategories.exists()
 
+    def get_ancestors(self, include_self=False):
+        """Ancestors from the root down, in one query."""
+        queryset = Category.objects.filter(descendant_links__descendant=self)
+        if not include_self:
+            queryset = queryset.exclude(pk=self.pk)
+        return queryset.order_by('-descendant_links__depth')
+
+    def get_descendants(self, include_self=False):
+        """The whole subtree below this category, in one query."""
+        queryset = Category.objects.filter(ancestor_links__ancestor=self)
+        if not include_self:
+            queryset = queryset.exclude(pk=self.pk)
+        return queryset
+
     def get_family_tree(self):
-        family_tree = []
-        current = self
-        depth = 0
-        while current is not None:
-            family_tree.insert(0, {'depth': depth, 'name': current.name})
-            current = current.parent
-            depth += 1
-        return family_tree
+        return [
+            {'depth': depth, 'name': name}
+            for name, depth in CategoryClosure.objects.filter(descendant=self)
+            .order_by('-depth')
+            .values_list('ancestor__name', 'depth')
+        ]
 
     class Meta:
         verbose_name = _("Category")
@@ -68,22 +102,89 @@ class Category(NameDescriptionAbstract, AbstractSEOModel):
         return self.name
 
     def clean(self):
-        """Validate that category depth does not exceed 2 levels."""
-        if self._get_depth() > 2:
+        """Validate that category depth does not exceed 2 levels and that a category is not moved below itself."""
+        if self.parent_id is not None and self.pk is not None and self.parent_id != self._get_loaded_parent_id():
+            if CategoryClosure.objects.filter(ancestor_id=self.pk, descendant_id=self.parent_id).exists():
+                raise ValidationError("A category can not be moved below itself or one of its subcategories.")
+
+        if self._get_depth() + self._get_height() > 2:
             raise ValidationError("Category depth must not exceed 2 levels.")
 
     def _get_depth(self):
-        """Recursively determine the depth of the category."""
-        depth = 0
-        current = self
-        while current.parent:
-            depth += 1
-            current = current.parent
-        return depth
+        """Depth of the category, read from the parent's closure rows."""
+        if self.parent_id is None:
+            return 0
+        return CategoryClosure.objects.filter(descendant_id=self.parent_id).count()
+
+    def _get_height(self):
+        """Depth of the deepest subcategory below this category, 0 for leaves and new categories."""
+        if self._state.adding:
+            return 0
+        return CategoryClosure.objects.filter(ancestor_id=self.pk).aggregate(height=models.Max('depth'))['height'] or 0
 
     def save(self, *args, **kwargs):
         self.clean()
-        super().save(*args, **kwargs)
+        is_new = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if is_new:
+                CategoryClosure.insert_node(self)
+            elif self.parent_id != self._get_loaded_parent_id():
+                CategoryClosure.move_subtree(self)
+        self._loaded_parent_id = self.parent_id
+
+
+class CategoryClosure(models.Model):
+    """
+    Closure table of the category hierarchy: one row for every (ancestor, descendant) pair,
+    including each category paired with itself at depth 0. Maintained by `Category.save`
+    and the `pre_delete` receiver of `Category`.
+    """
+    ancestor = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='descendant_links')
+    descendant = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='ancestor_links')
+    depth = models.PositiveSmallIntegerField()
+
+    class Meta:
+        unique_together = ('ancestor', 'descendant')
+        indexes = [
+            models.Index(fields=['descendant', 'depth']),
+        ]
+
+    @classmethod
+    def insert_node(cls, category):
+        rows = [cls(ancestor=category, descendant=category, depth=0)]
+        if category.parent_id is not None:
+            rows.extend(
+                cls(ancestor_id=ancestor_id, descendant=category, depth=depth + 1)
+                for ancestor_id, depth in cls.objects.filter(descendant_id=category.parent_id).values_list('ancestor_id', 'depth')
+            )
+        cls.objects.bulk_create(rows)
+
+    @classmethod
+    def detach_subtree(cls, category):
+        """Unlinks the subtree rooted at `category` from all of its ancestors."""
+        subtree_ids = cls.objects.filter(ancestor=category).values('descendant_id')
+        cls.objects.filter(descendant_id__in=subtree_ids).exclude(ancestor_id__in=subtree_ids).delete()
+
+    @classmethod
+    def detach_children(cls, category):
+        """Makes every subtree below `category` a root, as `parent` is set to NULL when a category is deleted."""
+        subtree_ids = cls.objects.filter(ancestor=category, depth__gt=0).values('descendant_id')
+        cls.objects.filter(descendant_id__in=subtree_ids).exclude(ancestor_id__in=subtree_ids).delete()
+
+    @classmethod
+    def move_subtree(cls, category):
+        subtree = list(cls.objects.filter(ancestor=category).values_list('descendant_id', 'depth'))
+        cls.detach_subtree(category)
+        if category.parent_id is None:
+            return
+        parent_ancestors = list(cls.objects.filter(descendant_id=category.parent_id).values_list('ancestor_id', 'depth'))
+        cls.objects.bulk_create([
+            cls(ancestor_id=ancestor_id, descendant_id=descendant_id, depth=ancestor_depth + 1 + descendant_depth)
+            for ancestor_id, ancestor_depth in parent_ancestors
+            for descendant_id, descendant_depth in subtree
+        ])
+
 
 class Collection(NameDescriptionAbstract, AbstractSEOModel):
     slug = AutoSlugField(populate_from='name', unique=True)
@@ -134,7 +235,32 @@ class ProductType(models.Model):
     
     # TO DO: class Meta: # Handle unique together with each field except name
 
-class Product(PublishableModel, AbstractMetadata, AbstractSEOModel):
+class RenderedDescriptionModel(models.Model):
+    """
+    Stores the HTML of the rich-text (EditorJS JSON) `description` in `rendered_description`,
+    rendered on save so reads never walk the JSON.
+    """
+    rendered_description = models.TextField(blank=True, default='', editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'description' in update_fields:
+            self.rendered_description = json_to_html(self.description)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'rendered_description'}
+        super().save(*args, **kwargs)
+
+    def description_html(self):
+        if not self.rendered_description and self.description:
+            # Row written without save(), eg. by queryset.update()
+            return json_to_html(self.description)
+        return self.rendered_description
+
+
+class Product(PublishableModel, AbstractMetadata, AbstractSEOModel, RenderedDescriptionModel):
     slug = AutoSlugField(populate_from='name', unique=True)
     created_by = models.ForeignKey(User, on_delete=models.PROTECT, related_name='products_created')
     last_modified_by = models.ForeignKey(User, on_delete=models.PROTECT, related_name='products_modified', null=True, blank=True)
@@ -153,6 +279,10 @@ class Product(PublishableModel, AbstractMetadata, AbstractSEOModel):
     summary = models.TextField(max_length=500, help_text="A brief summary of the product.")
     description = models.TextField(max_length=5000)
     images = models.ManyToManyField(Image, blank=True)
+    # First of `images`, with its resolved URLs, maintained by nxtbn.product.thumbnails
+    primary_image = models.ForeignKey(Image, null=True, blank=True, on_delete=models.SET_NULL, related_name='+', editable=False)
+    thumbnail_url = models.CharField(max_length=500, null=True, blank=True, editable=False)
+    thumbnail_xs_url = models.CharField(max_length=500, null=True, blank=True, editable=False)
     category = models.ForeignKey(
         'Category',
         on_delete=models.PROTECT, 
@@ -181,12 +311,37 @@ class Product(PublishableModel, AbstractMetadata, AbstractSEOModel):
             "recommendation engines."
         )
     )
+    search_vector = SearchVectorField(null=True, blank=True, editable=False) # maintained by nxtbn.product.search
+
+    # Variant price range in BASE_CURRENCY subunits and stock summary, maintained by nxtbn.product.summary
+    min_price_subunit = models.BigIntegerField(null=True, blank=True, editable=False)
+    max_price_subunit = models.BigIntegerField(null=True, blank=True, editable=False)
+    total_available_stock = models.IntegerField(default=0, editable=False)
+    in_stock = models.BooleanField(default=False, editable=False)
 
     class Meta:
         ordering = ('name',)
+        indexes = [
+            models.Index(fields=['created_at', 'id']), # keyset pagination, see NxtbnKeysetPagination
+            models.Index(fields=['min_price_subunit', 'id']), # sort by price
+            models.Index(fields=['in_stock', 'min_price_subunit']), # hide out of stock, sorted by price
+            # the GIN index on search_vector is created in migration 0022, PostgreSQL only
+        ]
+
+    # Columns maintained from other tables, never written back from a possibly stale instance
+    MATERIALIZED_FIELDS = frozenset({
+        'search_vector',
+        'primary_image', 'thumbnail_url', 'thumbnail_xs_url',
+        'min_price_subunit', 'max_price_subunit', 'total_available_stock', 'in_stock',
+    })
 
-    def description_html(self):
-        return json_to_html(self.description)
+    def save(self, *args, **kwargs):
+        if not self._state.adding and not kwargs.get('force_insert') and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.MATERIALIZED_FIELDS
+            ]
+        super().save(*args, **kwargs)
 
     def get_stock_details(self):
         from nxtbn.warehouse.models import Stock
@@ -215,49 +370,41 @@ class Product(PublishableModel, AbstractMetadata, AbstractSEOModel):
         Returns the URL of the first image associated with the product. 
         If no image is available, returns None.
         """
-        first_image = self.images.first()  # Get the first image if it exists
-        if first_image and hasattr(first_image, 'image') and first_image.image:
-            image_url = first_image.image.url
-            full_url = request.build_absolute_uri(image_url)
-            return full_url
+        if self.thumbnail_url:
+            return request.build_absolute_uri(self.thumbnail_url)
         return None
     
     def product_thumbnail_xs(self, request):
         """
-        Returns the URL of the first image associated with the product. 
-        If no image is available, returns None.
+        Returns the URL of the small rendition of the first image associated with the product,
+        or of the image itself when it has none. If no image is available, returns None.
         """
-        first_image = self.images.first()  # Get the first image if it exists
-        if first_image and hasattr(first_image, 'image_xs') and first_image.image_xs:
-            image_url = first_image.image_xs.url
-            full_url = request.build_absolute_uri(image_url)
-            return full_url
-        
-        if first_image and hasattr(first_image, 'image') and first_image.image:
-            image_url = first_image.image.url
-            full_url = request.build_absolute_uri(image_url)
-            return full_url
-
+        if self.thumbnail_xs_url:
+            return request.build_absolute_uri(self.thumbnail_xs_url)
         return None
 
 
     
     def product_price_range(self):
         """
-        Returns the price range of the product variants.
+        Returns the price range of the product variants in BASE_CURRENCY.
         """
-        price_range = self.variants.aggregate(min_price=models.Min('price'), max_price=models.Max('price'))
-        return price_range
+        if self.min_price_subunit is None:
+            return {'min_price': None, 'max_price': None}
+        return {
+            'min_price': Decimal(to_currency_unit(self.min_price_subunit, settings.BASE_CURRENCY)),
+            'max_price': Decimal(to_currency_unit(self.max_price_subunit, settings.BASE_CURRENCY)),
+        }
     
     def product_price_range_humanized(self, locale='en_US'):
         """
         Returns the price range of the product variants in a human-readable format.
         """
 
-        if not self.default_variant:
+        if not self.default_variant_id:
             return "No variants available."
 
-        if not self.variants.exists():
+        if self.min_price_subunit is None:
             return "No variants available."
         
 
@@ -269,7 +416,8 @@ class Product(PublishableModel, AbstractMetadata, AbstractSEOModel):
             min_price = Decimal('0.00')
         
         if locale:
-            return f"{format_currency(min_price, self.default_variant.currency, locale=locale)} - {format_currency(max_price, self.default_variant.currency, locale=locale)}"
+            formatter = get_currency_formatter(settings.BASE_CURRENCY, locale)
+            return f"{formatter.format(min_price)} - {formatter.format(max_price)}"
         return f"{min_price} - {max_price}"
         
     
@@ -305,6 +453,9 @@ class ProductVariant(MonetaryMixin, AbstractUUIDModel, AbstractMetadata, models.
     product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='variants')
     name = models.CharField(max_length=255, blank=True, null=True)
     image = models.ForeignKey(Image, null=True, blank=True, on_delete=models.SET_NULL)
+    # URLs of `image`, or of the product's primary image, maintained on save and by nxtbn.product.thumbnails
+    thumbnail_url = models.CharField(max_length=500, null=True, blank=True, editable=False)
+    thumbnail_xs_url = models.CharField(max_length=500, null=True, blank=True, editable=False)
 
     compare_at_price = models.DecimalField(max_digits=12, decimal_places=3, validators=[MinValueValidator(Decimal('0.01'))], null=True, blank=True) # TO DO: Handle this field which is still not used in the project.
 
@@ -382,45 +533,32 @@ class ProductVariant(MonetaryMixin, AbstractUUIDModel, AbstractMetadata, models.
     
     def humanize_total_price(self, locale='en_US'):
         if locale:
-            return format_currency(self.price, self.currency, locale=locale)
+            return get_currency_formatter(self.currency, locale).format(self.price)
         return self.price
     
     def variant_thumbnail(self, request):
         """
-        Returns the URL of the first image associated with the product variant. 
-        If no image is available, returns None.
+        Returns the URL of the image associated with the product variant, or of the product's
+        first image. If no image is available, returns None.
         """
-        if self.image and hasattr(self.image, 'image') and self.image.image:
-            image_url = self.image.image.url
-            full_url = request.build_absolute_uri(image_url)
-            return full_url
-        
-        if self.product.images.exists():
-            first_image = self.product.images.first()
-            if first_image and hasattr(first_image, 'image') and first_image.image:
-                image_url = first_image.image.url
-                full_url = request.build_absolute_uri(image_url)
-                return full_url
+        if self.thumbnail_url:
+            return request.build_absolute_uri(self.thumbnail_url)
         return None
     
     def variant_thumbnail_xs(self, request):
         """
-        Returns the URL of the first image associated with the product variant. 
-        If no image is available, returns None.
+        Returns the URL of the small rendition of the variant's image, or of the product's
+        first image. If no image is available, returns None.
         """
-        if self.image and hasattr(self.image, 'image_xs') and self.image.image_xs:
-            image_url = self.image.image_xs.url
-            full_url = request.build_absolute_uri(image_url)
-            return full_url
-        
-        if self.product.images.exists():
-            first_image = self.product.images.first()
-            if first_image and hasattr(first_image, 'image') and first_image.image:
-                image_url = first_image.image.url
-                full_url = request.build_absolute_uri(image_url)
-                return full_url
+        if self.thumbnail_xs_url:
+            return request.build_absolute_uri(self.thumbnail_xs_url)
         return None
-        
+
+    def resolve_thumbnail_urls(self):
+        if self.image_id and self.image.image:
+            return self.image.get_relative_urls()
+        product_urls = Product.objects.filter(pk=self.product_id).values_list('thumbnail_url', 'thumbnail_xs_url').first()
+        return product_urls or (None, None)
         
     def get_valid_stock(self): # stocks that available for sell
         stock_data = self.warehouse_stocks.aggregate(
@@ -440,9 +578,17 @@ class ProductVariant(MonetaryMixin, AbstractUUIDModel, AbstractMetadata, models.
 
     class Meta:
         ordering = ('price',)  # Order by price ascending
+        permissions = [
+            (PermissionsEnum.CAN_BULK_REPRICE_VARIANTS, 'Can bulk reprice variants'),
+        ]
     
     def save(self, *args, **kwargs):
         self.validate_amount()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'image' in update_fields:
+            self.thumbnail_url, self.thumbnail_xs_url = self.resolve_thumbnail_urls()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'thumbnail_url', 'thumbnail_xs_url'}
         super(ProductVariant, self).save(*args, **kwargs)
 
     def __str__(self):
@@ -488,7 +634,7 @@ class CollectionTranslation(AbstractTranslationModel, AbstractSEOModel):
         return self.name
     
 
-class ProductTranslation(AbstractTranslationModel, AbstractSEOModel):
+class ProductTranslation(AbstractTranslationModel, AbstractSEOModel, RenderedDescriptionModel):
     product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='translations')
     name = models.CharField(max_length=255)
     name_when_in_relation = models.CharField(max_length=255, blank=True, null=True)
@@ -534,4 +680,129 @@ class ProductTagTranslation(AbstractTranslationModel, AbstractSEOModel):
 
     def __str__(self):
         return self.name
-    
\ No newline at end of file
+    
+
+
+# ==================================================================
+# Read Models
+# ==================================================================
+
+class ProductListingEntry(models.Model):
+    """
+    Denormalized listing row, one per product and language.
+
+    Holds everything a product list renders so listings are served with a single indexed query.
+    Rows are maintained by `nxtbn.product.listing` from signals and rebuilt with the
+    `rebuild_product_listing` management command; never edit them directly.
+    """
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='listing_entries')
+    language_code = models.CharField(max_length=10)
+    status = models.CharField(max_length=20, choices=PublishableStatus.choices)
+    name = models.CharField(max_length=255)
+    summary = models.TextField(max_length=500, blank=True)
+    slug = models.CharField(max_length=255)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='+')
+    category_path = models.CharField(max_length=800, help_text="Category names from the root, eg. 'Men > Shirts'.")
+    min_price_subunit = models.BigIntegerField(null=True, blank=True)
+    max_price_subunit = models.BigIntegerField(null=True, blank=True)
+    currency = models.CharField(max_length=3, choices=CurrencyTypes.choices)
+    thumbnail = models.CharField(max_length=500, null=True, blank=True)
+    thumbnail_xs = models.CharField(max_length=500, null=True, blank=True)
+    variant_count = models.PositiveIntegerField(default=0)
+    available_stock = models.IntegerField(default=0)
+    stock_status = models.CharField(max_length=20, choices=StockStatus.choices)
+    created_at = models.DateTimeField(help_text="Creation time of the product.")
+    last_refreshed = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ('-created_at', '-id')
+        unique_together = ('product', 'language_code')
+        indexes = [
+            models.Index(fields=['language_code', 'status', 'created_at']),
+            models.Index(fields=['language_code', 'status', 'min_price_subunit']),
+            models.Index(fields=['language_code', 'category']),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.language_code})"
+
+
+class VariantPrice(models.Model):
+    """
+    Price of a variant in one of the storefront currencies, converted from its BASE_CURRENCY
+    price, or set by hand with `override_price_subunit`, with its formatted strings per
+    locale of `settings.PRICE_LIST_LOCALES`.
+
+    Rows are maintained by `nxtbn.product.price_lists` when variant prices or exchange rates
+    change and rebuilt with the `rebuild_variant_prices` management command; only the
+    overrides are edited directly.
+    """
+    variant = models.ForeignKey(ProductVariant, on_delete=models.CASCADE, related_name='prices')
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='+')
+    currency = models.CharField(max_length=3, choices=CurrencyTypes.choices)
+    price_subunit = models.BigIntegerField()
+    compare_at_price_subunit = models.BigIntegerField(null=True, blank=True)
+    override_price_subunit = models.BigIntegerField(null=True, blank=True, help_text="Manual price in subunits of the currency, used instead of the converted one.")
+    exchange_rate = models.DecimalField(max_digits=12, decimal_places=4, help_text="Rate the prices were converted with.")
+    formatted_price = models.JSONField(default=dict, help_text="{locale: formatted price}")
+    formatted_compare_at_price = models.JSONField(default=dict, help_text="{locale: formatted compare at price}")
+    last_refreshed = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('variant', 'currency')
+        indexes = [
+            models.Index(fields=['currency', 'product', 'price_subunit']),
+        ]
+
+    def __str__(self):
+        return f"{self.variant_id} {self.currency} {self.price_subunit}"
+
+
+class ProductRecommendation(models.Model):
+    """
+    Precomputed "you may also like" products, built periodically by
+    `nxtbn.product.tasks.build_product_recommendations`.
+    """
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='recommendations')
+    recommended = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='recommended_in')
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ('product', 'rank')
+        unique_together = ('product', 'recommended')
+        indexes = [
+            models.Index(fields=['product', 'rank']),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} -> {self.recommended_id} ({self.rank})"
+
+
+class ProductImportJob(AbstractBaseModel):
+    """
+    A CSV or JSONL file of products imported in the background by
+    `nxtbn.product.tasks.import_products`, see `nxtbn.product.importer` for the columns.
+    """
+    created_by = models.ForeignKey(User, on_delete=models.PROTECT, related_name='product_imports')
+    file = models.FileField(upload_to='imports/products/')
+    file_format = models.CharField(max_length=10, choices=ImportFileFormat.choices)
+    status = models.CharField(max_length=20, choices=ImportJobStatus.choices, default=ImportJobStatus.PENDING)
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    processed_rows = models.PositiveIntegerField(default=0, help_text="Rows committed so far, a resumed job continues after them.")
+    created_count = models.PositiveIntegerField(default=0)
+    updated_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True, help_text="Rejected rows as {'row': number, 'errors': {field: message}}, capped.")
+    failure_reason = models.TextField(blank=True, default='')
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ('-created_at',)
+        permissions = [
+            (PermissionsEnum.CAN_IMPORT_PRODUCTS, 'Can import products'),
+        ]
+
+    def __str__(self):
+        return f"{self.file.name} ({self.status})"
@@ -0,0 +1,109 @@
+"""
+Aggregate storefront product page.
+
+`load_product_page` gathers what a product page renders, the product with its variants,
+stock status, images, texts in the requested language, category breadcrumbs and
+recommendations, with a fixed number of queries however many variants or images the
+product has. Breadcrumbs come from the process-level category tree.
+
+Pages are cached in CACHES["generic"] per product, language and currency under a key
+derived from `Product.last_modified`, which is bumped whenever the variants, stock,
+images or translations of the product change, so an edit makes the cached pages
+unreachable instead of having to delete them. The same key serves as the ETag.
+Breadcrumbs and recommendations are not tracked and may lag up to
+`PRODUCT_PAGE_CACHE_TIMEOUT`.
+"""
+import hashlib
+
+from django.db.models import BooleanField, Case, F, Prefetch, Q, Sum, Value, When, prefetch_related_objects
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from nxtbn.core import PublishableStatus
+from nxtbn.product.category_tree import get_request_category_tree
+from nxtbn.product.models import Product, ProductTranslation, ProductVariant, ProductVariantTranslation, VariantPrice
+from nxtbn.product.recommendations import get_recommended_products
+
+
+def touch_products(product_ids):
+    """Bumps `last_modified` of the given products, making their cached pages stale."""
+    if product_ids:
+        Product.objects.filter(id__in=product_ids).update(last_modified=timezone.now())
+
+
+def get_product_page_version(slug):
+    """Returns `(id, last_modified)` of the published product with `slug`, or None."""
+    return (
+        Product.objects.filter(slug=slug, status=PublishableStatus.PUBLISHED)
+        .values_list('id', 'last_modified')
+        .first()
+    )
+
+
+def product_page_key(version, language_code, currency, exchange_rate, base_url):
+    """
+    Digest identifying one rendering of the page, used as ETag and cache key. `base_url`
+    is part of it since the page carries absolute image URLs.
+    """
+    product_id, last_modified = version
+    return hashlib.md5(
+        f"{product_id}:{last_modified.isoformat()}:{language_code}:{currency}:{exchange_rate}:{base_url}".encode()
+    ).hexdigest()
+
+
+def annotate_variant_availability(queryset):
+    """Annotates variants with `available_stock`, unreserved over every warehouse, and `sellable`."""
+    return (
+        queryset.annotate(
+            available_stock=Coalesce(Sum(F('warehouse_stocks__quantity') - F('warehouse_stocks__reserved')), 0),
+        )
+        .annotate(
+            sellable=Case(
+                When(Q(track_inventory=False) | Q(allow_backorder=True) | Q(available_stock__gt=0), then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            )
+        )
+    )
+
+
+def _translations(model, language_code):
+    return Prefetch('translations', queryset=model.objects.filter(language_code=language_code), to_attr='page_translations')
+
+
+def load_product_page(product_id, language_code, request=None, currency=None):
+    """
+    Returns the product with `variants` annotated with their `available_stock` and `sellable`
+    and carrying their `listed_prices` in `currency`, `images`, `page_translations` holding
+    its translation in `language_code` if any, plus `breadcrumbs`, the category path from
+    the root, and `recommended` products.
+    """
+    variants = (
+        annotate_variant_availability(ProductVariant.objects.all())
+        .order_by('pk')
+        .prefetch_related(
+            _translations(ProductVariantTranslation, language_code),
+            Prefetch('prices', queryset=VariantPrice.objects.filter(currency=currency), to_attr='listed_prices'),
+        )
+    )
+    product = (
+        Product.objects.prefetch_related(
+            Prefetch('variants', queryset=variants),
+            'images',
+            _translations(ProductTranslation, language_code),
+        )
+        .get(pk=product_id)
+    )
+
+    tree = get_request_category_tree(request)
+    breadcrumbs = []
+    category = tree.get(product.category_id)
+    while category is not None:
+        breadcrumbs.insert(0, category)
+        category = tree.get(category.parent_id)
+    product.breadcrumbs = breadcrumbs
+
+    recommended = list(get_recommended_products(product))
+    prefetch_related_objects(recommended, _translations(ProductTranslation, language_code))
+    product.recommended = recommended
+    return product
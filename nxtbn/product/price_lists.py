@@ -0,0 +1,197 @@
+"""
+Materialized multi-currency price lists.
+
+`VariantPrice` holds the price of every variant in each storefront currency, in subunits
+of that currency and formatted per locale of `settings.PRICE_LIST_LOCALES`, so listings
+join the prices in the visitor's currency instead of converting them row by row, and can
+sort and filter on them.
+
+Rows of a variant are refreshed with its price, inside the same transaction. Rows of a
+currency are refreshed in the background when its exchange rate changes, with
+`refresh_currency_prices`, one upsert per chunk of variants. Overrides survive refreshes.
+Each row records the rate it was converted with; readers only use rows converted with
+the rate they are using themselves and convert at read time otherwise, so a page never
+mixes prices of two rates while a refresh is running.
+"""
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import OuterRef, Prefetch, Subquery
+
+from nxtbn.core.batching import OnCommitBatch
+from nxtbn.core.currency.formatter import get_currency_formatter
+from nxtbn.core.models import CurrencyExchange
+from nxtbn.core.subunits import to_subunits, to_units
+from nxtbn.product.models import ProductVariant, VariantPrice
+from nxtbn.product.page import touch_products
+
+
+UPDATE_FIELDS = [
+    'price_subunit', 'compare_at_price_subunit', 'exchange_rate',
+    'formatted_price', 'formatted_compare_at_price', 'last_refreshed',
+]
+
+
+def price_list_currencies():
+    """The currencies prices are listed in, BASE_CURRENCY first."""
+    currencies = [settings.BASE_CURRENCY]
+    if settings.IS_MULTI_CURRENCY:
+        currencies += [currency for currency in settings.ALLOWED_CURRENCIES if currency != settings.BASE_CURRENCY]
+    return currencies
+
+
+def _load_rates(currencies):
+    rates = dict(
+        CurrencyExchange.objects.filter(base_currency=settings.BASE_CURRENCY, target_currency__in=currencies)
+        .values_list('target_currency', 'exchange_rate')
+    )
+    rates[settings.BASE_CURRENCY] = Decimal(1)
+    return {currency: rate for currency, rate in rates.items() if currency in currencies}
+
+
+def _format(subunits, currency):
+    if subunits is None:
+        return {}
+    amount = to_units(subunits, currency)
+    return {locale: get_currency_formatter(currency, locale).format(amount) for locale in settings.PRICE_LIST_LOCALES}
+
+
+def build_variant_prices(variant_ids, rates):
+    """Returns the unsaved `VariantPrice` rows of the given variants in each currency of `rates`."""
+    variants = ProductVariant.objects.filter(id__in=variant_ids).values_list('id', 'product_id', 'price', 'compare_at_price')
+    overrides = {
+        (variant_id, currency): override
+        for variant_id, currency, override in VariantPrice.objects.filter(
+            variant_id__in=variant_ids, currency__in=rates, override_price_subunit__isnull=False,
+        ).values_list('variant_id', 'currency', 'override_price_subunit')
+    }
+
+    rows = []
+    for variant_id, product_id, price, compare_at_price in variants:
+        for currency, rate in rates.items():
+            price_subunit = overrides.get((variant_id, currency))
+            if price_subunit is None:
+                price_subunit = to_subunits(price * rate, currency, settings.MONEY_ROUNDING)
+            compare_at_price_subunit = (
+                to_subunits(compare_at_price * rate, currency, settings.MONEY_ROUNDING) if compare_at_price is not None else None
+            )
+            rows.append(VariantPrice(
+                variant_id=variant_id,
+                product_id=product_id,
+                currency=currency,
+                price_subunit=price_subunit,
+                compare_at_price_subunit=compare_at_price_subunit,
+                exchange_rate=rate,
+                formatted_price=_format(price_subunit, currency),
+                formatted_compare_at_price=_format(compare_at_price_subunit, currency),
+            ))
+    return rows
+
+
+def refresh_variant_prices(variant_ids, currencies=None):
+    """
+    Recomputes the rows of the given variants in `currencies`, every price list currency by
+    default. Rows of currencies without an exchange rate are removed.
+    """
+    currencies = price_list_currencies() if currencies is None else currencies
+    rates = _load_rates(currencies)
+    rows = build_variant_prices(variant_ids, rates)
+    with transaction.atomic():
+        missing_rates = set(currencies) - set(rates)
+        if missing_rates:
+            VariantPrice.objects.filter(variant_id__in=variant_ids, currency__in=missing_rates).delete()
+        VariantPrice.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['variant', 'currency'],
+            update_fields=UPDATE_FIELDS,
+            batch_size=1000,
+        )
+
+
+def refresh_currency_prices(currencies, chunk_size=1000):
+    """Recomputes the rows of every variant in `currencies`, `chunk_size` variants at a time. Yields the size of each chunk."""
+    variant_ids = list(ProductVariant.objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(variant_ids), chunk_size):
+        chunk = variant_ids[start:start + chunk_size]
+        refresh_variant_prices(chunk, currencies)
+        yield len(chunk)
+
+
+def rebuild_variant_prices(chunk_size=1000):
+    """Rebuilds the whole table, dropping the rows of currencies no longer listed. Yields the size of each chunk."""
+    VariantPrice.objects.exclude(currency__in=price_list_currencies()).delete()
+    yield from refresh_currency_prices(price_list_currencies(), chunk_size=chunk_size)
+
+
+def set_price_override(variant_id, currency, amount):
+    """
+    Sets the price of a variant in `currency` by hand, or goes back to the converted price
+    when `amount` is None. The variant must already be listed in `currency`.
+    """
+    override = to_subunits(amount, currency) if amount is not None else None
+    with transaction.atomic():
+        row = VariantPrice.objects.filter(variant_id=variant_id, currency=currency).values('product_id').first()
+        if row is None:
+            raise ValidationError(f"Variant {variant_id} has no price in {currency}.")
+        VariantPrice.objects.filter(variant_id=variant_id, currency=currency).update(override_price_subunit=override)
+        refresh_variant_prices([variant_id], [currency])
+        touch_products([row['product_id']])
+
+
+def _queue_currency_refresh(currencies):
+    from nxtbn.product.tasks import refresh_variant_prices_in_currencies
+
+    refresh_variant_prices_in_currencies.delay(sorted(currencies))
+
+
+_currency_batch = OnCommitBatch(_queue_currency_refresh)
+
+
+def schedule_currency_price_refresh(currencies):
+    """Queues a background refresh of the listed currencies among `currencies` once the current transaction commits."""
+    _currency_batch.add(set(currencies) & set(price_list_currencies()))
+
+
+def annotate_price_range(queryset, currency, product_field='product_id'):
+    """
+    Annotates every row of `queryset` with `price`, the subunits of its cheapest variant in
+    `currency` to sort and filter on, `price_exchange_rate`, the rate it was converted with,
+    and `min_price_formatted`/`max_price_formatted`, `{locale: formatted price}`. Each is an
+    index lookup on `VariantPrice`; the annotations are None for products without rows.
+    """
+    prices = VariantPrice.objects.filter(product_id=OuterRef(product_field), currency=currency)
+    cheapest = prices.order_by('price_subunit', 'variant_id')
+    priciest = prices.order_by('-price_subunit', '-variant_id')
+    return queryset.annotate(
+        price=Subquery(cheapest.values('price_subunit')[:1]),
+        price_exchange_rate=Subquery(cheapest.values('exchange_rate')[:1]),
+        min_price_formatted=Subquery(cheapest.values('formatted_price')[:1]),
+        max_price_formatted=Subquery(priciest.values('formatted_price')[:1]),
+    )
+
+
+def listed_price(formatted, row_exchange_rate, exchange_rate, locale):
+    """
+    The formatted price of a `VariantPrice` row in `locale`, or None when the row was converted
+    with another rate than `exchange_rate` or is not formatted for `locale`, in which case the
+    caller converts the price itself.
+    """
+    if not formatted or row_exchange_rate is None or Decimal(row_exchange_rate) != Decimal(str(exchange_rate)):
+        return None
+    return formatted.get(locale)
+
+
+def prefetch_listed_prices(currency, lookup='prices'):
+    """Prefetches the `VariantPrice` row in `currency` of the variants reached through `lookup` as their `listed_prices`."""
+    return Prefetch(lookup, queryset=VariantPrice.objects.filter(currency=currency), to_attr='listed_prices')
+
+
+def variant_listed_price(variant, exchange_rate, field='formatted_price', locale='en_US'):
+    """`listed_price` of the row prefetched with `prefetch_listed_prices`, None when there is none."""
+    prices = getattr(variant, 'listed_prices', None)
+    if not prices:
+        return None
+    return listed_price(getattr(prices[0], field), prices[0].exchange_rate, exchange_rate, locale)
@@ -0,0 +1,139 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from nxtbn.core.signal_initiators import exchange_rates_changed
+from nxtbn.filemanager.models import Image
+from nxtbn.product.autocomplete import schedule_autocomplete_update
+from nxtbn.product.category_tree import invalidate_category_tree
+from nxtbn.product.listing import schedule_product_listing_refresh
+from nxtbn.product.models import Category, CategoryClosure, CategoryTranslation, Product, ProductRecommendation, ProductTranslation, ProductVariant, ProductVariantTranslation
+from nxtbn.product.page import touch_products
+from nxtbn.product.price_lists import refresh_variant_prices, schedule_currency_price_refresh
+from nxtbn.product.search import schedule_search_document_update
+from nxtbn.product.summary import refresh_product_summaries
+from nxtbn.product.thumbnails import THUMBNAIL_FIELDS, products_using_image, refresh_product_thumbnails
+
+
+@receiver(post_save, sender=Product)
+def refresh_on_product_save(sender, instance, **kwargs):
+    schedule_product_listing_refresh([instance.id])
+    schedule_search_document_update([instance.id])
+    schedule_autocomplete_update([instance.id])
+    # Cached pages of the products recommending it show its name and status too
+    touch_products(list(ProductRecommendation.objects.filter(recommended=instance).values_list('product_id', flat=True)))
+
+
+@receiver(post_save, sender=ProductVariant)
+@receiver(post_delete, sender=ProductVariant)
+def refresh_summary_on_variant_change(sender, instance, **kwargs):
+    refresh_product_summaries([instance.product_id])
+
+
+@receiver(post_save, sender=ProductVariant)
+def refresh_prices_on_variant_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or {'price', 'compare_at_price'} & set(update_fields):
+        refresh_variant_prices([instance.id])
+
+
+@receiver(exchange_rates_changed)
+def refresh_prices_on_exchange_rate_change(sender, base_currency, currencies, **kwargs):
+    if base_currency == settings.BASE_CURRENCY:
+        schedule_currency_price_refresh(currencies)
+
+
+@receiver(post_save, sender=ProductVariant)
+@receiver(post_delete, sender=ProductVariant)
+@receiver(post_save, sender=ProductTranslation)
+@receiver(post_delete, sender=ProductTranslation)
+def refresh_on_product_child_change(sender, instance, **kwargs):
+    schedule_product_listing_refresh([instance.product_id])
+    schedule_search_document_update([instance.product_id])
+    if sender is ProductTranslation:
+        schedule_autocomplete_update([instance.product_id])
+        touch_products([instance.product_id])
+
+
+@receiver(post_save, sender=ProductVariantTranslation)
+@receiver(post_delete, sender=ProductVariantTranslation)
+def touch_product_on_variant_translation_change(sender, instance, **kwargs):
+    touch_products(list(ProductVariant.objects.filter(id=instance.product_variant_id).values_list('product_id', flat=True)))
+
+
+@receiver(post_delete, sender=Product)
+def remove_search_document_on_product_delete(sender, instance, **kwargs):
+    schedule_search_document_update([instance.id])
+    schedule_autocomplete_update([instance.id])
+
+
+@receiver(post_save, sender='warehouse.Stock')
+@receiver(post_delete, sender='warehouse.Stock')
+def refresh_on_stock_change(sender, instance, **kwargs):
+    product_ids = list(ProductVariant.objects.filter(id=instance.product_variant_id).values_list('product_id', flat=True))
+    refresh_product_summaries(product_ids)
+    schedule_product_listing_refresh(product_ids)
+
+
+@receiver(post_save, sender=Category)
+def refresh_on_category_save(sender, instance, created, **kwargs):
+    if created:
+        return
+    product_ids = list(
+        Product.objects.filter(category__ancestor_links__ancestor=instance).values_list('id', flat=True)
+    )
+    schedule_product_listing_refresh(product_ids)
+    schedule_search_document_update(product_ids)
+
+
+@receiver(post_save, sender=Image)
+def refresh_on_image_save(sender, instance, created, **kwargs):
+    if created:
+        return
+    product_ids = products_using_image(instance)
+    refresh_product_thumbnails(product_ids)
+    touch_products(product_ids)
+    schedule_product_listing_refresh(product_ids)
+
+
+@receiver(pre_delete, sender=Image)
+def refresh_on_image_delete(sender, instance, **kwargs):
+    # The image is still linked here; refresh once the delete, which unlinks it, has committed
+    product_ids = products_using_image(instance)
+    if product_ids:
+        transaction.on_commit(lambda: refresh_product_thumbnails(product_ids))
+        touch_products(product_ids)
+        schedule_product_listing_refresh(product_ids)
+
+
+@receiver(m2m_changed, sender=Product.images.through)
+def refresh_on_product_images_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        instance._cleared_product_ids = set(Product.objects.filter(images=instance).values_list('id', flat=True))
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        product_ids = [instance.id]
+    elif pk_set:
+        product_ids = pk_set
+    else:
+        product_ids = getattr(instance, '_cleared_product_ids', set())
+    refresh_product_thumbnails(product_ids)
+    touch_products(product_ids)
+    if not reverse:
+        instance.refresh_from_db(fields=['primary_image', *THUMBNAIL_FIELDS])
+    schedule_product_listing_refresh(product_ids)
+
+
+@receiver(pre_delete, sender=Category)
+def detach_subcategories_on_category_delete(sender, instance, **kwargs):
+    # Subcategories become roots, Category.parent is SET_NULL
+    CategoryClosure.detach_children(instance)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=CategoryTranslation)
+@receiver(post_delete, sender=CategoryTranslation)
+def invalidate_category_tree_on_change(sender, **kwargs):
+    transaction.on_commit(invalidate_category_tree)
@@ -0,0 +1,157 @@
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from nxtbn.core import PublishableStatus
+from nxtbn.product.models import Product, ProductRecommendation
+
+
+# Weights of the signals combined into a recommendation score, each signal is normalized to 0..1.
+CO_PURCHASE_WEIGHT = 0.5
+NAME_SIMILARITY_WEIGHT = 0.3
+SAME_CATEGORY_WEIGHT = 0.2
+
+# Most recent published products of a category considered as candidates for each product.
+CATEGORY_CANDIDATE_LIMIT = 200
+
+
+def trigrams(value):
+    """Trigrams of every word, padded like PostgreSQL's pg_trgm so scores match `TrigramSimilarity`."""
+    result = set()
+    for word in (value or '').lower().split():
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def trigram_similarity(left, right):
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def _co_purchase_counts(product_ids):
+    """Returns `{product_id: Counter(other_product_id: orders bought together)}` over recent orders."""
+    from nxtbn.order import OrderStatus
+    from nxtbn.order.models import OrderLineItem
+
+    since = timezone.now() - timedelta(days=settings.PRODUCT_RECOMMENDATION_ORDER_DAYS)
+    orders = (
+        OrderLineItem.objects.filter(variant__product_id__in=product_ids, order__created_at__gte=since)
+        .exclude(order__status=OrderStatus.CANCELLED)
+        .values('order_id')
+    )
+    products_by_order = defaultdict(set)
+    for order_id, product_id in (
+        OrderLineItem.objects.filter(order_id__in=orders)
+        .values_list('order_id', 'variant__product_id')
+        .distinct()
+        .iterator()
+    ):
+        products_by_order[order_id].add(product_id)
+
+    wanted = set(product_ids)
+    counts = defaultdict(Counter)
+    for order_products in products_by_order.values():
+        for product_id in order_products & wanted:
+            counts[product_id].update(order_products - {product_id})
+    return counts
+
+
+def build_recommendations(product_ids, limit=None):
+    """
+    Computes the top `limit` recommendations of the given products from co-purchases, name
+    trigram similarity and a shared category. Only published products are recommended.
+    """
+    limit = limit or settings.PRODUCT_RECOMMENDATION_LIMIT
+    products = list(Product.objects.filter(id__in=product_ids).only('id', 'name', 'category_id'))
+
+    category_pool = defaultdict(list)
+    for candidate in (
+        Product.objects.filter(category_id__in={product.category_id for product in products}, status=PublishableStatus.PUBLISHED)
+        .order_by('-created_at')
+        .values('id', 'name', 'category_id')
+        .iterator()
+    ):
+        if len(category_pool[candidate['category_id']]) < CATEGORY_CANDIDATE_LIMIT:
+            category_pool[candidate['category_id']].append(candidate)
+
+    co_purchases = _co_purchase_counts([product.id for product in products])
+    bought_with = set().union(*co_purchases.values()) if co_purchases else set()
+    purchase_pool = {
+        candidate['id']: candidate
+        for candidate in Product.objects.filter(id__in=bought_with, status=PublishableStatus.PUBLISHED)
+        .values('id', 'name', 'category_id')
+    }
+
+    name_trigrams = {}
+
+    def get_trigrams(candidate):
+        if candidate['id'] not in name_trigrams:
+            name_trigrams[candidate['id']] = trigrams(candidate['name'])
+        return name_trigrams[candidate['id']]
+
+    recommendations = []
+    for product in products:
+        product_trigrams = trigrams(product.name)
+        purchases = co_purchases.get(product.id, Counter())
+        top_purchase_count = max(purchases.values(), default=0)
+
+        candidates = {candidate['id']: candidate for candidate in category_pool[product.category_id]}
+        candidates.update((pk, purchase_pool[pk]) for pk in purchases if pk in purchase_pool)
+        candidates.pop(product.id, None)
+
+        scored = []
+        for candidate in candidates.values():
+            score = NAME_SIMILARITY_WEIGHT * trigram_similarity(product_trigrams, get_trigrams(candidate))
+            if candidate['category_id'] == product.category_id:
+                score += SAME_CATEGORY_WEIGHT
+            if top_purchase_count:
+                score += CO_PURCHASE_WEIGHT * purchases.get(candidate['id'], 0) / top_purchase_count
+            scored.append((score, candidate['id']))
+
+        scored.sort(key=lambda item: (-item[0], -item[1]))
+        recommendations.extend(
+            ProductRecommendation(product_id=product.id, recommended_id=recommended_id, score=score, rank=rank)
+            for rank, (score, recommended_id) in enumerate(scored[:limit], start=1)
+        )
+    return recommendations
+
+
+def refresh_recommendations(product_ids, limit=None):
+    """Replaces the stored recommendations of the given products."""
+    recommendations = build_recommendations(product_ids, limit=limit)
+    with transaction.atomic():
+        ProductRecommendation.objects.filter(product_id__in=product_ids).delete()
+        ProductRecommendation.objects.bulk_create(recommendations)
+
+
+def rebuild_recommendations(chunk_size=500, limit=None):
+    """Rebuilds the recommendations of every product, `chunk_size` products at a time. Yields the size of each chunk."""
+    product_ids = list(Product.objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(product_ids), chunk_size):
+        chunk = product_ids[start:start + chunk_size]
+        refresh_recommendations(chunk, limit=limit)
+        yield len(chunk)
+
+
+def get_recommended_products(product, limit=None):
+    """
+    Returns the stored recommendations of `product` with one indexed query, falling back
+    to the newest published products of its category until the builder has run.
+    """
+    limit = limit or settings.PRODUCT_RECOMMENDATION_LIMIT
+    recommended = list(
+        Product.objects.filter(recommended_in__product=product, status=PublishableStatus.PUBLISHED) # unpublished since the build
+        .order_by('recommended_in__rank')[:limit]
+    )
+    if recommended:
+        return recommended
+    return (
+        Product.objects.filter(category_id=product.category_id, status=PublishableStatus.PUBLISHED)
+        .exclude(pk=product.pk)
+        .order_by('-created_at')[:limit]
+    )
@@ -0,0 +1,202 @@
+"""
+Bulk repricing of product variants.
+
+`adjust_prices` moves a money field of every matching variant by a percentage or a fixed
+amount with set-based `UPDATE`s, `apply_price_list` sets prices per SKU. Both validate the
+whole operation before writing: amounts must fit the precision of every currency involved
+and no resulting price may fall outside the field's range. Percentage changes are rounded
+to the precision of each variant's currency in SQL.
+
+Variants are updated in chunks of `chunk_size` ids, one transaction per chunk, and the
+price summary and listing rows of the affected products are refreshed with each chunk.
+With `dry_run` nothing is written and the result carries the first changes instead.
+"""
+import csv
+import io
+from decimal import Decimal, InvalidOperation
+
+from babel.numbers import get_currency_precision
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import DecimalField, F, Q, Value
+from django.db.models.functions import Round
+
+from nxtbn.core.graphql_cache import invalidate_storefront_graphql_cache
+from nxtbn.product.listing import schedule_product_listing_refresh
+from nxtbn.product.models import ProductVariant
+from nxtbn.product.page import touch_products
+from nxtbn.product.price_lists import refresh_variant_prices
+from nxtbn.product.summary import refresh_product_summaries
+
+
+PRICE_FIELDS = ['price', 'compare_at_price', 'cost_per_unit']
+
+MIN_PRICE = Decimal('0.01')
+MAX_PRICE = Decimal('999999999.999') # max_digits=12, decimal_places=3
+
+DRY_RUN_LIMIT = 100
+
+
+def filter_variants(queryset=None, category=None, product_type=None, collection=None):
+    """Variants of the products in `category` or any of its subcategories, of `product_type` and in `collection`."""
+    queryset = ProductVariant.objects.all() if queryset is None else queryset
+    if category is not None:
+        queryset = queryset.filter(product__category__ancestor_links__ancestor=category)
+    if product_type is not None:
+        queryset = queryset.filter(product__product_type=product_type)
+    if collection is not None:
+        queryset = queryset.filter(product__collections=collection)
+    return queryset
+
+
+def _decimal_places(amount):
+    return max(-amount.as_tuple().exponent, 0)
+
+
+def _check_precision(amount, currency, field):
+    if _decimal_places(amount) > get_currency_precision(currency):
+        raise ValidationError({field: f"{amount} has more decimal places than {currency} allows."})
+
+
+def _write_in_chunks(variant_ids, write, field, chunk_size):
+    """Runs `write(ids)` per chunk of `(id, product_id)`, refreshing the products whose prices moved."""
+    for start in range(0, len(variant_ids), chunk_size):
+        chunk = variant_ids[start:start + chunk_size]
+        product_ids = {product_id for _, product_id in chunk}
+        with transaction.atomic():
+            write([variant_id for variant_id, _ in chunk])
+            touch_products(product_ids) # cached product pages show every price field
+            if field in ('price', 'compare_at_price'):
+                refresh_variant_prices([variant_id for variant_id, _ in chunk])
+            if field == 'price':
+                refresh_product_summaries(product_ids)
+                schedule_product_listing_refresh(product_ids)
+    invalidate_storefront_graphql_cache(ProductVariant) # queryset.update() does not send post_save
+
+
+def adjust_prices(queryset, field='price', percentage=None, amount=None, dry_run=False, chunk_size=5000):
+    """
+    Changes `field` of the variants in `queryset` by `percentage` (eg. -15 for 15% off) or by a
+    fixed `amount` in each variant's currency. Returns `{'matched': n, 'changes': [...]}`,
+    the changes listed on dry runs only.
+    """
+    if field not in PRICE_FIELDS:
+        raise ValidationError({'field': f"Choose one of {', '.join(PRICE_FIELDS)}."})
+    if (percentage is None) == (amount is None):
+        raise ValidationError("Give either a percentage or an amount.")
+
+    queryset = queryset.filter(**{f'{field}__isnull': False}).order_by()
+    currencies = set(queryset.values_list('currency', flat=True).distinct())
+    output_field = DecimalField(max_digits=12, decimal_places=3)
+
+    if percentage is not None:
+        factor = Value(1 + Decimal(percentage) / 100, output_field=DecimalField(max_digits=20, decimal_places=10))
+        expressions = {
+            currency: Round(F(field) * factor, get_currency_precision(currency), output_field=output_field)
+            for currency in currencies
+        }
+    else:
+        amount = Decimal(amount)
+        for currency in currencies:
+            _check_precision(amount, currency, 'amount')
+        expressions = {currency: F(field) + Value(amount, output_field=output_field) for currency in currencies}
+
+    out_of_range = 0
+    for currency, expression in expressions.items():
+        out_of_range += (
+            queryset.filter(currency=currency).alias(new_value=expression)
+            .filter(Q(new_value__lt=MIN_PRICE) | Q(new_value__gt=MAX_PRICE))
+            .count()
+        )
+    if out_of_range:
+        raise ValidationError(f"{out_of_range} variants would get a {field} below {MIN_PRICE} or above {MAX_PRICE}.")
+
+    result = {'matched': queryset.count(), 'changes': []}
+    if dry_run:
+        for currency, expression in expressions.items():
+            rows = (
+                queryset.filter(currency=currency).annotate(new_value=expression).order_by('id')
+                .values_list('id', 'sku', 'currency', field, 'new_value')[:DRY_RUN_LIMIT - len(result['changes'])]
+            )
+            result['changes'].extend(
+                {'id': variant_id, 'sku': sku, 'currency': currency, 'field': field, 'old': old, 'new': new}
+                for variant_id, sku, currency, old, new in rows
+            )
+        return result
+
+    for currency, expression in expressions.items():
+        variant_ids = list(queryset.filter(currency=currency).order_by('id').values_list('id', 'product_id'))
+        _write_in_chunks(
+            variant_ids,
+            lambda ids, expression=expression: ProductVariant.objects.filter(id__in=ids).update(**{field: expression}),
+            field,
+            chunk_size,
+        )
+    return result
+
+
+def read_price_list(file):
+    """Reads a CSV price list with a `sku` column and any of the `PRICE_FIELDS`, returns `{sku: {field: amount}}`."""
+    prices, errors = {}, {}
+    for row_number, row in enumerate(csv.DictReader(io.TextIOWrapper(file, encoding='utf-8-sig', newline='')), start=1):
+        sku = (row.get('sku') or '').strip()
+        if not sku:
+            errors[row_number] = "sku is required."
+            continue
+        try:
+            prices[sku] = {
+                field: Decimal(row[field].strip())
+                for field in PRICE_FIELDS if (row.get(field) or '').strip()
+            }
+        except InvalidOperation:
+            errors[row_number] = "Prices must be decimal numbers."
+    if errors:
+        raise ValidationError({'file': [f"Row {row_number}: {message}" for row_number, message in sorted(errors.items())]})
+    return prices
+
+
+def apply_price_list(prices, queryset=None, dry_run=False, chunk_size=5000):
+    """
+    Sets the prices of `{sku: {field: amount}}` on the matching variants of `queryset`, with one
+    `UPDATE ... CASE` per chunk and field. Returns `{'matched': n, 'missing': [skus], 'changes': [...]}`.
+    """
+    queryset = ProductVariant.objects.all() if queryset is None else queryset
+    skus = list(prices)
+    variants = {}
+    for start in range(0, len(skus), chunk_size):
+        for variant in queryset.filter(sku__in=skus[start:start + chunk_size]).only('id', 'sku', 'product_id', 'currency', *PRICE_FIELDS):
+            variants[variant.sku] = variant
+
+    errors = []
+    for sku, variant in variants.items():
+        for field, amount in prices[sku].items():
+            if not MIN_PRICE <= amount <= MAX_PRICE:
+                errors.append(f"{sku}: {field} must be between {MIN_PRICE} and {MAX_PRICE}.")
+            elif _decimal_places(amount) > get_currency_precision(variant.currency):
+                errors.append(f"{sku}: {amount} has more decimal places than {variant.currency} allows.")
+    if errors:
+        raise ValidationError(errors)
+
+    changed = {field: [] for field in PRICE_FIELDS}
+    changes = []
+    for sku, variant in sorted(variants.items(), key=lambda item: item[1].id):
+        for field, amount in prices[sku].items():
+            if getattr(variant, field) != amount:
+                changes.append({'id': variant.id, 'sku': sku, 'currency': variant.currency, 'field': field, 'old': getattr(variant, field), 'new': amount})
+                setattr(variant, field, amount)
+                changed[field].append(variant)
+
+    result = {'matched': len(variants), 'missing': sorted(set(prices) - set(variants)), 'changes': []}
+    if dry_run:
+        result['changes'] = changes[:DRY_RUN_LIMIT]
+        return result
+
+    for field, field_variants in changed.items():
+        by_id = {variant.id: variant for variant in field_variants}
+        _write_in_chunks(
+            [(variant.id, variant.product_id) for variant in field_variants],
+            lambda ids, field=field: ProductVariant.objects.bulk_update([by_id[variant_id] for variant_id in ids], [field]),
+            field,
+            chunk_size,
+        )
+    return result
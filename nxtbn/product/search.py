@@ -0,0 +1,220 @@
+"""
+Full-text product search.
+
+On PostgreSQL every product keeps a weighted `search_vector` (name, summary, description,
+variant names/SKUs, category and every translation, each stemmed with its own language's
+text search configuration) behind a GIN index, and searches are ranked with `ts_rank`.
+
+On SQLite, used for development and tests, the same documents are stored in the
+`product_search_fts` FTS5 virtual table and ranked with `bm25`. Other databases fall back
+to `icontains` lookups.
+"""
+import json
+import re
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.html import strip_tags
+from django.utils.translation import get_language
+
+from nxtbn.core.batching import OnCommitBatch
+from nxtbn.product.models import Product
+from nxtbn.product.utils import json_to_html
+
+
+FTS_TABLE = 'product_search_fts'
+
+# PostgreSQL text search configurations by language prefix, `simple` disables stemming.
+SEARCH_CONFIGS = {
+    'ar': 'arabic',
+    'da': 'danish',
+    'de': 'german',
+    'en': 'english',
+    'es': 'spanish',
+    'fi': 'finnish',
+    'fr': 'french',
+    'hi': 'hindi',
+    'hu': 'hungarian',
+    'id': 'indonesian',
+    'it': 'italian',
+    'nl': 'dutch',
+    'no': 'norwegian',
+    'pt': 'portuguese',
+    'ro': 'romanian',
+    'ru': 'russian',
+    'sv': 'swedish',
+    'tr': 'turkish',
+}
+
+
+def get_search_config(language_code=None):
+    language_code = (language_code or get_language() or settings.LANGUAGE_CODE).lower()
+    return SEARCH_CONFIGS.get(language_code.split('-')[0], 'simple')
+
+
+def _description_text(description):
+    try:
+        data = json.loads(description)
+    except (TypeError, ValueError):
+        return description or ''
+    if not isinstance(data, list):
+        return description if data is not None else ''
+    return strip_tags(json_to_html(description))
+
+
+def build_search_documents(product_ids):
+    """
+    Returns `{product_id: [(language_code, name, summary, body), ...]}`, one document for
+    `settings.LANGUAGE_CODE` and one per translation.
+    """
+    products = (
+        Product.objects.filter(id__in=product_ids)
+        .select_related('category')
+        .prefetch_related('translations', 'variants')
+    )
+    documents = {}
+    for product in products:
+        variant_text = ' '.join(
+            filter(None, [value for variant in product.variants.all() for value in (variant.name, variant.sku)])
+        )
+        shared = ' '.join(filter(None, [product.brand, product.category.name, variant_text]))
+        documents[product.id] = [(
+            settings.LANGUAGE_CODE,
+            product.name,
+            f"{product.summary} {shared}",
+            _description_text(product.description),
+        )]
+        for translation in product.translations.all():
+            documents[product.id].append((
+                translation.language_code,
+                translation.name,
+                f"{translation.summary} {shared}",
+                _description_text(translation.description),
+            ))
+    return documents
+
+
+_fts_databases = set()
+
+
+def _fts5_available(connection):
+    """Whether the FTS5 table exists; only positive answers are remembered so it is picked up right after migrating."""
+    key = (connection.alias, connection.settings_dict['NAME'])
+    if key not in _fts_databases and FTS_TABLE in connection.introspection.table_names():
+        _fts_databases.add(key)
+    return key in _fts_databases
+
+
+def update_search_documents(product_ids):
+    """Rebuilds the search documents of the given products."""
+    product_ids = list(set(product_ids))
+    if not product_ids:
+        return
+
+    connection = connections[Product.objects.db]
+    documents = build_search_documents(product_ids)
+
+    if connection.vendor == 'postgresql':
+        products = []
+        for product_id, product_documents in documents.items():
+            vector = None
+            for language_code, name, summary, body in product_documents:
+                config = get_search_config(language_code)
+                document_vector = (
+                    SearchVector(Value(name), weight='A', config=config)
+                    + SearchVector(Value(summary), weight='B', config=config)
+                    + SearchVector(Value(body), weight='C', config=config)
+                )
+                vector = document_vector if vector is None else vector + document_vector
+            products.append(Product(id=product_id, search_vector=vector))
+        # One UPDATE ... SET search_vector = CASE id WHEN ... for the whole chunk
+        Product.objects.bulk_update(products, ['search_vector'])
+
+    elif connection.vendor == 'sqlite' and _fts5_available(connection):
+        placeholders = ', '.join(['%s'] * len(product_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE product_id IN ({placeholders})", product_ids)
+            rows = [
+                (product_id, *document)
+                for product_id, product_documents in documents.items()
+                for document in product_documents
+            ]
+            for start in range(0, len(rows), 100): # stay below SQLite's bound parameter limit
+                chunk = rows[start:start + 100]
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE} (product_id, language_code, name, summary, body) VALUES "
+                    + ', '.join(['(%s, %s, %s, %s, %s)'] * len(chunk)),
+                    [value for row in chunk for value in row],
+                )
+
+
+def rebuild_search_documents(chunk_size=500):
+    """Rebuilds every search document, `chunk_size` products at a time. Yields the size of each chunk."""
+    product_ids = list(Product.objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(product_ids), chunk_size):
+        chunk = product_ids[start:start + chunk_size]
+        update_search_documents(chunk)
+        yield len(chunk)
+
+
+_update_batch = OnCommitBatch(update_search_documents)
+
+
+def schedule_search_document_update(product_ids):
+    """Queues the products for a search document update once the current transaction commits."""
+    _update_batch.add(product_ids)
+
+
+def _fts5_query(value):
+    """Quotes every term so user input can never be parsed as FTS5 query syntax; the last term matches as a prefix."""
+    terms = re.findall(r'\w+', value)
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def search_products(queryset, value, language_code=None):
+    """
+    Filters a Product queryset by full-text `value` and annotates it with `search_rank`,
+    higher is more relevant. The queryset is ordered by rank unless `order_by()` is called again.
+    """
+    value = (value or '').strip()
+    if not value:
+        return queryset
+
+    connection = connections[queryset.db]
+
+    if connection.vendor == 'postgresql':
+        query = SearchQuery(value, config=get_search_config(language_code), search_type='websearch')
+        return (
+            queryset.filter(search_vector=query)
+            .annotate(search_rank=SearchRank(F('search_vector'), query))
+            .order_by('-search_rank', '-pk')
+        )
+
+    if connection.vendor == 'sqlite' and _fts5_available(connection):
+        match = _fts5_query(value)
+        if match is None:
+            return queryset.none()
+        table = Product._meta.db_table
+        return (
+            queryset.filter(id__in=RawSQL(f"SELECT product_id FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (match,)))
+            .annotate(
+                search_rank=RawSQL(
+                    f"SELECT -bm25({FTS_TABLE}, 0, 0, 10.0, 4.0, 1.0) AS score FROM {FTS_TABLE} "
+                    f"WHERE {FTS_TABLE} MATCH %s AND {FTS_TABLE}.product_id = {table}.id "
+                    f"ORDER BY score DESC LIMIT 1",
+                    (match,),
+                    output_field=FloatField(),
+                )
+            )
+            .order_by('-search_rank', '-pk')
+        )
+
+    lookup = Q(name__icontains=value) | Q(description__icontains=value) | Q(alias__icontains=value)
+    return queryset.filter(lookup).annotate(search_rank=Value(0.0, output_field=FloatField()))
@@ -1,6 +1,9 @@
 import django_filters as filters
-from nxtbn.product.models import Category, Collection, Product, ProductTag, ProductVariant, Supplier
-from django.db.models import Q
+from django.conf import settings
+
+from nxtbn.core.utils import to_currency_subunit
+from nxtbn.product.models import Category, Collection, Product, ProductTag, ProductType, ProductVariant, Supplier
+from nxtbn.product.search import search_products
 
 
 class ProductFilter(filters.FilterSet):
@@ -10,21 +13,32 @@ class ProductFilter(filters.FilterSet):
     description = filters.CharFilter(lookup_expr='icontains')
     category = filters.ModelChoiceFilter(field_name='category', queryset=Category.objects.all())
     category_name = filters.CharFilter(field_name='category__name', lookup_expr='icontains')
+    category_tree = filters.ModelChoiceFilter(field_name='category__ancestor_links__ancestor', queryset=Category.objects.all(), label='Category including its subcategories')
     supplier = filters.ModelChoiceFilter(field_name='supplier', queryset=Supplier.objects.all())
     brand = filters.CharFilter(lookup_expr='icontains')
     related_to = filters.CharFilter(field_name='related_to__name', lookup_expr='icontains')
     collection = filters.ModelChoiceFilter(field_name='collections', queryset=Collection.objects.all())
+    min_price = filters.NumberFilter(method='filter_min_price', label='Cheapest variant price from, in base currency')
+    max_price = filters.NumberFilter(method='filter_max_price', label='Cheapest variant price below, in base currency')
+    product_type = filters.ModelChoiceFilter(field_name='product_type', queryset=ProductType.objects.all())
+    in_stock = filters.BooleanFilter(field_name='in_stock')
+    ordering = filters.OrderingFilter(fields=(('name', 'name'), ('created_at', 'created_at'), ('min_price_subunit', 'price')))
 
     class Meta:
         model = Product
-        fields = ('name', 'summary', 'description', 'category', 'category_name', 'supplier', 'brand','related_to', 'search', 'collection')
+        fields = ('name', 'summary', 'description', 'category', 'category_name', 'category_tree', 'supplier', 'brand','related_to', 'search', 'collection', 'min_price', 'max_price', 'product_type', 'in_stock', 'ordering')
+
+    def filter_min_price(self, queryset, name, value):
+        return queryset.filter(min_price_subunit__gte=to_currency_subunit(value, settings.BASE_CURRENCY))
+
+    def filter_max_price(self, queryset, name, value):
+        return queryset.filter(min_price_subunit__lt=to_currency_subunit(value, settings.BASE_CURRENCY))
 
     def filter_search(self, queryset, name, value):
         """
-        Custom search method to search across multiple fields: name, description, and alias.
+        Full-text search across names, descriptions, variants and translations, ordered by relevance.
         """
-        lookup = Q(name__icontains=value) | Q(description__icontains=value) | Q(alias__icontains=value)
-        return queryset.filter(lookup)
+        return search_products(queryset, value)
     
 
 
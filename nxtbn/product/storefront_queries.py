@@ -1,4 +1,5 @@
 from django.conf import settings
+from django.db.models import Prefetch
 import graphene
 from nxtbn.cart.utils import get_or_create_cart
 from nxtbn.core import PublishableStatus
@@ -15,20 +16,31 @@ from nxtbn.product.storefront_types import (
     TaxClassType,
 )
 from nxtbn.product.models import Product, Image, Category, ProductVariant, Supplier, ProductType, Collection, ProductTag, TaxClass
-from graphene_django.filter import DjangoFilterConnectionField
+from nxtbn.core.graphql_connection import NxtbnFilterConnectionField
 from nxtbn.core.currency.backend import currency_Backend
+from nxtbn.product.price_lists import prefetch_listed_prices
+
+
+def _with_listed_prices(queryset, currency):
+    """Loads the prices of the variants and default variant in `currency` with the products, see `ProductVariantType.resolve_price`."""
+    if not settings.IS_MULTI_CURRENCY:
+        return queryset
+    return queryset.select_related('default_variant').prefetch_related(
+        Prefetch('variants', queryset=ProductVariant.objects.prefetch_related(prefetch_listed_prices(currency))),
+        prefetch_listed_prices(currency, 'default_variant__prices'),
+    )
 
 
 
 class ProductQuery(graphene.ObjectType):
     product = graphene.Field(ProductGraphType, slug=graphene.String())
-    products = DjangoFilterConnectionField(ProductGraphType)
+    products = NxtbnFilterConnectionField(ProductGraphType)
 
-    categories = DjangoFilterConnectionField(CategoryType)
-    categories_hierarchical = DjangoFilterConnectionField(CategoryHierarchicalType)
+    categories = NxtbnFilterConnectionField(CategoryType)
+    categories_hierarchical = NxtbnFilterConnectionField(CategoryHierarchicalType)
 
-    collections = DjangoFilterConnectionField(CollectionType)
-    tags = DjangoFilterConnectionField(ProductTagType)
+    collections = NxtbnFilterConnectionField(CollectionType)
+    tags = NxtbnFilterConnectionField(ProductTagType)
 
     def resolve_product(root, info, slug):
         exchange_rate = 1.0
@@ -38,7 +50,7 @@ class ProductQuery(graphene.ObjectType):
         info.context.exchange_rate = exchange_rate
         
         try:
-            return Product.objects.get(slug=slug)
+            return _with_listed_prices(Product.objects.all(), info.context.currency).get(slug=slug)
         except Product.DoesNotExist:
             return None
 
@@ -49,7 +61,7 @@ class ProductQuery(graphene.ObjectType):
         
         info.context.exchange_rate = exchange_rate
 
-        return Product.objects.filter(status=PublishableStatus.PUBLISHED).order_by('-created_at')
+        return _with_listed_prices(Product.objects.filter(status=PublishableStatus.PUBLISHED), info.context.currency).order_by('-created_at')
     
     def resolve_categories_hierarchical(root, info, **kwargs):
         return Category.objects.filter(parent=None)
\ No newline at end of file
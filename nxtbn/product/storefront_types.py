@@ -2,10 +2,15 @@ from django.conf import settings
 import graphene
 from graphene_django import DjangoObjectType
 from graphene import relay
+from graphene.types.generic import GenericScalar
 from nxtbn.core.utils import apply_exchange_rate
+from nxtbn.product.category_tree import get_request_category_tree
+from nxtbn.product.facets import compute_product_facets
+from nxtbn.product.price_lists import variant_listed_price
 from nxtbn.product.storefront_filters import ProductFilter, CategoryFilter, CollectionFilter, ProductTagsFilter
 from nxtbn.product.models import Product, Image, Category, ProductVariant, Supplier, ProductType, Collection, ProductTag, TaxClass
 from django.utils.translation import get_language
+from nxtbn.core.graphql_connection import NxtbnConnection
 
 
 class ImageType(DjangoObjectType):
@@ -56,6 +61,7 @@ class CategoryType(DjangoObjectType):
         model = Category
         fields = ("id", )
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filterset_class = CategoryFilter
 
 
@@ -72,7 +78,7 @@ class CategoryHierarchicalType(DjangoObjectType):
     def resolve_name(self, info):
         if settings.USE_I18N:
             if settings.LANGUAGE_CODE != get_language():
-                translation_obj = self.translations.filter(language_code=get_language()).first()
+                translation_obj = get_request_category_tree(info.context).translation(self.id, get_language())
                 if translation_obj:
                     return translation_obj.name
         return self.name
@@ -80,7 +86,7 @@ class CategoryHierarchicalType(DjangoObjectType):
     def resolve_description(self, info):
         if settings.USE_I18N:
             if settings.LANGUAGE_CODE != get_language():
-                translation_obj = self.translations.filter(language_code=get_language()).first()
+                translation_obj = get_request_category_tree(info.context).translation(self.id, get_language())
                 if translation_obj:
                     return translation_obj.description
         return self.description
@@ -88,7 +94,7 @@ class CategoryHierarchicalType(DjangoObjectType):
     def resolve_meta_title(self, info):
         if settings.USE_I18N:
             if settings.LANGUAGE_CODE != get_language():
-                translation_obj = self.translations.filter(language_code=get_language()).first()
+                translation_obj = get_request_category_tree(info.context).translation(self.id, get_language())
                 if translation_obj:
                     return translation_obj.meta_title
         return self.meta_title
@@ -96,19 +102,20 @@ class CategoryHierarchicalType(DjangoObjectType):
     def resolve_meta_description(self, info):
         if settings.USE_I18N:
             if settings.LANGUAGE_CODE != get_language():
-                translation_obj = self.translations.filter(language_code=get_language()).first()
+                translation_obj = get_request_category_tree(info.context).translation(self.id, get_language())
                 if translation_obj:
                     return translation_obj.meta_description
         return self.meta_description
     
     def resolve_children(self, info):
         # Return all subcategories of the current category
-        return self.subcategories.all()
+        return get_request_category_tree(info.context).children(self.id)
     
     class Meta:
         model = Category
         fields = ("id", "children",)
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filterset_class = CategoryFilter
 
 class SupplierType(DjangoObjectType):
@@ -144,6 +151,7 @@ class CollectionType(DjangoObjectType):
         model = Collection
         fields = ("id",)
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filterset_class = CollectionFilter
 
 class ProductTagType(DjangoObjectType):
@@ -160,6 +168,7 @@ class ProductTagType(DjangoObjectType):
         model = ProductTag
         fields = ("id",)
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filterset_class = ProductTagsFilter
 
 class TaxClassType(DjangoObjectType):
@@ -179,8 +188,7 @@ class ProductVariantType(DjangoObjectType):
         
         target_currency = info.context.currency
         exchange_rate = info.context.exchange_rate
-        converted_price = apply_exchange_rate(self.price, exchange_rate, target_currency, 'en_US')
-        return converted_price
+        return variant_listed_price(self, exchange_rate) or apply_exchange_rate(self.price, exchange_rate, target_currency, 'en_US')
     
     def resolve_price_without_symbol(self, info): # without currency symbol
         target_currency = info.context.currency
@@ -199,6 +207,16 @@ class ProductVariantType(DjangoObjectType):
         )
 
 
+class ProductConnection(NxtbnConnection):
+    facets = GenericScalar(description="Counts per category, collection, product type, price bucket and stock status of the filtered products.")
+
+    class Meta:
+        abstract = True
+
+    def resolve_facets(self, info):
+        return compute_product_facets(self.iterable)
+
+
 class ProductGraphType(DjangoObjectType):
     name = graphene.String()
     summary = graphene.String()
@@ -258,8 +276,8 @@ class ProductGraphType(DjangoObjectType):
             else:
                 target_currency = info.context.currency
                 exchange_rate = info.context.exchange_rate
-                converted_price = apply_exchange_rate(self.default_variant.price, exchange_rate, target_currency, 'en_US')
-                return converted_price
+                listed = variant_listed_price(self.default_variant, exchange_rate)
+                return listed or apply_exchange_rate(self.default_variant.price, exchange_rate, target_currency, 'en_US')
         return None
     
 
@@ -280,4 +298,5 @@ class ProductGraphType(DjangoObjectType):
             "default_variant",
         )
         interfaces = (relay.Node,)
+        connection_class = ProductConnection
         filterset_class = ProductFilter
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""
+Materialized price range and stock summary of products.
+
+`Product.min_price_subunit`/`max_price_subunit` hold the variant price range in
+BASE_CURRENCY subunits, `total_available_stock` the unreserved quantity over every
+variant and warehouse and `in_stock` whether any variant can be sold. They are
+recomputed whenever a variant or a stock row changes, inside the same transaction,
+bumping the product's `last_modified`.
+"""
+from django.conf import settings
+from django.db.models import F, Max, Min, Q, Sum
+from django.utils import timezone
+
+from nxtbn.core.utils import to_currency_subunit
+from nxtbn.product.models import Product, ProductVariant
+
+
+SUMMARY_FIELDS = ['min_price_subunit', 'max_price_subunit', 'total_available_stock', 'in_stock']
+
+
+def build_product_summaries(product_ids):
+    """Returns unsaved `Product` instances carrying only the pk and the summary fields, computed with three queries."""
+    from nxtbn.warehouse.models import Stock
+
+    product_ids = set(product_ids)
+    price_ranges = {
+        row['product_id']: row
+        for row in ProductVariant.objects.filter(product_id__in=product_ids)
+        .values('product_id')
+        .annotate(min_price=Min('price'), max_price=Max('price'))
+        .order_by()
+    }
+    available_stock = dict(
+        Stock.objects.filter(product_variant__product_id__in=product_ids)
+        .values('product_variant__product_id')
+        .annotate(available=Sum(F('quantity') - F('reserved')))
+        .values_list('product_variant__product_id', 'available')
+        .order_by()
+    )
+    always_sellable = set(
+        ProductVariant.objects.filter(product_id__in=product_ids)
+        .filter(Q(track_inventory=False) | Q(allow_backorder=True))
+        .values_list('product_id', flat=True)
+    )
+
+    currency = settings.BASE_CURRENCY
+    summaries = []
+    for product_id in product_ids:
+        price_range = price_ranges.get(product_id)
+        available = max(available_stock.get(product_id) or 0, 0)
+        summaries.append(Product(
+            pk=product_id,
+            min_price_subunit=to_currency_subunit(price_range['min_price'], currency) if price_range else None,
+            max_price_subunit=to_currency_subunit(price_range['max_price'], currency) if price_range else None,
+            total_available_stock=available,
+            in_stock=product_id in always_sellable or available > 0,
+        ))
+    return summaries
+
+
+def refresh_product_summaries(product_ids):
+    """Recomputes the summary columns of the given products, without sending `post_save`."""
+    summaries = build_product_summaries(product_ids)
+    now = timezone.now()
+    for summary in summaries:
+        summary.last_modified = now
+    Product.objects.bulk_update(summaries, [*SUMMARY_FIELDS, 'last_modified'], batch_size=500)
+
+
+def rebuild_product_summaries(chunk_size=500):
+    """Recomputes the summaries of every product, `chunk_size` products at a time. Yields the size of each chunk."""
+    product_ids = list(Product.objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(product_ids), chunk_size):
+        chunk = product_ids[start:start + chunk_size]
+        refresh_product_summaries(chunk)
+        yield len(chunk)
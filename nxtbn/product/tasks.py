@@ -0,0 +1,32 @@
+from celery import shared_task
+
+from nxtbn.product import ImportJobStatus
+from nxtbn.product.importer import fail_import_job, run_import_job
+from nxtbn.product.models import ProductImportJob
+from nxtbn.product.price_lists import refresh_currency_prices
+from nxtbn.product.recommendations import rebuild_recommendations
+
+
+@shared_task
+def build_product_recommendations():
+    for _ in rebuild_recommendations():
+        pass
+
+
+@shared_task(acks_late=True)
+def import_products(job_id):
+    """Runs a bulk product import. Redelivered or re-queued jobs continue after their last committed chunk."""
+    job = ProductImportJob.objects.get(pk=job_id)
+    if job.status == ImportJobStatus.COMPLETED:
+        return
+    try:
+        run_import_job(job)
+    except Exception as e:
+        fail_import_job(job, str(e))
+        raise
+
+
+@shared_task
+def refresh_variant_prices_in_currencies(currencies):
+    for _ in refresh_currency_prices(currencies):
+        pass
@@ -0,0 +1,93 @@
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from nxtbn.product.category_tree import get_category_tree
+from nxtbn.product.models import Category, CategoryClosure, Product
+from nxtbn.product.storefront_filters import ProductFilter
+from nxtbn.product.tests import CategoryFactory, ProductFactory
+
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "default"},
+    "generic": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "generic"},
+}
+
+
+class CategoryClosureTest(TestCase):
+
+    def setUp(self):
+        self.men = CategoryFactory(name="Men")
+        self.women = CategoryFactory(name="Women")
+        self.clothing = CategoryFactory(name="Clothing", parent=self.men)
+        self.shirts = CategoryFactory(name="Shirts", parent=self.clothing)
+
+    def test_ancestors_descendants_and_family_tree(self):
+        self.assertEqual(list(self.shirts.get_ancestors()), [self.men, self.clothing])
+        self.assertEqual(set(self.men.get_descendants()), {self.clothing, self.shirts})
+        self.assertEqual(
+            self.shirts.get_family_tree(),
+            [{'depth': 2, 'name': "Men"}, {'depth': 1, 'name': "Clothing"}, {'depth': 0, 'name': "Shirts"}],
+        )
+
+    def test_move_subtree(self):
+        self.clothing.parent = self.women
+        self.clothing.save()
+
+        self.assertEqual(list(self.shirts.get_ancestors()), [self.women, self.clothing])
+        self.assertFalse(self.men.get_descendants().exists())
+
+    def test_deferred_parent_costs_no_query_per_row(self):
+        with self.assertNumQueries(1):
+            names = [category.name for category in Category.objects.only('name')]
+        self.assertEqual(len(names), 4)
+
+        moved = Category.objects.only('name').get(pk=self.clothing.pk)
+        moved.parent = self.women
+        moved.save()
+        self.assertEqual(list(self.shirts.get_ancestors()), [self.women, self.clothing])
+
+    def test_rejects_cycles_and_depth_overflow(self):
+        self.men.parent = self.shirts
+        with self.assertRaises(ValidationError):
+            self.men.save()
+
+        with self.assertRaises(ValidationError):
+            CategoryFactory(name="Linen", parent=self.shirts)
+
+        moved = Category.objects.get(pk=self.clothing.pk)
+        moved.parent = self.women
+        moved.save()
+        with self.assertRaises(ValidationError):
+            self.women.parent = CategoryFactory(name="Root")
+            self.women.save()
+
+    def test_delete_turns_children_into_roots(self):
+        self.men.delete()
+        self.assertEqual(list(Category.objects.get(pk=self.shirts.pk).get_ancestors()), [Category.objects.get(pk=self.clothing.pk)])
+        self.assertFalse(CategoryClosure.objects.filter(descendant=self.clothing, depth__gt=0).exists())
+
+    def test_filter_products_in_category_tree(self):
+        shirt = ProductFactory(category=self.shirts)
+        coat = ProductFactory(category=self.clothing)
+        ProductFactory(category=self.women)
+
+        filterset = ProductFilter(data={'category_tree': self.men.pk}, queryset=Product.objects.all())
+        self.assertEqual(set(filterset.qs), {shirt, coat})
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_tree_is_cached_until_a_category_changes(self):
+        caches['generic'].clear()
+        tree = get_category_tree()
+        self.assertEqual(tree.roots, [self.men, self.women])
+        self.assertEqual(tree.children(self.clothing.pk), [self.shirts])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertIs(get_category_tree(), tree)
+        self.assertEqual(len(queries), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            CategoryFactory(name="Kids")
+        self.assertEqual(len(get_category_tree().roots), 3)
@@ -0,0 +1,95 @@
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.reverse import reverse
+
+from nxtbn.core import PublishableStatus
+from nxtbn.product import autocomplete
+from nxtbn.product.autocomplete import autocomplete_products
+from nxtbn.product.models import ProductTranslation
+from nxtbn.product.tests import ProductFactory
+
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "default"},
+    "generic": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "generic"},
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES, LANGUAGE_CODE='en')
+class ProductAutocompleteTest(TestCase):
+
+    def setUp(self):
+        caches['generic'].clear()
+        autocomplete._local_index.update(generation=None, version=None, index=None, pending=set())
+
+        self.linen = ProductFactory(name="Linen Shirt", status=PublishableStatus.PUBLISHED)
+        self.shirt = ProductFactory(name="Shirt", status=PublishableStatus.PUBLISHED)
+        self.shoe = ProductFactory(name="Café Shoes", status=PublishableStatus.PUBLISHED)
+        ProductFactory(name="Shirt Draft", status=PublishableStatus.DRAFT)
+
+    def test_matches_word_prefixes_of_published_products(self):
+        self.assertEqual(
+            [match['slug'] for match in autocomplete_products("SHI", 'en')],
+            [self.shirt.slug, self.linen.slug],
+        )
+        self.assertEqual(autocomplete_products("cafe", 'en'), [{'slug': self.shoe.slug, 'name': "Café Shoes"}])
+        self.assertEqual(autocomplete_products("shi", 'en', limit=1), [{'slug': self.shirt.slug, 'name': "Shirt"}])
+
+    def test_lookups_skip_the_database(self):
+        autocomplete_products("lin", 'en')
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(len(autocomplete_products("lin", 'en')), 1)
+        self.assertEqual(len(queries), 0)
+
+    def test_translations_fall_back_to_default_language(self):
+        ProductTranslation.objects.create(
+            product=self.linen, language_code='fr', name="Chemise en lin", summary="", description="",
+        )
+        self.assertEqual(
+            [match['name'] for match in autocomplete_products("ch", 'fr')],
+            ["Chemise en lin"],
+        )
+        self.assertEqual(
+            [match['name'] for match in autocomplete_products("shi", 'fr')],
+            ["Shirt", "Chemise en lin"],
+        )
+
+    def test_index_is_updated_incrementally_on_save(self):
+        autocomplete_products("lin", 'en')
+        index = autocomplete._local_index['index']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.linen.name = "Silk Shirt"
+            self.linen.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            ProductFactory(name="Linen Trousers", status=PublishableStatus.PUBLISHED)
+
+        self.assertEqual([match['name'] for match in autocomplete_products("lin", 'en')], ["Linen Trousers"])
+        self.assertEqual([match['name'] for match in autocomplete_products("sil", 'en')], ["Silk Shirt"])
+        self.assertIs(autocomplete._local_index['index'], index)
+
+    def test_endpoint(self):
+        response = self.client.get(reverse('product-autocomplete'), {'q': "linen"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, [{'slug': self.linen.slug, 'name': "Linen Shirt"}])
+
+
+class ProductAutocompleteWithoutSharedCacheTest(TestCase):
+
+    def setUp(self):
+        autocomplete._local_index.update(generation=None, version=None, index=None, pending=set())
+        self.linen = ProductFactory(name="Linen Shirt", status=PublishableStatus.PUBLISHED)
+
+    def test_index_is_kept_and_updated_in_process(self):
+        autocomplete_products("lin", 'en')
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(len(autocomplete_products("lin", 'en')), 1)
+        self.assertEqual(len(queries), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.linen.name = "Silk Shirt"
+            self.linen.save()
+        self.assertEqual([match['name'] for match in autocomplete_products("sil", 'en')], ["Silk Shirt"])
+        self.assertEqual(autocomplete_products("lin", 'en'), [])
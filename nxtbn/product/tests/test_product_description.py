@@ -0,0 +1,46 @@
+import json
+from unittest import mock
+
+from django.test import TestCase
+
+from nxtbn.product.models import Product, ProductTranslation
+from nxtbn.product.tests import ProductFactory
+
+
+def editor_json(text):
+    return json.dumps([{"type": "paragraph", "children": [{"text": text, "bold": True}]}])
+
+
+class RenderedDescriptionTest(TestCase):
+
+    def setUp(self):
+        self.product = ProductFactory(description=editor_json("Soft linen"))
+
+    def test_description_is_rendered_on_save(self):
+        self.assertEqual(self.product.rendered_description, "<p><b>Soft linen</b></p>")
+
+        self.product.description = editor_json("Washed linen")
+        self.product.save(update_fields=['description'])
+        self.assertEqual(Product.objects.get(pk=self.product.pk).rendered_description, "<p><b>Washed linen</b></p>")
+
+    def test_reads_do_not_render(self):
+        translation = ProductTranslation.objects.create(
+            product=self.product, language_code='fr', name="Chemise", summary="", description=editor_json("Lin doux"),
+        )
+        product = Product.objects.get(pk=self.product.pk)
+        translation = ProductTranslation.objects.get(pk=translation.pk)
+
+        with mock.patch('nxtbn.product.models.json_to_html') as json_to_html:
+            self.assertEqual(product.description_html(), "<p><b>Soft linen</b></p>")
+            self.assertEqual(translation.description_html(), "<p><b>Lin doux</b></p>")
+        json_to_html.assert_not_called()
+
+    def test_rows_updated_without_save_are_rendered_on_read(self):
+        Product.objects.filter(pk=self.product.pk).update(description=editor_json("Raw"), rendered_description='')
+        self.assertEqual(Product.objects.get(pk=self.product.pk).description_html(), "<p><b>Raw</b></p>")
+
+    def test_json_that_is_not_a_document_renders_empty(self):
+        for description in ("100", "null"):
+            self.product.description = description
+            self.product.save(update_fields=['description'])
+            self.assertEqual(Product.objects.get(pk=self.product.pk).rendered_description, "")
@@ -0,0 +1,80 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from nxtbn.product.facets import compute_product_facets
+from nxtbn.product.models import Product
+from nxtbn.product.storefront_filters import ProductFilter
+from nxtbn.product.tests import CategoryFactory, CollectionFactory, ProductFactory, ProductTypeFactory, ProductVariantFactory
+from nxtbn.warehouse.models import Stock, Warehouse
+
+
+@override_settings(PRODUCT_FACET_PRICE_BUCKETS=[50, 100])
+class ProductFacetTest(TestCase):
+
+    def setUp(self):
+        self.shirts = CategoryFactory(name="Shirts")
+        self.bags = CategoryFactory(name="Bags")
+        self.apparel = ProductTypeFactory(name="Apparel")
+        self.summer = CollectionFactory(name="Summer")
+        warehouse = Warehouse.objects.create(name="Main", location="Dhaka")
+
+        self.cheap_shirt = self._product(self.shirts, Decimal('20.00'), stock=5, warehouse=warehouse)
+        self.shirt = self._product(self.shirts, Decimal('75.00'), stock=0, warehouse=warehouse)
+        self.bag = self._product(self.bags, Decimal('150.00'), stock=2, warehouse=warehouse)
+        self.cheap_shirt.collections.add(self.summer)
+        self.bag.collections.add(self.summer)
+
+    def _product(self, category, price, stock, warehouse):
+        product = ProductFactory(category=category, product_type=self.apparel)
+        variant = ProductVariantFactory(product=product, price=price, track_inventory=True, allow_backorder=False)
+        Stock.objects.create(warehouse=warehouse, product_variant=variant, quantity=stock)
+        product.default_variant = variant
+        product.save()
+        return product
+
+    def test_counts_every_facet_in_two_queries(self):
+        queryset = Product.objects.filter(pk__in=[self.cheap_shirt.pk, self.shirt.pk, self.bag.pk])
+
+        with CaptureQueriesContext(connection) as queries:
+            facets = compute_product_facets(queryset)
+        self.assertEqual(len([query for query in queries.captured_queries if 'product_product' in query['sql']]), 2)
+
+        self.assertEqual(
+            [(item['name'], item['count']) for item in facets['category']],
+            [("Shirts", 2), ("Bags", 1)],
+        )
+        self.assertEqual([(item['name'], item['count']) for item in facets['collection']], [("Summer", 2)])
+        self.assertEqual([(item['name'], item['count']) for item in facets['product_type']], [("Apparel", 3)])
+        self.assertEqual([item['count'] for item in facets['price']], [1, 1, 1])
+        self.assertEqual(facets['in_stock'], [{'value': True, 'count': 2}, {'value': False, 'count': 1}])
+
+    def test_counts_follow_applied_filters(self):
+        filterset = ProductFilter(
+            data={'category': self.shirts.pk, 'in_stock': True},
+            queryset=Product.objects.filter(pk__in=[self.cheap_shirt.pk, self.shirt.pk, self.bag.pk]),
+        )
+        self.assertEqual(list(filterset.qs), [self.cheap_shirt])
+
+        facets = compute_product_facets(filterset.qs)
+        self.assertEqual([item['count'] for item in facets['category']], [1])
+        self.assertEqual([item['count'] for item in facets['price']], [1, 0, 0])
+
+    def test_price_filters(self):
+        filterset = ProductFilter(
+            data={'min_price': 50, 'max_price': 100},
+            queryset=Product.objects.filter(pk__in=[self.cheap_shirt.pk, self.shirt.pk, self.bag.pk]),
+        )
+        self.assertEqual(list(filterset.qs), [self.shirt])
+
+    def test_rest_listing_includes_facets_on_request(self):
+        url = f"/product/storefront/api/products/?category={self.bags.pk}"
+
+        response = self.client.get(url)
+        self.assertNotIn('facets', response.data)
+
+        response = self.client.get(f"{url}&facets=true")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['facets']['category'][0]['count'], 1)
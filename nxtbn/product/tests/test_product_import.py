@@ -0,0 +1,184 @@
+import json
+import shutil
+import tempfile
+from decimal import Decimal
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from nxtbn.home.base_tests import BaseTestCase
+from nxtbn.product import ImportFileFormat, ImportJobStatus
+from nxtbn.product.importer import run_import_job
+from nxtbn.product.models import Category, Product, ProductImportJob, ProductType, ProductVariant
+from nxtbn.product.tests import ProductFactory, ProductVariantFactory
+from nxtbn.users.tests import UserFactory
+
+
+CSV_HEADER = "product_slug,name,category,product_type,images,sku,variant_name,price,cost_per_unit,track_inventory,name:fr-FR\n"
+
+
+def csv_file(*rows):
+    return ContentFile((CSV_HEADER + ''.join(f"{row}\n" for row in rows)).encode(), name='products.csv')
+
+
+class ProductImportTest(TestCase):
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = UserFactory()
+
+    def run_job(self, file, file_format=ImportFileFormat.CSV, **kwargs):
+        job = ProductImportJob(created_by=self.user, file_format=file_format)
+        job.file.save(file.name, file)
+        run_import_job(job, **kwargs)
+        return ProductImportJob.objects.get(pk=job.pk)
+
+    def test_imports_products_variants_and_relations(self):
+        job = self.run_job(csv_file(
+            "linen-shirt,Linen Shirt,Men > Shirts,Apparel,images/linen.jpg,LS-S,Small,20.50,10,true,Chemise en lin",
+            "linen-shirt,,,,,LS-M,Medium,25.00,12,yes,",
+            "wool-hat,Wool Hat,Men,Apparel,,WH-1,,9.99,4,0,",
+        ))
+
+        self.assertEqual(job.status, ImportJobStatus.COMPLETED)
+        self.assertEqual((job.total_rows, job.processed_rows, job.created_count, job.error_count), (3, 3, 3, 0))
+
+        shirt = Product.objects.get(slug='linen-shirt')
+        self.assertEqual(shirt.category.name, 'Shirts')
+        self.assertEqual(shirt.category.parent.name, 'Men')
+        self.assertEqual(ProductType.objects.filter(name='Apparel').count(), 1)
+        self.assertEqual(shirt.default_variant.sku, 'LS-S')
+        self.assertEqual(shirt.translations.get(language_code="fr-FR").name, "Chemise en lin")
+        self.assertEqual(shirt.thumbnail_url, '/media/images/linen.jpg')
+        self.assertEqual((shirt.min_price_subunit, shirt.max_price_subunit), (2050, 2500))
+        self.assertTrue(ProductVariant.objects.get(sku='LS-M').track_inventory)
+        self.assertEqual(Category.objects.get(name='Shirts').get_family_tree()[0]['name'], 'Men')
+
+    def test_categories_are_resolved_under_their_parent(self):
+        job = self.run_job(csv_file(
+            "mens-shirt,Mens Shirt,Men > Shirts,Apparel,,MS-1,,20,10,,",
+            "womens-shirt,Womens Shirt,Women > Shirts,Apparel,,WS-1,,20,10,,",
+            "nested,Nested,Men > Men,Apparel,,NE-1,,20,10,,",
+        ))
+
+        self.assertEqual((job.created_count, job.error_count), (1, 2))
+        self.assertEqual([error['row'] for error in job.errors], [2, 3])
+        self.assertEqual([list(error['errors']) for error in job.errors], [['category'], ['category']])
+        self.assertFalse(Product.objects.filter(slug__in=['womens-shirt', 'nested']).exists())
+        self.assertFalse(Category.objects.filter(name='Women').exists())
+        self.assertEqual(Category.objects.get(name='Men').parent, None)
+        self.assertEqual(Category.objects.get(name='Shirts').parent.name, 'Men')
+
+        job = self.run_job(csv_file("womens-shirt,Womens Shirt,Women > Shirts,Apparel,,WS-1,,20,10,,"))
+        self.assertEqual(job.error_count, 1)
+        self.assertEqual(Category.objects.get(name='Shirts').parent.name, 'Men')
+
+    def test_reimport_updates_by_slug_and_sku(self):
+        self.run_job(csv_file("linen-shirt,Linen Shirt,Men,Apparel,,LS-S,,20.50,10,,"))
+        job = self.run_job(csv_file("linen-shirt,Washed Linen Shirt,,,,LS-S,,18.00,,,"))
+
+        self.assertEqual((job.created_count, job.updated_count), (0, 1))
+        self.assertEqual(Product.objects.get(slug='linen-shirt').name, "Washed Linen Shirt")
+        variant = ProductVariant.objects.get(sku='LS-S')
+        self.assertEqual((variant.price, variant.cost_per_unit), (Decimal('18.00'), Decimal('10.00')))
+
+    def test_invalid_rows_are_reported_and_skipped(self):
+        other = ProductFactory()
+        ProductVariantFactory(product=other, sku='TAKEN')
+
+        job = self.run_job(csv_file(
+            "linen-shirt,Linen Shirt,Men,Apparel,,LS-S,,20.50,10,maybe,",
+            "linen-shirt,Linen Shirt,Men,Apparel,,LS-M,,,10,,",
+            "linen-shirt,Linen Shirt,Men,Apparel,,TAKEN,,20.50,10,,",
+            "no-category,Hat,,Apparel,,HAT-1,,5,2,,",
+            "linen-shirt,Linen Shirt,Men,Apparel,,LS-L,,22.00,10,,",
+        ))
+
+        self.assertEqual((job.processed_rows, job.created_count, job.error_count), (5, 1, 4))
+        self.assertEqual([error['row'] for error in job.errors], [1, 2, 3, 4])
+        self.assertIn('track_inventory', job.errors[0]['errors'])
+        self.assertIn('price', job.errors[1]['errors'])
+        self.assertIn('sku', job.errors[2]['errors'])
+        self.assertIn('category', job.errors[3]['errors'])
+        self.assertEqual(list(Product.objects.get(slug='linen-shirt').variants.values_list('sku', flat=True)), ['LS-L'])
+        self.assertFalse(Product.objects.filter(slug='no-category').exists())
+
+    def test_resumes_after_processed_rows(self):
+        job = ProductImportJob(created_by=self.user, file_format=ImportFileFormat.CSV, processed_rows=1)
+        job.file.save('products.csv', csv_file(
+            "linen-shirt,Linen Shirt,Men,Apparel,,LS-S,,20.50,10,,",
+            "wool-hat,Wool Hat,Men,Apparel,,WH-1,,9.99,4,,",
+            "wool-hat,,,,,WH-2,,10.99,4,,",
+        ))
+
+        run_import_job(job, chunk_size=1)
+
+        self.assertEqual((job.processed_rows, job.created_count), (3, 2))
+        self.assertFalse(Product.objects.filter(slug='linen-shirt').exists())
+        self.assertEqual(Product.objects.get(slug='wool-hat').variants.count(), 2)
+
+    def test_jsonl(self):
+        rows = [
+            {"product_slug": "wool-hat", "name": "Wool Hat", "category": "Men", "product_type": "Apparel", "sku": "WH-1",
+             "price": "9.99", "cost_per_unit": "4", "translations": {"fr-FR": {"name": "Bonnet"}}},
+            "not an object",
+        ]
+        job = self.run_job(
+            ContentFile('\n'.join(json.dumps(row) for row in rows).encode(), name='products.jsonl'), ImportFileFormat.JSONL,
+        )
+
+        self.assertEqual((job.created_count, job.error_count), (1, 1))
+        self.assertEqual(Product.objects.get(slug='wool-hat').translations.get().name, "Bonnet")
+
+    def test_jsonl_values_of_the_wrong_type_are_row_errors(self):
+        base = {"product_slug": "wool-hat", "name": "Wool Hat", "category": "Men", "product_type": "Apparel", "sku": "WH-1", "price": "9.99", "cost_per_unit": "4"}
+        rows = [
+            {**base, "translations": {"fr": "x"}},
+            {**base, "category": 5},
+            {**base, "images": 5},
+            {**base, "product_type": ["Apparel"]},
+            [base],
+            base,
+        ]
+        job = self.run_job(
+            ContentFile('\n'.join(json.dumps(row) for row in rows).encode(), name='products.jsonl'), ImportFileFormat.JSONL,
+        )
+
+        self.assertEqual((job.status, job.created_count, job.error_count), (ImportJobStatus.COMPLETED, 1, 5))
+        self.assertEqual(
+            [list(error['errors']) for error in job.errors],
+            [['translations'], ['category'], ['images'], ['product_type'], ['row']],
+        )
+
+
+class ProductImportAPITest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.adminLogin()
+
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_upload_queues_the_import(self):
+        with mock.patch('nxtbn.product.api.dashboard.views.import_products') as import_products:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.auth_client.post(reverse('product-import'), {'file': csv_file()}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['file_format'], ImportFileFormat.CSV)
+        import_products.delay.assert_called_once_with(response.data['id'])
+
+        response = self.auth_client.get(reverse('product-import-detail', args=[response.data['id']]))
+        self.assertEqual(response.data['status'], ImportJobStatus.PENDING)
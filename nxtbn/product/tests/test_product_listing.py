@@ -0,0 +1,75 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from nxtbn.core import PublishableStatus
+from nxtbn.home.base_tests import BaseTestCase
+from nxtbn.product import StockStatus
+from nxtbn.product.listing import rebuild_product_listing
+from nxtbn.product.models import ProductListingEntry, ProductTranslation
+from nxtbn.product.tests import CategoryFactory, ProductFactory, ProductVariantFactory
+from nxtbn.warehouse.tests import StockFactory
+
+
+class ProductListingEntryTest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.parent_category = CategoryFactory(name="Men")
+        self.category = CategoryFactory(name="Shirts", parent=self.parent_category)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product = ProductFactory(category=self.category, status=PublishableStatus.PUBLISHED)
+            self.variant = ProductVariantFactory(product=self.product, price=Decimal('10.50'), track_inventory=True)
+            ProductVariantFactory(product=self.product, price=Decimal('25.00'), track_inventory=True)
+
+    def test_signals_keep_entry_current(self):
+        entry = ProductListingEntry.objects.get(product=self.product)
+        self.assertEqual(entry.category_path, "Men > Shirts")
+        self.assertEqual(entry.min_price_subunit, 1050)
+        self.assertEqual(entry.max_price_subunit, 2500)
+        self.assertEqual(entry.variant_count, 2)
+        self.assertEqual(entry.stock_status, StockStatus.OUT_OF_STOCK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            StockFactory(product_variant=self.variant, quantity=5, reserved=2)
+            ProductTranslation.objects.create(
+                product=self.product, language_code='bn', name="Bangla name", summary="Bangla summary", description="",
+            )
+
+        entry = ProductListingEntry.objects.get(product=self.product, language_code=entry.language_code)
+        self.assertEqual(entry.available_stock, 3)
+        self.assertEqual(entry.stock_status, StockStatus.IN_STOCK)
+        self.assertEqual(ProductListingEntry.objects.get(product=self.product, language_code='bn').name, "Bangla name")
+
+    def test_ancestor_rename_refreshes_the_category_path(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.parent_category.name = "Gents"
+            self.parent_category.save()
+
+        self.assertEqual(ProductListingEntry.objects.get(product=self.product).category_path, "Gents > Shirts")
+
+    def test_rebuild_restores_entries(self):
+        ProductListingEntry.objects.all().delete()
+        list(rebuild_product_listing())
+        self.assertEqual(ProductListingEntry.objects.filter(product=self.product).count(), 1)
+
+    def test_storefront_listing_reads_only_the_listing_table(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(5):
+                product = ProductFactory(category=self.category, status=PublishableStatus.PUBLISHED)
+                ProductVariantFactory(product=product, price=Decimal('12.00'))
+            ProductFactory(category=self.category, status=PublishableStatus.DRAFT)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('storefront-product-listing'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 6)
+        self.assertEqual(len(response.data['results']), 6)
+        listing_queries = [query for query in queries.captured_queries if 'product_productlistingentry' in query['sql']]
+        self.assertEqual(len(listing_queries), 2) # page and count
+        self.assertEqual(len(queries), len(listing_queries))
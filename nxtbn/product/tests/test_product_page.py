@@ -0,0 +1,119 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from nxtbn.core import PublishableStatus
+from nxtbn.product import StockStatus
+from nxtbn.product.models import ProductTranslation, ProductVariantTranslation
+from nxtbn.product.recommendations import refresh_recommendations
+from nxtbn.product.tests import CategoryFactory, ProductFactory, ProductVariantFactory
+from nxtbn.product.tests.test_product_query_storefront_cache import LOCMEM_CACHES
+from nxtbn.warehouse.models import Stock, Warehouse
+
+
+class ProductPageTest(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        self.warehouse = Warehouse.objects.create(name="Main", location="Dhaka")
+        men = CategoryFactory(name="Men", parent=None)
+        self.shirts = CategoryFactory(name="Shirts", parent=men)
+        self.product = ProductFactory(name="Linen Shirt", category=self.shirts, status=PublishableStatus.PUBLISHED)
+        ProductFactory(name="Linen Shirt Slim", category=self.shirts, status=PublishableStatus.PUBLISHED)
+
+    def add_variant(self, quantity, **kwargs):
+        variant = ProductVariantFactory(product=self.product, price=Decimal('20.00'), track_inventory=True, allow_backorder=False, **kwargs)
+        Stock.objects.create(warehouse=self.warehouse, product_variant=variant, quantity=quantity)
+        return variant
+
+    def get(self):
+        return self.client.get(reverse('product-page', args=[self.product.slug]))
+
+    def test_page_assembles_the_product(self):
+        self.add_variant(3, name="Small")
+        self.add_variant(0, name="Large")
+        refresh_recommendations([self.product.id])
+
+        response = self.get()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data['texts']['name'], "Linen Shirt")
+        self.assertEqual([crumb['name'] for crumb in data['breadcrumbs']], ["Men", "Shirts"])
+        self.assertEqual(
+            [(variant['name'], variant['stock_status']) for variant in data['variants']],
+            [("Small", StockStatus.IN_STOCK), ("Large", StockStatus.OUT_OF_STOCK)],
+        )
+        self.assertEqual(data['stock_status'], StockStatus.IN_STOCK)
+        self.assertEqual([product['texts']['name'] for product in data['recommended']], ["Linen Shirt Slim"])
+
+    def test_query_count_does_not_grow_with_variants(self):
+        self.add_variant(1)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.get()
+        for _ in range(5):
+            self.add_variant(1)
+        with self.assertNumQueries(len(queries)):
+            response = self.get()
+        self.assertEqual(len(response.json()['variants']), 6)
+
+    def test_translated_texts(self):
+        variant = self.add_variant(1, name="Small")
+        ProductTranslation.objects.create(product=self.product, language_code='fr-FR', name="Chemise en lin", summary="", description="")
+        ProductVariantTranslation.objects.create(product_variant=variant, language_code='fr-FR', name="Petite")
+
+        with mock.patch('nxtbn.product.api.storefront.views.get_language', return_value='fr-FR'):
+            data = self.get().json()
+
+        self.assertEqual(data['texts']['name'], "Chemise en lin")
+        self.assertEqual(data['variants'][0]['name'], "Petite")
+
+    def test_unpublished_product_is_not_found(self):
+        self.product.status = PublishableStatus.DRAFT
+        self.product.save()
+        self.assertEqual(self.get().status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ProductPageCacheTest(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        self.product = ProductFactory(name="Linen Shirt", status=PublishableStatus.PUBLISHED)
+        self.variant = ProductVariantFactory(product=self.product, price=Decimal('20.00'))
+        self.url = reverse('product-page', args=[self.product.slug])
+
+    def test_cached_page_and_etag(self):
+        first = self.client.get(self.url)
+        etag = first['ETag']
+
+        with self.assertNumQueries(1):
+            cached = self.client.get(self.url)
+        self.assertEqual(cached.content, first.content)
+        self.assertEqual(cached['ETag'], etag)
+
+        not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.variant.price = Decimal('25.00')
+        self.variant.save()
+
+        changed = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(changed['ETag'], etag)
+        self.assertIn('25.00', changed.json()['variants'][0]['price'])
+
+    def test_languages_are_cached_separately(self):
+        ProductTranslation.objects.create(product=self.product, language_code='fr-FR', name="Chemise en lin", summary="", description="")
+
+        self.assertEqual(self.client.get(self.url).json()['texts']['name'], "Linen Shirt")
+        with mock.patch('nxtbn.product.api.storefront.views.get_language', return_value='fr-FR'):
+            french = self.client.get(self.url)
+        self.assertEqual(french.json()['texts']['name'], "Chemise en lin")
+        self.assertNotEqual(french['ETag'], self.client.get(self.url)['ETag'])
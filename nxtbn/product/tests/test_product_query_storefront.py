@@ -1,7 +1,11 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from nxtbn.core import PublishableStatus
+from nxtbn.core.graphql_connection import NxtbnFilterConnectionField
 from nxtbn.home.base_tests import BaseGraphQLTestCase
 from nxtbn.product.models import Product, Category, Collection, ProductTag
+from nxtbn.product.storefront_types import CategoryType
 from nxtbn.product.tests import (
     ProductFactory,
     CategoryFactory,
@@ -170,3 +174,63 @@ class ProductQueryTestCase(BaseGraphQLTestCase):
 
         self.assertEqual(len(tags), 1)
         self.assertEqual(tags[0]["node"]["name"], "Test Tag")
+
+
+    def test_connection_counts_only_when_selected(self):
+        for name in ("Second Category", "Third Category"):
+            CategoryFactory(name=name)
+
+        query = """
+        query getCategoryPage($after: String) {
+            categories(first: 2, after: $after) {
+            totalCount
+            estimatedCount
+            pageInfo {
+                hasNextPage
+                endCursor
+            }
+            edges {
+                node {
+                name
+                }
+            }
+            }
+        }
+        """
+
+        response = self.graphql_customer_client.execute(query)
+        self.assertGraphQLSuccess(response)
+        first_page = response["data"]["categories"]
+        self.assertEqual(first_page["totalCount"], 3)
+        self.assertEqual(first_page["estimatedCount"], 3)
+        self.assertTrue(first_page["pageInfo"]["hasNextPage"])
+        self.assertEqual(len(first_page["edges"]), 2)
+
+        response = self.graphql_customer_client.execute(query, variables={"after": first_page["pageInfo"]["endCursor"]})
+        self.assertGraphQLSuccess(response)
+        last_page = response["data"]["categories"]
+        self.assertFalse(last_page["pageInfo"]["hasNextPage"])
+        self.assertEqual(len(last_page["edges"]), 1)
+
+        # `first: 0` is an empty page, not the max limit
+        connection_type = CategoryType._meta.connection
+        empty_page = NxtbnFilterConnectionField.resolve_connection(
+            connection_type, {"first": 0}, Category.objects.order_by("pk"), max_limit=100,
+        )
+        self.assertEqual(empty_page.edges, [])
+        self.assertTrue(empty_page.page_info.has_next_page)
+
+        query_without_counts = """
+        query getCategoryPage {
+            categories(first: 2) {
+            edges {
+                node {
+                id
+                }
+            }
+            }
+        }
+        """
+        with CaptureQueriesContext(connection) as queries:
+            self.graphql_customer_client.execute(query_without_counts)
+        self.assertFalse(any("COUNT(" in query["sql"].upper() for query in queries.captured_queries))
@@ -0,0 +1,95 @@
+import json
+
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import override_settings, CaptureQueriesContext
+
+from nxtbn.core import PublishableStatus
+from nxtbn.core.graphql_cache import CachedGraphQLView, GraphQLResponseCache
+from nxtbn.product.tests import CategoryFactory, ProductFactory, ProductVariantFactory
+from nxtbn.storefront_schema import storefront_schema
+
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "default"},
+    "generic": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "generic"},
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class StorefrontGraphQLResponseCacheTest(TestCase):
+    query = """
+    query getProduct($slug: String!) {
+        product(slug: $slug) {
+            slug
+            name
+            price
+        }
+    }
+    """
+
+    def setUp(self):
+        self.client = Client()
+        self.category = CategoryFactory(name="Cached Category")
+        self.product = ProductFactory(name="Cached Product", category=self.category, status=PublishableStatus.PUBLISHED)
+        self.variant = ProductVariantFactory(product=self.product, price=10)
+        self.product.default_variant = self.variant
+        self.product.save()
+
+    def execute(self, query=None, variables=None):
+        return self.client.post(
+            '/graphql/',
+            data=json.dumps({"query": query or self.query, "variables": variables or {"slug": self.product.slug}}),
+            content_type='application/json',
+        )
+
+    def test_repeated_query_is_served_without_database_queries(self):
+        first = self.execute()
+        self.assertEqual(first.status_code, 200)
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.execute()
+
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(len(queries), 0)
+
+    def test_whitespace_only_differences_share_an_entry(self):
+        self.execute()
+        with CaptureQueriesContext(connection) as queries:
+            self.execute(query=" ".join(self.query.split()))
+        self.assertEqual(len(queries), 0)
+
+    def test_requests_share_one_analyzer(self):
+        self.execute()
+        response_cache = CachedGraphQLView._response_caches[id(storefront_schema)]
+        misses = response_cache.analyze.cache_info().misses
+
+        self.execute()
+
+        self.assertIs(CachedGraphQLView(schema=storefront_schema).response_cache, response_cache)
+        self.assertEqual(response_cache.analyze.cache_info().misses, misses)
+
+    def test_product_save_evicts_dependent_entries(self):
+        self.execute()
+        self.product.name = "Renamed Product"
+        self.product.save()
+
+        response = self.execute()
+        self.assertEqual(json.loads(response.content)["data"]["product"]["name"], "Renamed Product")
+
+    def test_unrelated_model_save_keeps_entries(self):
+        categories_query = "query { categories(first: 10) { edges { node { name } } } }"
+        self.execute(query=categories_query, variables={})
+
+        self.variant.price = 12
+        self.variant.save()
+
+        with CaptureQueriesContext(connection) as queries:
+            self.execute(query=categories_query, variables={})
+        self.assertEqual(len(queries), 0)
+
+    def test_session_dependent_operations_are_not_cacheable(self):
+        response_cache = GraphQLResponseCache(storefront_schema)
+        self.assertIsNone(response_cache.analyze("query { cart { total } }", None))
+        self.assertIsNone(response_cache.analyze("query { products(first: 1) { edges { node { slug } } } cart { total } }", None))
+        self.assertIsNotNone(response_cache.analyze(self.query, None))
@@ -0,0 +1,83 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from nxtbn.core import PublishableStatus
+from nxtbn.home.base_tests import BaseTestCase
+from nxtbn.order.models import Order, OrderLineItem
+from nxtbn.product.models import ProductRecommendation
+from nxtbn.product.recommendations import rebuild_recommendations
+from nxtbn.product.tasks import build_product_recommendations
+from nxtbn.product.tests import CategoryFactory, ProductFactory, ProductVariantFactory
+
+
+class ProductRecommendationTest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        shirts = CategoryFactory(name="Shirts")
+        bags = CategoryFactory(name="Bags")
+
+        self.product = ProductFactory(name="Linen Shirt", category=shirts, status=PublishableStatus.PUBLISHED)
+        self.similar = ProductFactory(name="Linen Shirt Slim", category=shirts, status=PublishableStatus.PUBLISHED)
+        self.same_category = ProductFactory(name="Denim Jacket", category=shirts, status=PublishableStatus.PUBLISHED)
+        self.bought_together = ProductFactory(name="Travel Bag", category=bags, status=PublishableStatus.PUBLISHED)
+        self.draft = ProductFactory(name="Linen Shirt Draft", category=shirts, status=PublishableStatus.DRAFT)
+        ProductFactory(name="Unrelated Backpack", category=bags, status=PublishableStatus.PUBLISHED)
+
+        for _ in range(2):
+            order = Order.objects.create(total_price=1000)
+            for product in (self.product, self.bought_together):
+                OrderLineItem.objects.create(
+                    order=order,
+                    variant=ProductVariantFactory(product=product, price=Decimal('5.00')),
+                    quantity=1,
+                    price_per_unit=Decimal('5.00'),
+                    total_price=500,
+                )
+
+    def test_recommendations_combine_purchases_similarity_and_category(self):
+        build_product_recommendations()
+
+        recommended = list(
+            ProductRecommendation.objects.filter(product=self.product).values_list('recommended_id', flat=True)
+        )
+        self.assertEqual(recommended, [self.bought_together.id, self.similar.id, self.same_category.id])
+
+    def test_rebuild_replaces_previous_recommendations(self):
+        list(rebuild_recommendations())
+        list(rebuild_recommendations())
+        self.assertEqual(ProductRecommendation.objects.filter(product=self.product).count(), 3)
+
+    def test_with_recommended_reads_precomputed_rows(self):
+        build_product_recommendations()
+        url = reverse('product-with-recommended', args=[self.product.slug])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [product['id'] for product in response.data],
+            [self.bought_together.id, self.similar.id, self.same_category.id],
+        )
+        recommendation_queries = [query for query in queries.captured_queries if 'product_productrecommendation' in query['sql']]
+        self.assertEqual(len(recommendation_queries), 1)
+
+    def test_unpublished_products_are_not_recommended(self):
+        build_product_recommendations()
+        url = reverse('product-with-recommended', args=[self.product.slug])
+        self.product.refresh_from_db()
+        last_modified = self.product.last_modified
+
+        self.similar.status = PublishableStatus.DRAFT
+        self.similar.save()
+
+        response = self.client.get(url)
+        self.assertEqual([product['id'] for product in response.data], [self.bought_together.id, self.same_category.id])
+        # The cached product page of the recommending product goes stale
+        self.product.refresh_from_db()
+        self.assertGreater(self.product.last_modified, last_modified)
@@ -0,0 +1,122 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO
+
+from django.contrib.auth.models import Permission
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from nxtbn.core.enum_perms import PermissionsEnum
+from nxtbn.home.base_tests import BaseTestCase
+from nxtbn.product.models import Category, Product, ProductVariant
+from nxtbn.product.repricing import adjust_prices, apply_price_list, filter_variants, read_price_list
+from nxtbn.product.tests import ProductFactory, ProductVariantFactory
+from nxtbn.users.tests import UserFactory
+
+
+class VariantRepricingTest(TestCase):
+
+    def setUp(self):
+        self.men = Category.objects.create(name="Men")
+        self.shirts = Category.objects.create(name="Shirts", parent=self.men)
+        self.women = Category.objects.create(name="Women")
+
+        self.shirt = ProductFactory(category=self.shirts)
+        self.shirt_variant = ProductVariantFactory(product=self.shirt, sku='SHIRT', price=Decimal('20.00'), cost_per_unit=Decimal('8.00'))
+        self.dress = ProductFactory(category=self.women)
+        self.dress_variant = ProductVariantFactory(product=self.dress, sku='DRESS', price=Decimal('50.00'), cost_per_unit=Decimal('20.00'))
+
+    def price(self, variant):
+        return ProductVariant.objects.get(pk=variant.pk).price
+
+    def test_percentage_change_of_a_category_tree(self):
+        result = adjust_prices(filter_variants(category=self.men), percentage=Decimal('-12.5'))
+
+        self.assertEqual(result['matched'], 1)
+        self.assertEqual(self.price(self.shirt_variant), Decimal('17.50'))
+        self.assertEqual(self.price(self.dress_variant), Decimal('50.00'))
+        self.assertEqual(Product.objects.get(pk=self.shirt.pk).min_price_subunit, 1750)
+
+    def test_percentage_change_rounds_to_currency_precision(self):
+        adjust_prices(filter_variants(), percentage=Decimal('3.333'))
+        self.assertEqual(self.price(self.shirt_variant), Decimal('20.67'))
+
+    def test_amount_is_validated_before_writing(self):
+        with self.assertRaises(ValidationError):
+            adjust_prices(filter_variants(), amount=Decimal('0.005'))
+        with self.assertRaises(ValidationError):
+            adjust_prices(filter_variants(), amount=Decimal('-30'))
+        self.assertEqual(self.price(self.shirt_variant), Decimal('20.00'))
+
+        adjust_prices(filter_variants(), field='cost_per_unit', amount=Decimal('1.5'))
+        self.assertEqual(ProductVariant.objects.get(pk=self.dress_variant.pk).cost_per_unit, Decimal('21.50'))
+
+    def test_dry_run_does_not_write(self):
+        result = adjust_prices(filter_variants(), percentage=10, dry_run=True)
+
+        self.assertEqual(
+            [(change['sku'], change['old'], change['new']) for change in result['changes']],
+            [('SHIRT', Decimal('20.000'), Decimal('22.000')), ('DRESS', Decimal('50.000'), Decimal('55.000'))],
+        )
+        self.assertEqual(self.price(self.shirt_variant), Decimal('20.00'))
+
+    def test_price_list(self):
+        prices = read_price_list(BytesIO(b"sku,price,cost_per_unit\nSHIRT,19.99,\nDRESS,,21\nMISSING,5,\n"))
+
+        result = apply_price_list(prices)
+
+        self.assertEqual(result['missing'], ['MISSING'])
+        self.assertEqual(self.price(self.shirt_variant), Decimal('19.99'))
+        self.assertEqual(ProductVariant.objects.get(pk=self.dress_variant.pk).cost_per_unit, Decimal('21.00'))
+        self.assertEqual(Product.objects.get(pk=self.shirt.pk).max_price_subunit, 1999)
+
+
+class VariantRepricingAPITest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.adminLogin()
+        self.variant = ProductVariantFactory(product=ProductFactory(), sku='SHIRT', price=Decimal('20.00'))
+
+    def test_reprice(self):
+        url = reverse('bulk-variant-reprice')
+
+        response = self.auth_client.post(url, {'percentage': '10', 'amount': '1'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.auth_client.post(url, {'percentage': '10', 'dry_run': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['changes']), 1)
+        self.assertEqual(ProductVariant.objects.get(pk=self.variant.pk).price, Decimal('20.00'))
+
+        price_list = SimpleUploadedFile('prices.csv', b"sku,price\nSHIRT,18.00\n", content_type='text/csv')
+        response = self.auth_client.post(url, {'price_list': price_list}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(ProductVariant.objects.get(pk=self.variant.pk).price, Decimal('18.00'))
+
+    def test_store_staff_with_the_permission(self):
+        staff = UserFactory(is_superuser=False, is_staff=True, is_store_staff=True)
+        client = APIClient()
+        client.force_authenticate(staff)
+        url = reverse('bulk-variant-reprice')
+
+        response = client.post(url, {'field': 'compare_at_price', 'percentage': '10'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        staff.user_permissions.add(Permission.objects.get(codename=PermissionsEnum.CAN_BULK_REPRICE_VARIANTS))
+        staff = type(staff).objects.get(pk=staff.pk)
+        client.force_authenticate(staff)
+        ProductVariant.objects.filter(pk=self.variant.pk).update(compare_at_price=Decimal('25.00'))
+        Product.objects.filter(pk=self.variant.product_id).update(last_modified=timezone.now() - timedelta(minutes=1))
+        last_modified = Product.objects.get(pk=self.variant.product_id).last_modified
+
+        response = client.post(url, {'field': 'compare_at_price', 'percentage': '10'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Cached product pages show the compare-at price too
+        self.assertGreater(Product.objects.get(pk=self.variant.product_id).last_modified, last_modified)
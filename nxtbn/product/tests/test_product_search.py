@@ -0,0 +1,49 @@
+from django.test import TestCase
+
+from nxtbn.product.models import Product, ProductTranslation
+from nxtbn.product.search import search_products
+from nxtbn.product.storefront_filters import ProductFilter
+from nxtbn.product.tests import CategoryFactory, ProductFactory, ProductVariantFactory
+
+
+class ProductSearchTest(TestCase):
+
+    def setUp(self):
+        # Fixed texts everywhere, random words would make matches unpredictable
+        category = CategoryFactory(name="Catalog")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.shirt = ProductFactory(name="Linen Shirt", summary="Breathable summer shirt", description="", category=category)
+            self.shirt_mention = ProductFactory(name="Travel Bag", summary="Fits a folded shirt", description="", category=category)
+            self.shoes = ProductFactory(name="Running Shoes", summary="Lightweight trainers", description="", category=category)
+            ProductVariantFactory(product=self.shoes, name="Trail", sku="RUN-TRAIL-42")
+
+    def search(self, value):
+        return list(search_products(Product.objects.all(), value))
+
+    def test_ranks_name_matches_first(self):
+        self.assertEqual(self.search("shirt"), [self.shirt, self.shirt_mention])
+
+    def test_matches_stems_prefixes_and_variants(self):
+        self.assertEqual(self.search("running"), [self.shoes])
+        self.assertEqual(self.search("shoe"), [self.shoes])
+        self.assertEqual(self.search("trail"), [self.shoes])
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.assertEqual(self.search('shirt" OR *'), [])
+        self.assertEqual(self.search("!!!"), [])
+
+    def test_translations_and_deletes_update_the_index(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ProductTranslation.objects.create(
+                product=self.shoes, language_code='fr', name="Chaussures de course", summary="", description="",
+            )
+        self.assertEqual(self.search("chaussures"), [self.shoes])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.shoes.variants.all().delete()
+            self.shoes.delete()
+        self.assertEqual(self.search("running"), [])
+
+    def test_filter_search_uses_full_text_index(self):
+        filterset = ProductFilter(data={'search': 'linen'}, queryset=Product.objects.all())
+        self.assertEqual(list(filterset.qs), [self.shirt])
@@ -0,0 +1,68 @@
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from nxtbn.product.models import Product
+from nxtbn.product.storefront_filters import ProductFilter
+from nxtbn.product.tests import ProductFactory, ProductVariantFactory
+from nxtbn.warehouse.models import Stock, Warehouse
+
+
+class ProductSummaryTest(TestCase):
+
+    def setUp(self):
+        self.warehouse = Warehouse.objects.create(name="Main", location="Dhaka")
+        self.product = ProductFactory()
+        self.cheap = ProductVariantFactory(product=self.product, price=Decimal('10.00'), track_inventory=True, allow_backorder=False)
+        self.expensive = ProductVariantFactory(product=self.product, price=Decimal('25.50'), track_inventory=True, allow_backorder=False)
+        self.product.default_variant = self.cheap
+        self.product.save()
+
+    def summary(self):
+        return Product.objects.values('min_price_subunit', 'max_price_subunit', 'total_available_stock', 'in_stock').get(pk=self.product.pk)
+
+    def test_price_range_follows_variants(self):
+        self.assertEqual(self.summary()['min_price_subunit'], 1000)
+        self.assertEqual(self.summary()['max_price_subunit'], 2550)
+
+        self.expensive.delete()
+        self.assertEqual(self.summary()['max_price_subunit'], 1000)
+
+        product = Product.objects.get(pk=self.product.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(product.product_price_range(), {'min_price': Decimal('10.00'), 'max_price': Decimal('10.00')})
+
+    def test_stock_summary_follows_stock_rows(self):
+        self.assertEqual(self.summary()['in_stock'], False)
+
+        stock = Stock.objects.create(warehouse=self.warehouse, product_variant=self.cheap, quantity=5, reserved=2)
+        self.assertEqual(self.summary()['total_available_stock'], 3)
+        self.assertEqual(self.summary()['in_stock'], True)
+
+        stock.reserved = 5
+        stock.save()
+        self.assertEqual(self.summary()['in_stock'], False)
+
+        self.expensive.allow_backorder = True
+        self.expensive.save()
+        self.assertEqual(self.summary()['in_stock'], True)
+
+    def test_filters_and_ordering_use_the_summary(self):
+        other = ProductFactory()
+        ProductVariantFactory(product=other, price=Decimal('5.00'), track_inventory=False)
+        queryset = Product.objects.filter(pk__in=[self.product.pk, other.pk])
+
+        self.assertEqual(list(ProductFilter(data={'in_stock': True}, queryset=queryset).qs), [other])
+        self.assertEqual(list(ProductFilter(data={'min_price': 8}, queryset=queryset).qs), [self.product])
+        self.assertEqual(list(ProductFilter(data={'ordering': '-price'}, queryset=queryset).qs), [self.product, other])
+
+    def test_backfill_command(self):
+        Product.objects.update(min_price_subunit=None, max_price_subunit=None, in_stock=True)
+
+        call_command('rebuild_product_summaries')
+
+        self.assertEqual(
+            self.summary(),
+            {'min_price_subunit': 1000, 'max_price_subunit': 2550, 'total_available_stock': 0, 'in_stock': False},
+        )
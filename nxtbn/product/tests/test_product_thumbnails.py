@@ -0,0 +1,57 @@
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase
+
+from nxtbn.filemanager.tests import ImageFactory
+from nxtbn.product.models import Product, ProductVariant
+from nxtbn.product.tests import ProductFactory, ProductVariantFactory
+
+
+class ProductThumbnailTest(TestCase):
+
+    def setUp(self):
+        self.request = RequestFactory().get('/')
+        self.first, self.second = ImageFactory(), ImageFactory()
+        self.product = ProductFactory(images=[self.second, self.first])
+        self.variant = ProductVariantFactory(product=self.product)
+        self.variant_image = ImageFactory()
+        self.variant_with_image = ProductVariantFactory(product=self.product, image=self.variant_image)
+
+    def test_primary_image_is_the_first_image(self):
+        self.assertEqual(self.product.primary_image, self.first)
+        self.assertEqual(self.product.thumbnail_url, self.first.image.url)
+        self.assertEqual(self.variant.thumbnail_url, self.first.image.url)
+        self.assertEqual(self.variant_with_image.thumbnail_url, self.variant_image.image.url)
+
+    def test_rendering_does_not_query(self):
+        product = Product.objects.get(pk=self.product.pk)
+        variant = ProductVariant.objects.get(pk=self.variant.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(product.product_thumbnail(self.request), f"http://testserver{self.first.image.url}")
+            self.assertEqual(product.product_thumbnail_xs(self.request), f"http://testserver{self.first.image.url}")
+            self.assertEqual(variant.variant_thumbnail(self.request), f"http://testserver{self.first.image.url}")
+
+    def test_image_changes_update_products_and_variants(self):
+        self.product.images.remove(self.first)
+        self.assertEqual(self.product.primary_image, self.second)
+        self.assertEqual(ProductVariant.objects.get(pk=self.variant.pk).thumbnail_url, self.second.image.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.second.delete()
+        product = Product.objects.get(pk=self.product.pk)
+        self.assertIsNone(product.primary_image)
+        self.assertIsNone(product.thumbnail_url)
+        self.assertIsNone(ProductVariant.objects.get(pk=self.variant.pk).thumbnail_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.variant_image.delete()
+        self.assertIsNone(ProductVariant.objects.get(pk=self.variant_with_image.pk).thumbnail_url)
+
+    def test_backfill_command(self):
+        Product.objects.update(primary_image=None, thumbnail_url=None, thumbnail_xs_url=None)
+        ProductVariant.objects.update(thumbnail_url=None, thumbnail_xs_url=None)
+
+        call_command('rebuild_product_thumbnails')
+
+        self.assertEqual(Product.objects.get(pk=self.product.pk).thumbnail_url, self.first.image.url)
+        self.assertEqual(ProductVariant.objects.get(pk=self.variant.pk).thumbnail_url, self.first.image.url)
+        self.assertEqual(ProductVariant.objects.get(pk=self.variant_with_image.pk).thumbnail_url, self.variant_image.image.url)
@@ -14,7 +14,8 @@ from nxtbn.product.tests import ProductFactory, ProductTypeFactory, ProductVaria
 from nxtbn.tax.tests import TaxClassFactory, TaxRateFactory
 
 
-from django.test.utils import override_settings
+from django.db import connection
+from django.test.utils import override_settings, CaptureQueriesContext
 
 
 @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
@@ -44,6 +45,27 @@ class ProductListAPITest(BaseTestCase):
             self.assertNotIn('variants', product) # only default variant should be present, not all variants
 
 
+    def test_product_list_keyset_pagination(self):
+        url = reverse('product-list')
+        next_url = f"{url}?cursor=&page_size=7"
+        seen = []
+
+        with CaptureQueriesContext(connection) as queries:
+            while next_url:
+                response = self.auth_client.get(next_url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertNotIn('count', response.data)
+                seen.extend(product['id'] for product in response.data['results'])
+                next_url = response.data['next_page_url']
+
+        self.assertEqual(len(seen), 20)
+        self.assertEqual(len(set(seen)), 20)
+        list_counts = [query for query in queries.captured_queries if query["sql"].startswith('SELECT COUNT(*) AS "__count" FROM "product_product"')]
+        self.assertEqual(list_counts, [])
+
+        response = self.auth_client.get(f"{url}?cursor=invalid")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     def get_product_list_api_with_variant_only(self):
         url = reverse('product-withvariant')
         response = self.auth_client.get(url)
@@ -0,0 +1,111 @@
+import json
+from decimal import Decimal
+from unittest import mock
+
+from django.test.utils import override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from nxtbn.core import PublishableStatus
+from nxtbn.core.currency import abstract_base_currency
+from nxtbn.core.models import CurrencyExchange
+from nxtbn.home.base_tests import BaseTestCase
+from nxtbn.product.models import VariantPrice
+from nxtbn.product.price_lists import refresh_currency_prices, set_price_override
+from nxtbn.product.tests import ProductFactory, ProductVariantFactory
+
+
+@override_settings(BASE_CURRENCY='USD', IS_MULTI_CURRENCY=True, ALLOWED_CURRENCIES=['USD', 'EUR', 'JPY'])
+class VariantPriceTest(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        abstract_base_currency._local_rates.clear()
+        with mock.patch('nxtbn.product.tasks.refresh_variant_prices_in_currencies'), self.captureOnCommitCallbacks(execute=True):
+            self.eur = CurrencyExchange.objects.create(base_currency='USD', target_currency='EUR', exchange_rate=Decimal('0.9'))
+            CurrencyExchange.objects.create(base_currency='USD', target_currency='JPY', exchange_rate=Decimal('150.5'))
+
+    def tearDown(self):
+        abstract_base_currency._local_rates.clear()
+
+    def create_product(self, *prices):
+        with self.captureOnCommitCallbacks(execute=True):
+            product = ProductFactory(status=PublishableStatus.PUBLISHED)
+            variants = [ProductVariantFactory(product=product, price=price, compare_at_price=None) for price in prices]
+        return product, variants
+
+    def prices(self, variant):
+        return {row.currency: row for row in VariantPrice.objects.filter(variant=variant)}
+
+    def test_variant_save_refreshes_its_prices(self):
+        _, (variant,) = self.create_product(Decimal('10.05'))
+
+        prices = self.prices(variant)
+        self.assertEqual({currency: row.price_subunit for currency, row in prices.items()}, {'USD': 1005, 'EUR': 905, 'JPY': 1513})
+        self.assertEqual(prices['EUR'].formatted_price, {'en_US': '€9.05'})
+
+        variant.price = Decimal('20.00')
+        variant.save()
+        self.assertEqual(self.prices(variant)['EUR'].price_subunit, 1800)
+
+    def test_rate_change_refreshes_the_currency_in_the_background(self):
+        _, (variant,) = self.create_product(Decimal('10.00'))
+
+        with mock.patch('nxtbn.product.tasks.refresh_variant_prices_in_currencies') as task:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.eur.exchange_rate = Decimal('0.8')
+                self.eur.save()
+        task.delay.assert_called_once_with(['EUR'])
+
+        list(refresh_currency_prices(['EUR']))
+        self.assertEqual(self.prices(variant)['EUR'].price_subunit, 800)
+
+    def test_override_survives_refreshes(self):
+        _, (variant,) = self.create_product(Decimal('10.00'))
+
+        set_price_override(variant.id, 'EUR', Decimal('7.99'))
+        list(refresh_currency_prices(['EUR']))
+        self.assertEqual(self.prices(variant)['EUR'].price_subunit, 799)
+
+        set_price_override(variant.id, 'EUR', None)
+        self.assertEqual(self.prices(variant)['EUR'].price_subunit, 900)
+
+    def test_listing_sorts_and_filters_in_the_requested_currency(self):
+        cheap, (cheap_variant, _) = self.create_product(Decimal('10.00'), Decimal('30.00'))
+        dear, _ = self.create_product(Decimal('12.00'))
+        set_price_override(cheap_variant.id, 'EUR', Decimal('15.00'))
+
+        response = self.client.get(reverse('storefront-product-listing'), {'ordering': 'price'}, HTTP_ACCEPT_CURRENCY='EUR')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['results']
+        self.assertEqual([result['id'] for result in results], [dear.id, cheap.id])
+        self.assertEqual(results[1]['price_range'], {'min': '€15.00', 'max': '€27.00'})
+
+        response = self.client.get(reverse('storefront-product-listing'), {'min_price': '11'}, HTTP_ACCEPT_CURRENCY='EUR')
+        self.assertEqual([result['id'] for result in response.data['results']], [cheap.id])
+
+    def test_rows_of_another_rate_are_not_served(self):
+        product, _ = self.create_product(Decimal('10.05'))
+        # The rate moved, the background refresh has not run yet
+        CurrencyExchange.objects.filter(pk=self.eur.pk).update(exchange_rate=Decimal('0.8'))
+
+        response = self.client.get(reverse('storefront-product-listing'), HTTP_ACCEPT_CURRENCY='EUR')
+
+        self.assertEqual(response.data['results'][0]['price_range']['min'], '€8.04')
+        page = self.client.get(reverse('product-page', args=[product.slug]), HTTP_ACCEPT_CURRENCY='EUR').json()
+        self.assertEqual(page['variants'][0]['price'], '€8.04')
+
+    def test_graphql_prices_read_the_price_list(self):
+        product, (variant,) = self.create_product(Decimal('10.00'))
+        product.default_variant = variant
+        product.save()
+        set_price_override(variant.id, 'EUR', Decimal('7.99'))
+        query = "query($slug: String!) { product(slug: $slug) { price variants { price } } }"
+
+        response = self.client.post(
+            '/graphql/', data=json.dumps({'query': query, 'variables': {'slug': product.slug}}),
+            content_type='application/json', HTTP_ACCEPT_CURRENCY='EUR',
+        )
+
+        self.assertEqual(json.loads(response.content)['data']['product'], {'price': '€7.99', 'variants': [{'price': '€7.99'}]})
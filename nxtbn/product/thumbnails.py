@@ -0,0 +1,77 @@
+"""
+Denormalized primary images.
+
+`Product.primary_image` is the first of the product's images (lowest pk, as `images.first()`
+returned) and `thumbnail_url`/`thumbnail_xs_url` its resolved URLs. Variants store the URLs
+of their own image or, without one, of the product's primary image. Renders read the columns
+and never query images.
+"""
+from django.db.models import Min
+from django.utils import timezone
+
+from nxtbn.filemanager.models import Image
+from nxtbn.product.models import Product, ProductVariant
+
+
+THUMBNAIL_FIELDS = ['thumbnail_url', 'thumbnail_xs_url']
+
+
+def refresh_product_thumbnails(product_ids):
+    """Recomputes the primary image of the given products and the thumbnails of their variants, in four queries."""
+    product_ids = set(product_ids)
+    if not product_ids:
+        return
+
+    first_images = dict(
+        Product.images.through.objects.filter(product_id__in=product_ids)
+        .values('product_id')
+        .annotate(first_image_id=Min('image_id'))
+        .values_list('product_id', 'first_image_id')
+    )
+    variants = list(
+        ProductVariant.objects.filter(product_id__in=product_ids).only('id', 'product_id', 'image_id', *THUMBNAIL_FIELDS)
+    )
+    images = Image.objects.in_bulk({*first_images.values(), *(variant.image_id for variant in variants if variant.image_id)})
+
+    def urls(image_id):
+        image = images.get(image_id)
+        return image.get_relative_urls() if image else (None, None)
+
+    changed_products = []
+    product_urls = {}
+    now = timezone.now()
+    for product in Product.objects.filter(id__in=product_ids).only('id', 'primary_image_id', *THUMBNAIL_FIELDS):
+        image_id = first_images.get(product.id)
+        product_urls[product.id] = urls(image_id)
+        if (product.primary_image_id, product.thumbnail_url, product.thumbnail_xs_url) != (image_id, *product_urls[product.id]):
+            product.primary_image_id = image_id
+            product.thumbnail_url, product.thumbnail_xs_url = product_urls[product.id]
+            product.last_modified = now
+            changed_products.append(product)
+    Product.objects.bulk_update(changed_products, ['primary_image', *THUMBNAIL_FIELDS, 'last_modified'], batch_size=500)
+
+    changed_variants = []
+    for variant in variants:
+        resolved = urls(variant.image_id)
+        if resolved[0] is None:
+            resolved = product_urls.get(variant.product_id, (None, None))
+        if (variant.thumbnail_url, variant.thumbnail_xs_url) != resolved:
+            variant.thumbnail_url, variant.thumbnail_xs_url = resolved
+            changed_variants.append(variant)
+    ProductVariant.objects.bulk_update(changed_variants, THUMBNAIL_FIELDS, batch_size=500)
+
+
+def rebuild_product_thumbnails(chunk_size=500):
+    """Recomputes the thumbnails of every product, `chunk_size` products at a time. Yields the size of each chunk."""
+    product_ids = list(Product.objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(product_ids), chunk_size):
+        chunk = product_ids[start:start + chunk_size]
+        refresh_product_thumbnails(chunk)
+        yield len(chunk)
+
+
+def products_using_image(image):
+    """Ids of the products showing `image`, as one of their images or through a variant."""
+    return set(Product.objects.filter(images=image).values_list('id', flat=True)) | set(
+        ProductVariant.objects.filter(image=image).values_list('product_id', flat=True)
+    )
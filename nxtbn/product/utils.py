@@ -7,6 +7,10 @@ def json_to_html(json_data):
     except json.JSONDecodeError as e:
         return f"<!-- Invalid JSON: {e} -->"
 
+    if not isinstance(data, list):
+        # Valid JSON such as "100" or "null" is not an editor document
+        return ""
+
     html = []
 
     for element in data:
@@ -2,7 +2,7 @@
 
 import graphene
 
-from graphene_django.filter import DjangoFilterConnectionField
+from nxtbn.core.graphql_connection import NxtbnFilterConnectionField
 from nxtbn.core.admin_permissions import gql_store_admin_required
 from nxtbn.purchase.admin_types import PurchaseType
 from nxtbn.purchase.models import PurchaseOrder
@@ -11,7 +11,7 @@ from nxtbn.purchase.models import PurchaseOrder
 
 class PurchaseQuery(graphene.ObjectType):
     purchase = graphene.Field(PurchaseType, id=graphene.ID(required=True))
-    purchases = DjangoFilterConnectionField(PurchaseType)
+    purchases = NxtbnFilterConnectionField(PurchaseType)
 
 
  
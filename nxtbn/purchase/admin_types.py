@@ -1,9 +1,10 @@
 import graphene
 from graphene_django.types import DjangoObjectType
-from graphene_django.filter import DjangoFilterConnectionField
+from nxtbn.core.graphql_connection import NxtbnFilterConnectionField
 from graphene import relay
 
 from nxtbn.purchase.models import PurchaseOrder, PurchaseOrderItem
+from nxtbn.core.graphql_connection import NxtbnConnection
 
 
 
@@ -15,6 +16,7 @@ class PurchaseType(DjangoObjectType):
         fields = '__all__'
 
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filter_fields = {
             'supplier__id': ['exact'],
             'destination__id': ['exact'],
@@ -30,6 +32,7 @@ class PurchaseOrderItemType(DjangoObjectType):
         model = PurchaseOrderItem
         fields = '__all__'
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filter_fields = {
             'purchase_order__id': ['exact'],
             'variant__id': ['exact'],
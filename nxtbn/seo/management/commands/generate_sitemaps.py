@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from nxtbn.seo.sitemaps import generate_sitemaps
+
+
+class Command(BaseCommand):
+    help = 'Write the sharded sitemaps to storage, only the changed shards unless --full is given'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Rewrite every shard')
+
+    def handle(self, *args, **options):
+        written = generate_sitemaps(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(f'Successfully wrote {len(written)} sitemap file(s)'))
@@ -0,0 +1,189 @@
+"""
+Pre-generated, sharded sitemaps served from storage.
+
+Every section is split into shards of `SHARD_SIZE` consecutive ids, so a shard never holds
+more than the 50,000 URLs allowed per sitemap file and keeps its URLs when rows are added
+or removed elsewhere. A manifest stored next to the files keeps the URL count and latest
+`last_modified` of every shard; regenerating compares them with one grouped query per
+section and only rewrites the shards that changed, then the `sitemap.xml` index.
+"""
+import json
+from xml.sax.saxutils import escape
+
+from django.contrib.sites.models import Site
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import Count, ExpressionWrapper, F, IntegerField, Max, Value
+from django.urls import reverse
+from django.utils import timezone
+
+from nxtbn.core import PublishableStatus
+from nxtbn.product.models import Product
+
+
+SITEMAP_DIR = 'sitemaps'
+INDEX_NAME = 'sitemap.xml'
+MANIFEST_NAME = 'manifest.json'
+
+# Maximum number of URLs per sitemap file, see https://www.sitemaps.org/protocol.html
+SHARD_SIZE = 50000
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+
+
+class SitemapSection:
+    """Rows of `get_queryset()` published under `reverse(url_name, args=[slug])`."""
+    name = None
+    url_name = None
+    changefreq = 'weekly'
+    priority = '0.7'
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def shard_stats(self):
+        """Returns `{shard: (count, lastmod isoformat)}` with one grouped query."""
+        rows = (
+            self.get_queryset()
+            .annotate(shard=ExpressionWrapper(F('id') / Value(SHARD_SIZE), output_field=IntegerField()))
+            .values('shard')
+            .annotate(count=Count('id'), lastmod=Max('last_modified'))
+            .order_by()
+        )
+        return {row['shard']: (row['count'], row['lastmod'].isoformat()) for row in rows}
+
+    def urls(self, shard):
+        """Yields `(path, last_modified)` of a shard, streamed without loading model instances."""
+        path_template = reverse(self.url_name, args=['__slug__'])
+        rows = (
+            self.get_queryset()
+            .filter(id__gte=shard * SHARD_SIZE, id__lt=(shard + 1) * SHARD_SIZE)
+            .order_by('id')
+            .values_list('slug', 'last_modified')
+        )
+        for slug, last_modified in rows.iterator(chunk_size=2000):
+            yield path_template.replace('__slug__', slug), last_modified
+
+
+class ProductSitemapSection(SitemapSection):
+    name = 'product'
+    url_name = 'product_detail'
+
+    def get_queryset(self):
+        return Product.objects.filter(status=PublishableStatus.PUBLISHED)
+
+
+SECTIONS = [ProductSitemapSection()]
+
+# Pages without a model, by URL name
+STATIC_URL_NAMES = ['home']
+
+
+def _storage_path(name):
+    return f"{SITEMAP_DIR}/{name}"
+
+
+def _write(name, content):
+    path = _storage_path(name)
+    if default_storage.exists(path):
+        default_storage.delete(path)
+    default_storage.save(path, ContentFile(content.encode('utf-8')))
+
+
+def _read_manifest():
+    path = _storage_path(MANIFEST_NAME)
+    if not default_storage.exists(path):
+        return {}
+    with default_storage.open(path) as manifest:
+        return json.loads(manifest.read())
+
+
+def _base_url():
+    return f"https://{Site.objects.get_current().domain}"
+
+
+def _url_entry(location, lastmod=None, changefreq=None, priority=None):
+    parts = [f"<loc>{escape(location)}</loc>"]
+    if lastmod:
+        parts.append(f"<lastmod>{lastmod.date().isoformat()}</lastmod>")
+    if changefreq:
+        parts.append(f"<changefreq>{changefreq}</changefreq>")
+    if priority:
+        parts.append(f"<priority>{priority}</priority>")
+    return f"<url>{''.join(parts)}</url>\n"
+
+
+def _render_urlset(entries):
+    return ''.join([
+        XML_HEADER,
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n',
+        *entries,
+        '</urlset>\n',
+    ])
+
+
+def _write_shard(section, shard, base_url):
+    entries = (
+        _url_entry(f"{base_url}{path}", last_modified, section.changefreq, section.priority)
+        for path, last_modified in section.urls(shard)
+    )
+    _write(f"sitemap-{section.name}-{shard}.xml", _render_urlset(entries))
+
+
+def generate_sitemaps(full=False):
+    """
+    Writes the changed sitemap shards and the index to storage, or every shard when `full`.
+    Returns the names of the files written.
+    """
+    manifest = {} if full else _read_manifest()
+    base_url = _base_url()
+    written = []
+
+    new_manifest = {}
+    for section in SECTIONS:
+        previous = manifest.get(section.name, {})
+        current = {str(shard): list(stats) for shard, stats in section.shard_stats().items()}
+        for shard, stats in current.items():
+            if previous.get(shard) != stats:
+                _write_shard(section, int(shard), base_url)
+                written.append(f"sitemap-{section.name}-{shard}.xml")
+        for shard in set(previous) - set(current):
+            default_storage.delete(_storage_path(f"sitemap-{section.name}-{shard}.xml"))
+        new_manifest[section.name] = current
+
+    if full or not default_storage.exists(_storage_path('sitemap-static.xml')):
+        _write('sitemap-static.xml', _render_urlset(
+            _url_entry(f"{base_url}{reverse(url_name)}", changefreq='monthly', priority='0.8')
+            for url_name in STATIC_URL_NAMES
+        ))
+        written.append('sitemap-static.xml')
+
+    if written or new_manifest != manifest:
+        now = timezone.now()
+        sitemaps = [('sitemap-static.xml', None)]
+        for section in SECTIONS:
+            for shard, (_, lastmod) in sorted(new_manifest[section.name].items(), key=lambda item: int(item[0])):
+                sitemaps.append((f"sitemap-{section.name}-{shard}.xml", lastmod[:10]))
+        _write(INDEX_NAME, ''.join([
+            XML_HEADER,
+            '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n',
+            *(
+                f"<sitemap><loc>{escape(base_url + reverse('sitemap_file', args=[name]))}</loc>"
+                f"<lastmod>{lastmod or now.date().isoformat()}</lastmod></sitemap>\n"
+                for name, lastmod in sitemaps
+            ),
+            '</sitemapindex>\n',
+        ]))
+        _write(MANIFEST_NAME, json.dumps(new_manifest))
+        written.append(INDEX_NAME)
+    return written
+
+
+def open_sitemap(name):
+    """Returns `(content, modified datetime)` of a generated sitemap file, or None when missing."""
+    path = _storage_path(name)
+    if not default_storage.exists(path):
+        return None
+    with default_storage.open(path) as sitemap:
+        content = sitemap.read()
+    return content, default_storage.get_modified_time(path)
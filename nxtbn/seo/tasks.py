@@ -0,0 +1,8 @@
+from celery import shared_task
+
+from nxtbn.seo.sitemaps import generate_sitemaps
+
+
+@shared_task
+def regenerate_sitemaps():
+    generate_sitemaps()
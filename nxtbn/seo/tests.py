@@ -1,3 +1,55 @@
-from django.test import TestCase
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from nxtbn.core import PublishableStatus
+from nxtbn.product.tests import ProductFactory
+from nxtbn.seo.sitemaps import generate_sitemaps
+
+
+class SitemapTest(TestCase):
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.product = ProductFactory(status=PublishableStatus.PUBLISHED)
+        self.draft = ProductFactory(status=PublishableStatus.DRAFT)
+
+    def test_generates_index_and_shards(self):
+        written = generate_sitemaps()
+        self.assertEqual(written, ['sitemap-product-0.xml', 'sitemap-static.xml', 'sitemap.xml'])
+
+        response = self.client.get(reverse('sitemap_xml'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'/sitemap-product-0.xml</loc>', response.content)
+        self.assertIn('Last-Modified', response)
+
+        shard = self.client.get(reverse('sitemap_file', args=['sitemap-product-0.xml']))
+        self.assertIn(f'/product/{self.product.slug}/</loc>'.encode(), shard.content)
+        self.assertNotIn(self.draft.slug.encode(), shard.content)
+
+    def test_regenerates_only_changed_shards(self):
+        generate_sitemaps()
+        self.assertEqual(generate_sitemaps(), [])
+
+        self.draft.status = PublishableStatus.PUBLISHED
+        self.draft.save()
+        self.assertEqual(generate_sitemaps(), ['sitemap-product-0.xml', 'sitemap.xml'])
+
+    def test_conditional_get(self):
+        response = self.client.get(reverse('sitemap_xml'))
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(reverse('sitemap_xml'), HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_missing_shard(self):
+        generate_sitemaps()
+        response = self.client.get(reverse('sitemap_file', args=['sitemap-product-9.xml']))
+        self.assertEqual(response.status_code, 404)
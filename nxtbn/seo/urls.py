@@ -1,11 +1,11 @@
 from django.conf import settings
 from django.conf.urls.static import static
-from django.urls import path
-from django.contrib.sitemaps.views import sitemap
+from django.urls import path, re_path
 from nxtbn.seo import views as seo_views
 
 
 urlpatterns = [
     path("robots.txt", seo_views.robots_txt, name="robots_txt"),
-    path("sitemap.xml", sitemap, {"sitemaps": seo_views.site_maps}, name="sitemap_xml"),
+    path("sitemap.xml", seo_views.sitemap_file, name="sitemap_xml"),
+    re_path(r"^(?P<name>sitemap-[\w-]+\.xml)$", seo_views.sitemap_file, name="sitemap_file"),
 ]
\ No newline at end of file
@@ -1,10 +1,10 @@
-from django.http import HttpResponse
-from django.shortcuts import render
-from django.contrib.sitemaps import Sitemap
+from django.http import Http404, HttpResponse, HttpResponseNotModified
 from django.urls import reverse
 from django.contrib.sites.models import Site
-from nxtbn.post.models import Post
-from nxtbn.product.models import Product
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from nxtbn.seo.sitemaps import INDEX_NAME, generate_sitemaps, open_sitemap
 
 def robots_txt(request):
     current_site = Site.objects.get_current()  # Gets the current site based on SITE_ID
@@ -26,47 +26,21 @@ def robots_txt(request):
 
 
 
-class StaticViewSitemap(Sitemap): # added for the demonstration only
-    changefreq = "monthly"
-    priority = 0.8
-
-    def items(self):
-        return [
-            'home',
-            # 'about',
-            # 'contact'
-        ]  # Names of views or URL names / doesn't exist yet, just for placeholder
-
-    def location(self, item):
-        return reverse(item)
-
-
-
-class ProductSitemap(Sitemap):
-    changefreq = "weekly" 
-    priority = 0.7
-
-    def items(self):
-        return Product.objects.all().order_by("id")
-
-    def lastmod(self, obj):
-        return obj.last_modified
-
-
-class PostSitemap(Sitemap):
-    changefreq = "weekly" 
-    priority = 0.7
-
-    def items(self):
-        return Post.objects.all().order_by("id")
-
-    def lastmod(self, obj):
-        return obj.last_modified
-
-
-
-site_maps = {
-    'static': StaticViewSitemap(),
-    'product': ProductSitemap(),
-    'post': PostSitemap(),
-}
\ No newline at end of file
+def sitemap_file(request, name=INDEX_NAME):
+    """
+    Serves a sitemap generated by `nxtbn.seo.sitemaps.generate_sitemaps` from storage, with
+    `Last-Modified` and conditional GET support. The first request generates them if missing.
+    """
+    sitemap = open_sitemap(name)
+    if sitemap is None and name == INDEX_NAME:
+        generate_sitemaps()
+        sitemap = open_sitemap(name)
+    if sitemap is None:
+        raise Http404
+
+    content, modified = sitemap
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), modified.timestamp()):
+        return HttpResponseNotModified()
+    response = HttpResponse(content, content_type='application/xml')
+    response['Last-Modified'] = http_date(modified.timestamp())
+    return response
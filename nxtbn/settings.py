@@ -213,6 +213,9 @@ if sys.argv[1] == 'test':
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
     }
 
+# Keep files uploaded by tests out of BASE_DIR/media
+TEST_RUNNER = 'nxtbn.core.test_runner.TemporaryMediaRootRunner'
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -420,6 +423,8 @@ NXTBN_JWT_SETTINGS = {
     'ACCESS_TOKEN_COOKIE_NAME': 'access_token',
     'REFRESH_TOKEN_COOKIE_NAME': 'refresh_token',
 }
+JWT_USER_CACHE_TIMEOUT = get_env_var("JWT_USER_CACHE_TIMEOUT", default=60, var_type=int) # in seconds, user snapshots read by JWT authentication
+USER_PERMISSION_CACHE_TIMEOUT = get_env_var("USER_PERMISSION_CACHE_TIMEOUT", default=3600, var_type=int) # in seconds, see nxtbn.users.permission_cache
 
 
 # Currency Configuration
@@ -427,5 +432,19 @@ BASE_CURRENCY = get_env_var("BASE_CURRENCY", default="USD")
 ALLOWED_CURRENCIES = get_env_var("ALLOWED_CURRENCIES", default=[], var_type=list)
 IS_MULTI_CURRENCY = get_env_var("IS_MULTI_CURRENCY", default=False, var_type=bool)
 STORE_URL = get_env_var("STORE_URL", default="http://localhost:8000")
+
+STOREFRONT_GRAPHQL_CACHE_TIMEOUT = get_env_var("STOREFRONT_GRAPHQL_CACHE_TIMEOUT", default=300, var_type=int) # in seconds, cached in CACHES["generic"]
+GRAPHQL_ESTIMATED_COUNT_TIMEOUT = get_env_var("GRAPHQL_ESTIMATED_COUNT_TIMEOUT", default=60, var_type=int) # in seconds, fallback of estimatedCount when not on postgres
+PRODUCT_RECOMMENDATION_LIMIT = get_env_var("PRODUCT_RECOMMENDATION_LIMIT", default=20, var_type=int) # recommendations stored per product
+PRODUCT_RECOMMENDATION_ORDER_DAYS = get_env_var("PRODUCT_RECOMMENDATION_ORDER_DAYS", default=180, var_type=int) # co-purchase window
+PRODUCT_FACET_PRICE_BUCKETS = get_env_var("PRODUCT_FACET_PRICE_BUCKETS", default=[25, 50, 100, 250, 500], var_type=list) # upper bounds in BASE_CURRENCY
+PRODUCT_AUTOCOMPLETE_LIMIT = get_env_var("PRODUCT_AUTOCOMPLETE_LIMIT", default=10, var_type=int) # suggestions per lookup
+PRODUCT_IMPORT_CHUNK_SIZE = get_env_var("PRODUCT_IMPORT_CHUNK_SIZE", default=1000, var_type=int) # rows per transaction
+BULK_DELETE_CHUNK_SIZE = get_env_var("BULK_DELETE_CHUNK_SIZE", default=500, var_type=int) # objects deleted per transaction
+PRODUCT_PAGE_CACHE_TIMEOUT = get_env_var("PRODUCT_PAGE_CACHE_TIMEOUT", default=3600, var_type=int) # in seconds, cached in CACHES["generic"]
+MONEY_ROUNDING = get_env_var("MONEY_ROUNDING", default="ROUND_HALF_UP") # ROUND_HALF_UP or ROUND_HALF_EVEN (banker's), for taxes and discounts
+EXCHANGE_RATE_VERSION_CHECK_INTERVAL = get_env_var("EXCHANGE_RATE_VERSION_CHECK_INTERVAL", default=5, var_type=int) # in seconds, between version checks of the process-local rates
+PRICE_LIST_LOCALES = get_env_var("PRICE_LIST_LOCALES", default=["en_US"], var_type=list) # locales VariantPrice rows are formatted in
+
 RESERVE_STOCK_ON_ORDER = True
-VALIDATE_STOCK_ON_ORDER = True
\ No newline at end of file
+VALIDATE_STOCK_ON_ORDER = True
@@ -26,6 +26,7 @@ from graphene_django.views import GraphQLView
 from rest_framework.permissions import IsAdminUser
 
 from nxtbn.admin_schema import admin_schema
+from nxtbn.core.graphql_cache import CachedGraphQLView
 from nxtbn.storefront_schema import storefront_schema
 from nxtbn.swagger_views import DASHBOARD_API_DOCS_SCHEMA_VIEWS, STOREFRONT_API_DOCS_SCHEMA_VIEWS, api_docs
 
@@ -50,7 +51,7 @@ urlpatterns = [
     path('django-admin/', admin.site.urls),
     path('', include('nxtbn.home.urls')),
     path('', include('nxtbn.seo.urls')),
-    path("graphql/", csrf_exempt(GraphQLView.as_view(graphiql=True, schema=storefront_schema))),
+    path("graphql/", csrf_exempt(CachedGraphQLView.as_view(graphiql=True, schema=storefront_schema))),
     path('admin-graphql/', csrf_exempt(GraphQLView.as_view(graphiql=True, schema=admin_schema))),
 
     path('product/', include('nxtbn.product.urls')),
@@ -171,7 +171,7 @@ class ChangeUserPasswordMutation(graphene.Mutation):
         if password != confirm_password:
             raise GraphQLError("Passwords do not match")
 
-        user.set_password(password)
+        user.change_password(password)
         user.save()
         
         return ChangeUserPasswordMutation(success=True, message="Password changed successfully")
@@ -2,13 +2,13 @@ import graphene
 
 from nxtbn.users.admin_types import AdminUserType, PermissionType
 from django.contrib.auth.models import Permission
-from graphene_django.filter import DjangoFilterConnectionField
+from nxtbn.core.graphql_connection import NxtbnFilterConnectionField
 
 from nxtbn.users.models import User
 
 
 class UserAdminQuery(graphene.ObjectType):
-    users = DjangoFilterConnectionField(AdminUserType)
+    users = NxtbnFilterConnectionField(AdminUserType)
     user = graphene.Field(AdminUserType, id=graphene.Int(required=True))
     permissions = graphene.List(PermissionType, search=graphene.String(required=True), user_id=graphene.Int(required=True))
 
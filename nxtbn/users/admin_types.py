@@ -1,6 +1,7 @@
 import graphene
 from graphene_django.types import DjangoObjectType
 from nxtbn.users.models import User
+from nxtbn.core.graphql_connection import NxtbnConnection
 
 
 class AdminUserType(DjangoObjectType):
@@ -24,6 +25,7 @@ class AdminUserType(DjangoObjectType):
             'date_joined',
         )
         interfaces = (graphene.relay.Node, )
+        connection_class = NxtbnConnection
         filter_fields = {
             'id': ['exact'],
             'is_staff': ['exact'],
@@ -89,7 +89,7 @@ class PasswordChangeSerializer(serializers.Serializer):
 
     def save(self, **kwargs):
         user = self.context["request"].user
-        user.set_password(self.validated_data["new_password"])
+        user.change_password(self.validated_data["new_password"])
         user.save()
         return user
 
@@ -9,6 +9,7 @@ urlpatterns = [
     path('', include(router.urls)),
     path('logout/', users_views.DashboardLogoutView.as_view(), name='logout-dashboard'),
     path('customers/', users_views.CustomerListAPIView.as_view(), name='customer-list'),
+    path('customers/delete/bulk/', users_views.CustomerBulkDeleteAPIView.as_view(), name='bulk-customer-delete'),
     path('customers/<int:id>/', users_views.CustomerRetrieveUpdateAPIView.as_view(), name='customer-update'),
     path('customer-with-address/<int:id>/', users_views.CustomerWithAddressView.as_view(), name='customer-with-address'),
     path('change-password/', users_views.PasswordChangeView.as_view(), name='change_password'),
@@ -7,6 +7,7 @@ from django.utils.translation import gettext_lazy as _
 from rest_framework.permissions import AllowAny
 from django.contrib.auth import authenticate
 from nxtbn.core.admin_permissions import CommonPermissions, GranularPermission, IsStoreStaff
+from nxtbn.core.api.dashboard.views import BulkDeleteAPIView
 from nxtbn.core.enum_perms import PermissionsEnum
 from nxtbn.core.paginator import NxtbnPagination
 from nxtbn.users import UserRole
@@ -164,6 +165,15 @@ class CustomerRetrieveUpdateAPIView(generics.RetrieveUpdateAPIView):
 
     
 
+class CustomerBulkDeleteAPIView(BulkDeleteAPIView):
+    model = User
+    required_perm = PermissionsEnum.CAN_BULK_CUSTOMER_DELETE
+    bulk_delete_target = 'users.user'
+
+    def get_queryset(self):
+        return User.objects.filter(role=UserRole.CUSTOMER)
+
+
 class CustomerWithAddressView(generics.RetrieveAPIView):
     permission_classes = (CommonPermissions,)
     model = User
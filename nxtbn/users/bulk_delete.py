@@ -0,0 +1,12 @@
+from nxtbn.core.bulk_delete import BulkDeleteHandler, register_bulk_delete
+from nxtbn.users import UserRole
+from nxtbn.users.models import User
+
+
+@register_bulk_delete
+class CustomerBulkDeleteHandler(BulkDeleteHandler):
+    """Customers only, staff accounts are never deleted in bulk. Customers with orders are skipped."""
+    model = User
+
+    def get_queryset(self):
+        return User.objects.filter(role=UserRole.CUSTOMER)
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-19 04:14
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_alter_user_options'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='user',
+            options={'permissions': [('can_read_customer', 'Can read customer'), ('can_create_customer', 'Can update customer'), ('can_bulk_customer_delete', 'Can bulk delete customers')]},
+        ),
+    ]
@@ -21,12 +21,25 @@ class User(AbstractUser):
     avatar = models.ImageField(upload_to='avatars/', null=True, blank=True)
     phone_number = models.CharField(max_length=255, null=True, blank=True)
 
+    # Carried by the JWTs of the user as "ver", bumping it revokes every token issued before
+    token_version = models.PositiveIntegerField(default=0, editable=False)
+
     class Meta:
         permissions = [
             (PermissionsEnum.CAN_READ_CUSTOMER, 'Can read customer'),
             (PermissionsEnum.CAN_UPDATE_CUSTOMER, 'Can update customer'),
+            (PermissionsEnum.CAN_BULK_CUSTOMER_DELETE, 'Can bulk delete customers'),
         ]
 
+    def change_password(self, raw_password):
+        """
+        Sets a new password chosen by or for the user and revokes the tokens issued with the
+        old one once saved. Kept apart from `set_password`, which Django also calls to upgrade
+        password hashes on login.
+        """
+        self.set_password(raw_password)
+        self.token_version += 1
+
     def __str__(self):
         parts = [self.get_full_name(), self.username, self.email]
         return " - ".join(part for part in parts if part)
@@ -0,0 +1,89 @@
+"""
+Cached permission sets of dashboard users.
+
+`get_user_permissions` returns the `"app_label.codename"` set a user holds directly or
+through its groups, the set `ModelBackend.get_all_permissions` computes, loaded with one
+query and kept in CACHES["generic"] so permission checks do not hit the database.
+
+Snapshots are keyed by user and by a shared version. Changes to a user's groups or own
+permissions drop that user's snapshot; changes to the permissions of a group, or deleted
+groups and permissions, bump the version, which retires every snapshot at once. Both
+happen once the change commits.
+"""
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.models import Permission
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Q
+
+from nxtbn.core.batching import OnCommitBatch
+
+
+VERSION_KEY = 'user_permissions_version'
+
+
+def _get_version(cache):
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _permissions_key(version, user_id):
+    return f"user_permissions:{version}:{user_id}"
+
+
+def load_user_permissions(user):
+    return frozenset(
+        f"{app_label}.{codename}"
+        for app_label, codename in Permission.objects.filter(Q(user=user) | Q(group__user=user))
+        .values_list('content_type__app_label', 'codename')
+        .distinct()
+    )
+
+
+def get_user_permissions(user):
+    """The permissions of `user` as `"app_label.codename"` strings, empty for inactive users."""
+    if not user.is_active:
+        return frozenset()
+    permissions = getattr(user, '_cached_permissions', None) # reused within a request
+    if permissions is None:
+        cache = caches['generic']
+        key = _permissions_key(_get_version(cache), user.id)
+        permissions = cache.get(key)
+        if permissions is None:
+            permissions = load_user_permissions(user)
+            cache.set(key, permissions, timeout=settings.USER_PERMISSION_CACHE_TIMEOUT)
+        user._cached_permissions = permissions
+    return permissions
+
+
+def has_cached_perm(user, perm):
+    """Same as `user.has_perm(perm)` for users authenticated by the model backends, without a query on a warm cache."""
+    return perm in get_user_permissions(user)
+
+
+def _delete_snapshots(user_ids):
+    cache = caches['generic']
+    version = _get_version(cache)
+    cache.delete_many([_permissions_key(version, user_id) for user_id in user_ids])
+
+
+_snapshot_batch = OnCommitBatch(_delete_snapshots)
+
+
+def invalidate_user_permissions(user_ids):
+    """Drops the snapshots of the given users once the current transaction commits."""
+    _snapshot_batch.add(user_ids)
+
+
+def _bump_version():
+    caches['generic'].set(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def invalidate_all_permissions():
+    """Retires every snapshot once the current transaction commits."""
+    transaction.on_commit(_bump_version)
@@ -1,14 +1,55 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
 
 from nxtbn.users import UserRole
 from nxtbn.users.models import User
+from nxtbn.users.permission_cache import invalidate_all_permissions, invalidate_user_permissions
+from nxtbn.users.utils.jwt_utils import invalidate_token_users
 
 
 @receiver(post_save , sender = User)
 def make_superuser_role_as_admin(sender , instance , created , **kwargs):
     if created and instance.is_superuser:
         instance.role = UserRole.ADMIN
-        instance.save()
\ No newline at end of file
+        instance.save()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_caches_on_change(sender, instance, **kwargs):
+    invalidate_token_users([instance.id])
+    invalidate_user_permissions([instance.id])
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_user_caches_on_access_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        # `instance` is a group or permission, its users are unlinked by the time of post_clear
+        lookup = 'groups' if sender is User.groups.through else 'user_permissions'
+        instance._cleared_user_ids = set(User.objects.filter(**{lookup: instance}).values_list('id', flat=True))
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        user_ids = [instance.id]
+    elif pk_set:
+        user_ids = pk_set
+    else:
+        user_ids = getattr(instance, '_cleared_user_ids', set())
+    invalidate_token_users(user_ids)
+    invalidate_user_permissions(user_ids)
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_permissions_on_group_change(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_all_permissions()
+
+
+@receiver(post_delete, sender=Group)
+@receiver(post_delete, sender=Permission)
+def invalidate_permissions_on_delete(sender, **kwargs):
+    invalidate_all_permissions()
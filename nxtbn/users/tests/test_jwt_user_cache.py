@@ -0,0 +1,77 @@
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.contrib.auth.models import Group
+from django.core.cache import caches
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from nxtbn.product.tests.test_product_query_storefront_cache import LOCMEM_CACHES
+from nxtbn.users.models import User
+from nxtbn.users.tests import UserFactory
+from nxtbn.users.utils.jwt_utils import JWTManager
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class JWTUserCacheTest(TestCase):
+
+    def setUp(self):
+        caches['generic'].clear()
+        self.user = UserFactory()
+        self.jwt_manager = JWTManager()
+        self.token = self.jwt_manager.generate_access_token(self.user)
+
+    def test_warm_cache_costs_no_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.jwt_manager.verify_jwt_token(self.token), self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.jwt_manager.verify_jwt_token(self.token), self.user)
+
+    def test_deactivation_is_honoured(self):
+        self.jwt_manager.verify_jwt_token(self.token)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+
+        self.assertIsNone(self.jwt_manager.verify_jwt_token(self.token))
+
+    def test_password_change_and_revocation(self):
+        self.jwt_manager.verify_jwt_token(self.token)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.change_password('new-password')
+            self.user.save()
+        self.assertIsNone(self.jwt_manager.verify_jwt_token(self.token))
+
+        token = self.jwt_manager.generate_access_token(self.user)
+        self.assertEqual(self.jwt_manager.verify_jwt_token(token), self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.jwt_manager.revoke_user_tokens(self.user)
+        self.assertIsNone(self.jwt_manager.verify_jwt_token(token))
+
+    def test_group_changes_drop_the_snapshot(self):
+        group = Group.objects.create(name="Editors")
+        self.jwt_manager.verify_jwt_token(self.token)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.groups.add(group)
+        with self.assertNumQueries(1):
+            self.jwt_manager.verify_jwt_token(self.token)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            group.user_set.clear()
+        with self.assertNumQueries(1):
+            self.jwt_manager.verify_jwt_token(self.token)
+
+    @override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.PBKDF2PasswordHasher'])
+    def test_password_hash_upgrade_keeps_tokens_valid(self):
+        # Fewer iterations than the hasher's default, check_password upgrades the hash on login
+        self.user.password = PBKDF2PasswordHasher().encode('password', 'salt', iterations=1000)
+        self.user.save()
+
+        user = authenticate(username=self.user.username, password='password')
+
+        self.assertIsNotNone(user)
+        self.assertNotIn('$1000$', User.objects.get(pk=user.pk).password)
+        token = self.jwt_manager.generate_access_token(user)
+        self.assertEqual(self.jwt_manager.verify_jwt_token(token), self.user)
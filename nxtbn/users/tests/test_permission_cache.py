@@ -0,0 +1,63 @@
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import caches
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from nxtbn.core.admin_permissions import has_required_perm
+from nxtbn.product.models import Product
+from nxtbn.product.tests.test_product_query_storefront_cache import LOCMEM_CACHES
+from nxtbn.users.models import User
+from nxtbn.users.permission_cache import has_cached_perm
+from nxtbn.users.tests import UserFactory
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class PermissionCacheTest(TestCase):
+
+    def setUp(self):
+        caches['generic'].clear()
+        self.user = UserFactory(is_superuser=False, is_store_admin=False)
+        self.change_product = Permission.objects.get(content_type__app_label='product', codename='change_product')
+        self.group = Group.objects.create(name="Catalog")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.permissions.add(self.change_product)
+            self.user.groups.add(self.group)
+
+    def fresh_user(self):
+        return User.objects.get(pk=self.user.pk)
+
+    def test_warm_cache_costs_no_query(self):
+        user = self.fresh_user()
+        with self.assertNumQueries(1):
+            self.assertTrue(has_cached_perm(user, 'product.change_product'))
+            self.assertFalse(has_cached_perm(user, 'product.delete_product'))
+
+        user = self.fresh_user()
+        with self.assertNumQueries(0):
+            self.assertTrue(has_required_perm(user, 'change_product', Product))
+        self.assertEqual(user.get_all_permissions(), {'product.change_product'})
+
+    def test_group_permission_changes_retire_snapshots(self):
+        self.assertTrue(has_cached_perm(self.fresh_user(), 'product.change_product'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.permissions.remove(self.change_product)
+
+        self.assertFalse(has_cached_perm(self.fresh_user(), 'product.change_product'))
+
+    def test_user_changes_drop_the_snapshot(self):
+        delete_product = Permission.objects.get(content_type__app_label='product', codename='delete_product')
+        self.assertFalse(has_cached_perm(self.fresh_user(), 'product.delete_product'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.user_permissions.add(delete_product)
+        self.assertTrue(has_cached_perm(self.fresh_user(), 'product.delete_product'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.user_set.clear()
+        self.assertFalse(has_cached_perm(self.fresh_user(), 'product.change_product'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        self.assertFalse(has_cached_perm(self.fresh_user(), 'product.delete_product'))
@@ -1,10 +1,43 @@
 from datetime import datetime, timedelta, timezone
 import jwt
+from nxtbn.core.batching import OnCommitBatch
 from nxtbn.users.models import User
+from django.core.cache import caches
 from django.core.exceptions import ObjectDoesNotExist
 from django.conf import settings
 
 
+def _user_cache_key(user_id):
+    return f"jwt_user:{user_id}"
+
+
+def get_token_user(user_id):
+    """
+    The user a token was issued to, from a snapshot cached in CACHES["generic"] for
+    `JWT_USER_CACHE_TIMEOUT` seconds, so authenticating costs no query on a warm cache.
+    Snapshots are dropped when the user, its groups or its permissions change.
+    """
+    cache = caches['generic']
+    key = _user_cache_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = User.objects.get(id=user_id)
+        cache.set(key, user, timeout=settings.JWT_USER_CACHE_TIMEOUT)
+    return user
+
+
+def _delete_user_snapshots(user_ids):
+    caches['generic'].delete_many([_user_cache_key(user_id) for user_id in user_ids])
+
+
+# Dropped once the change commits, so a request reading the old row meanwhile cannot cache it again
+_snapshot_batch = OnCommitBatch(_delete_user_snapshots)
+
+
+def invalidate_token_users(user_ids):
+    _snapshot_batch.add(user_ids)
+
+
 class JWTManager:
     def __init__(self):
         self.secret_key = settings.NXTBN_JWT_SETTINGS['SECRET_KEY']
@@ -38,6 +71,7 @@ class JWTManager:
         exp = datetime.now(timezone.utc) + timedelta(seconds=expiration_seconds)
         payload = {
             "user_id": user.id,
+            "ver": user.token_version,
             "exp": exp,
         }
         return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
@@ -49,16 +83,21 @@ class JWTManager:
         return self._generate_jwt_token(user, self.refresh_token_expiration)
 
     def verify_jwt_token(self, token):
-        """Verify a JWT token and return the associated user."""
+        """Verify a JWT token and return the associated user, None if the user is inactive or the token revoked."""
         try:
             payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            user = User.objects.get(id=payload["user_id"])
-            if user.is_active:
+            user = get_token_user(payload["user_id"])
+            if user.is_active and user.token_version == payload.get("ver", 0):
                 return user
             else:
                 return None
         except (jwt.ExpiredSignatureError, jwt.InvalidTokenError, ObjectDoesNotExist):
             return None
+
+    def revoke_user_tokens(self, user):
+        """Revokes every token issued to `user` so far."""
+        user.token_version += 1
+        user.save(update_fields=['token_version'])
         
 
     def revoke_refresh_token(self, token): # When you want, implement this method
@@ -5,16 +5,16 @@ import graphene
 from nxtbn.core.admin_permissions import gql_store_admin_required
 from nxtbn.warehouse.admin_types import StockReservationType, StockTransferItemType, StockTransferType, StockType, WarehouseType
 from nxtbn.warehouse.models import Stock, StockReservation, StockTransfer, StockTransferItem, Warehouse
-from graphene_django.filter import DjangoFilterConnectionField
+from nxtbn.core.graphql_connection import NxtbnFilterConnectionField
 
 
 
 class WarehouseQuery(graphene.ObjectType):
-    warehouses = DjangoFilterConnectionField(WarehouseType)
-    stocks = DjangoFilterConnectionField(StockType)
-    stock_reservations = DjangoFilterConnectionField(StockReservationType)
-    stock_transfers = DjangoFilterConnectionField(StockTransferType)
-    stock_transfer_items = DjangoFilterConnectionField(StockTransferItemType)
+    warehouses = NxtbnFilterConnectionField(WarehouseType)
+    stocks = NxtbnFilterConnectionField(StockType)
+    stock_reservations = NxtbnFilterConnectionField(StockReservationType)
+    stock_transfers = NxtbnFilterConnectionField(StockTransferType)
+    stock_transfer_items = NxtbnFilterConnectionField(StockTransferItemType)
     
     warehouse = graphene.Field(WarehouseType, id=graphene.ID(required=True))
     stock = graphene.Field(StockType, id=graphene.ID(required=True))
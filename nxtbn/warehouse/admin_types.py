@@ -1,6 +1,7 @@
 import graphene
 from graphene_django.types import DjangoObjectType
 from graphene import relay
+from nxtbn.core.graphql_connection import NxtbnConnection
 from nxtbn.warehouse.models import (
     Warehouse,
     Stock,
@@ -15,6 +16,7 @@ class WarehouseType(DjangoObjectType):
         model = Warehouse
         fields = "__all__"  
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filter_fields = {
             "name": ["exact", "icontains", "istartswith"],
         }
@@ -24,6 +26,7 @@ class StockType(DjangoObjectType):
         model = Stock
         fields = "__all__"
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filter_fields = {
             "warehouse": ["exact"],
             "product_variant": ["exact"],
@@ -35,6 +38,7 @@ class StockReservationType(DjangoObjectType):
         model = StockReservation
         fields = "__all__"
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filter_fields = {
             "stock": ["exact"],
             "purpose": ["exact", "icontains", "istartswith"],
@@ -46,6 +50,7 @@ class StockTransferType(DjangoObjectType):
         model = StockTransfer
         fields = "__all__"
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filter_fields = {
             "from_warehouse": ["exact"],
             "to_warehouse": ["exact"],
@@ -59,6 +64,7 @@ class StockTransferItemType(DjangoObjectType):
         model = StockTransferItem
         fields = "__all__"
         interfaces = (relay.Node,)
+        connection_class = NxtbnConnection
         filter_fields = {
             "stock_transfer": ["exact"],
             "variant": ["exact"],